@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+============================================================================
+BENCHMARK DES MOTEURS D'ANALYSE HTML
+============================================================================
+Compare selectolax, lxml et bs4 sur des pages de résultats sauvegardées :
+pages/seconde et pic mémoire de chaque moteur.
+
+Pages utilisées : fixtures/*.html et les pages du cache HTTP (http_cache/*.body)
+Chaque moteur tourne dans un processus séparé pour isoler la mesure mémoire.
+
+Utilisation : python bench_parser.py [dossier ...] [--repeat N]
+============================================================================
+"""
+
+import argparse
+import glob
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import booking_parser
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DIRS = [os.path.join(BASE_DIR, 'fixtures'), os.path.join(BASE_DIR, 'http_cache')]
+
+
+def load_pages(directories):
+    """Lire les pages HTML sauvegardées (.html et .body)"""
+    pages = []
+    for directory in directories:
+        for pattern in ('*.html', '*.body'):
+            for path in sorted(glob.glob(os.path.join(directory, pattern))):
+                with open(path, encoding='utf-8') as page_file:
+                    pages.append(page_file.read())
+    return pages
+
+
+def peak_rss_kb():
+    """Pic de mémoire résidente du processus en Ko (None si non mesurable, ex. Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux : Ko, macOS : octets
+    return peak // 1024 if os.uname().sysname == 'Darwin' else peak
+
+
+def run_backend(backend, pages, repeat):
+    """Mesurer un moteur (exécuté dans un processus dédié)"""
+    # Passe de chauffe : imports et caches hors mesure
+    booking_parser.parse_search_page(pages[0], backend=backend)
+    rss_before = peak_rss_kb()
+
+    start = time.perf_counter()
+    hotels = 0
+    for _ in range(repeat):
+        for page in pages:
+            hotels += len(booking_parser.parse_search_page(page, backend=backend))
+    elapsed = time.perf_counter() - start
+    rss_after = peak_rss_kb()
+
+    # Pic d'allocations Python sur une page (hors mémoire C de lxml/selectolax)
+    tracemalloc.start()
+    booking_parser.parse_search_page(pages[0], backend=backend)
+    python_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'backend': backend,
+        'pages_per_second': repeat * len(pages) / elapsed,
+        'hotels': hotels // repeat,
+        'rss_delta_kb': rss_after - rss_before if rss_after is not None else None,
+        'rss_peak_kb': rss_after,
+        'python_peak_kb': python_peak // 1024,
+    }
+
+
+def main():
+    """Point d'entrée du benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark des moteurs d'analyse HTML")
+    parser.add_argument('directories', nargs='*', default=DEFAULT_DIRS,
+                        help="Dossiers contenant les pages sauvegardées")
+    parser.add_argument('--repeat', type=int, default=20, help="Nombre de passes sur les pages")
+    args = parser.parse_args()
+
+    pages = load_pages(args.directories)
+    if not pages:
+        print("❌ Aucune page trouvée (fixtures/*.html ou http_cache/*.body)")
+        return
+
+    backends = booking_parser.available_backends()
+    print(f"📄 {len(pages)} pages, {args.repeat} passes, moteurs : {', '.join(backends)}\n")
+    print(f"{'Moteur':<12}{'pages/s':>10}{'hôtels/page':>13}{'RSS +Ko':>10}{'RSS pic Ko':>12}{'Python pic Ko':>15}")
+
+    results = []
+    for backend in backends:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(run_backend, backend, pages, args.repeat).result()
+        results.append(result)
+        print(f"{result['backend']:<12}{result['pages_per_second']:>10.1f}"
+              f"{result['hotels'] / len(pages):>13.1f}"
+              f"{result['rss_delta_kb'] if result['rss_delta_kb'] is not None else '-':>10}"
+              f"{result['rss_peak_kb'] if result['rss_peak_kb'] is not None else '-':>12}"
+              f"{result['python_peak_kb']:>15}")
+
+    slowest = min(result['pages_per_second'] for result in results)
+    print()
+    for result in results:
+        print(f"  • {result['backend']}: x{result['pages_per_second'] / slowest:.1f} par rapport au plus lent")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+============================================================================
+BENCHMARK DE LA GÉNÉRATION ET DU CHARGEMENT DES HÔTELS
+============================================================================
+Pour chaque taille de catalogue (nombre d'offres visé) :
+  - génération seule : hôtels/seconde
+  - chargement de bout en bout (génération → écriture par lots) : durée
+  - insertion : lignes/seconde par table (étapes insert.<TABLE> de METRICS)
+  - pic de mémoire résidente
+
+Base : SQLite locale (par défaut, aucun serveur nécessaire) ou une base
+MySQL/MariaDB dédiée au benchmark (--db mysql, tables vidées à chaque taille).
+Aucune page n'est téléchargée : le benchmark tourne entièrement hors ligne.
+Chaque taille tourne dans un processus séparé pour isoler la mesure mémoire.
+
+Référence : --save-baseline enregistre les résultats dans bench_baseline.json,
+les exécutions suivantes y sont comparées. Un écart défavorable supérieur à
+--threshold est une régression (code de sortie 1). Aucune référence n'est
+versionnée : sur un dépôt neuf, lancer d'abord --save-baseline.
+
+Utilisation : python bench_seed.py [--sizes 100 10000 1000000] [--db sqlite|mysql]
+              [--mode standard|vectorized] [--repeat 3] [--save-baseline] [--threshold 0.15]
+============================================================================
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+from bench_parser import peak_rss_kb
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BASE_DIR, 'bench_baseline.json')
+
+# Tailles de catalogue par défaut (nombre d'offres)
+DEFAULT_SIZES = (100, 10000, 1000000)
+
+# Offres générées par hôtel en moyenne (4 chambres, 2 à 5 offres par chambre)
+OFFERS_PER_HOTEL = 13.3
+
+# Génération reproductible : mêmes données à chaque exécution
+BENCH_SEED = 1
+BENCH_DATE = '2025-01-01'
+
+# Écart défavorable toléré par rapport à la référence (0.15 = 15 %)
+DEFAULT_THRESHOLD = 0.15
+
+# Exécutions par taille : la meilleure valeur de chaque mesure est gardée
+DEFAULT_REPEAT = 3
+
+# Mesures plus courtes que ce seuil (secondes) : trop bruitées pour être comparées
+MIN_COMPARED_SECONDS = 0.05
+
+# Base MySQL dédiée au benchmark (ses tables sont vidées)
+BENCH_DATABASE = 'hotel_booking_bench'
+
+
+# ============================================================================
+# BASE DU BENCHMARK
+# ============================================================================
+
+def open_connection(db, seed, directory, database=BENCH_DATABASE):
+    """Connexion à la base du benchmark : fichier SQLite neuf ou base MySQL dédiée vidée"""
+    if db == 'sqlite':
+        return seed.SqliteConnection(os.path.join(directory, 'bench.sqlite3'))
+
+    if database == seed.DB_CONFIG['database']:
+        raise ValueError(f"La base {database!r} est la base de l'application : utilise une base dédiée")
+    connection = seed.mysql_connector().connect(**{**seed.DB_CONFIG, 'database': database})
+    seed.create_derived_tables(connection)
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for table in reversed(seed.active_tables()):
+            cursor.execute(f"TRUNCATE TABLE {table}")
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+    finally:
+        cursor.close()
+    return connection
+
+
+# ============================================================================
+# MESURES
+# ============================================================================
+
+def count_generated(seed, destination, mode):
+    """Générer les hôtels d'une destination sans les garder, retourne le nombre d'hôtels"""
+    if mode == 'vectorized':
+        hotels = 0
+        for start in range(0, destination['target_hotels'], seed.VECTOR_CHUNK_HOTELS):
+            count = min(seed.VECTOR_CHUNK_HOTELS, destination['target_hotels'] - start)
+            rows = seed.generate_catalog_batch(destination, start, count, 1, 1,
+                                               seed.catalog_rng(destination, start, BENCH_SEED))
+            hotels += len(rows['HOTEL'])
+        return hotels
+
+    rng = seed.destination_rng(destination, BENCH_SEED)
+    return sum(1 for _ in seed.iter_booking_hotels(destination, rng=rng))
+
+
+def run_size(offers, db, mode, batch_size, database):
+    """Mesurer une taille de catalogue (exécuté dans un processus dédié)"""
+    import scrape_booking_hotels as seed
+    from run_metrics import StageMetrics
+
+    seed.GENERATION_SEED = BENCH_SEED
+    seed.GENERATION_DATE = BENCH_DATE
+    seed.GENERATION_MODE = mode
+    seed.GENERATION_PROCESSES = 1
+    seed.PROGRESS.level = 'quiet'
+    destination = {'name': 'Paris', 'country': 'France',
+                   'target_hotels': max(1, round(offers / OFFERS_PER_HOTEL))}
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull), \
+            tempfile.TemporaryDirectory() as directory:
+        # Passe de chauffe : imports et caches (URLs des photos) hors mesure
+        count_generated(seed, dict(destination, target_hotels=1), mode)
+
+        # 1. Génération seule
+        start = time.perf_counter()
+        hotels = count_generated(seed, destination, mode)
+        generation_seconds = time.perf_counter() - start
+
+        # 2. Génération → écriture par lots, mesures par table
+        connection = open_connection(db, seed, directory, database)
+        try:
+            seed.METRICS = StageMetrics()
+            writer = seed.HotelBatchWriter(connection, batch_size, seed.CLIENT_SIDE_IDS or mode == 'vectorized',
+                                           photo_urls=seed.PhotoUrlRegistry(connection, mode='inline'))
+            start = time.perf_counter()
+            seed.write_destinations(writer, [destination])
+            end_to_end_seconds = time.perf_counter() - start
+        finally:
+            connection.close()
+
+    stages = seed.METRICS.summary()
+    return {
+        'offers': writer.stats['offers'],
+        'hotels': hotels,
+        'generation_seconds': generation_seconds,
+        'generation_hotels_per_second': hotels / generation_seconds,
+        'end_to_end_seconds': end_to_end_seconds,
+        'rows_per_second': {stage.split('.', 1)[1]: values['items_per_second']
+                            for stage, values in stages.items()
+                            if stage.startswith('insert.') and values['items_per_second']},
+        'insert_seconds': {stage.split('.', 1)[1]: values['seconds']
+                           for stage, values in stages.items() if stage.startswith('insert.')},
+        'rss_peak_kb': peak_rss_kb(),
+    }
+
+
+def best_of(results):
+    """Meilleure valeur de chaque mesure sur plusieurs exécutions (moins de bruit)"""
+    best = dict(results[0])
+    best['generation_seconds'] = min(r['generation_seconds'] for r in results)
+    best['generation_hotels_per_second'] = max(r['generation_hotels_per_second'] for r in results)
+    best['end_to_end_seconds'] = min(r['end_to_end_seconds'] for r in results)
+    best['rows_per_second'] = {table: max(r['rows_per_second'].get(table, 0) for r in results)
+                               for table in best['rows_per_second']}
+    best['insert_seconds'] = {table: min(r['insert_seconds'].get(table, 0) for r in results)
+                              for table in best['insert_seconds']}
+    if best['rss_peak_kb'] is not None:
+        best['rss_peak_kb'] = min(r['rss_peak_kb'] for r in results)
+    return best
+
+
+# ============================================================================
+# RÉFÉRENCE ET RÉGRESSIONS
+# ============================================================================
+
+def comparable_values(result):
+    """
+    Valeurs comparées à la référence : {nom: (valeur, True si plus grand = mieux)}
+    Les durées sous MIN_COMPARED_SECONDS (petites tailles) ne sont pas comparées
+    """
+    values = {}
+    if result['generation_seconds'] >= MIN_COMPARED_SECONDS:
+        values['génération hôtels/s'] = (result['generation_hotels_per_second'], True)
+    if result['end_to_end_seconds'] >= MIN_COMPARED_SECONDS:
+        values['bout en bout s'] = (result['end_to_end_seconds'], False)
+    for table, rate in result['rows_per_second'].items():
+        if result['insert_seconds'].get(table, 0) >= MIN_COMPARED_SECONDS:
+            values[f"{table} lignes/s"] = (rate, True)
+    if result['rss_peak_kb']:
+        values['RSS pic Ko'] = (result['rss_peak_kb'], False)
+    return values
+
+
+def find_regressions(result, baseline, threshold):
+    """Écarts défavorables supérieurs à threshold : [(nom, référence, valeur, écart)]"""
+    reference = comparable_values(baseline)
+    regressions = []
+    for name, (value, higher_is_better) in comparable_values(result).items():
+        if name not in reference or not reference[name][0]:
+            continue
+        change = (value - reference[name][0]) / reference[name][0]
+        if (-change if higher_is_better else change) > threshold:
+            regressions.append((name, reference[name][0], value, change))
+    return regressions
+
+
+def load_baselines(path):
+    """Résultats de référence enregistrés ({clé: résultat}), vide si absents"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baselines(path, baselines):
+    """Enregistrer les résultats de référence"""
+    with open(path, 'w', encoding='utf-8') as baseline_file:
+        json.dump(baselines, baseline_file, indent=2, ensure_ascii=False)
+
+
+def main(argv=None):
+    """Point d'entrée du benchmark (argv : arguments de la ligne de commande, sys.argv[1:] par défaut)"""
+    parser = argparse.ArgumentParser(description="Benchmark de la génération et du chargement des hôtels")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Tailles de catalogue en nombre d'offres")
+    parser.add_argument('--db', choices=('sqlite', 'mysql'), default='sqlite',
+                        help="Base cible : SQLite locale ou MySQL/MariaDB (base dédiée)")
+    parser.add_argument('--database', default=BENCH_DATABASE,
+                        help="Base MySQL dédiée au benchmark (ses tables sont vidées)")
+    parser.add_argument('--mode', choices=('standard', 'vectorized'), default='standard',
+                        help="Mode de génération (GENERATION_MODE)")
+    parser.add_argument('--batch-size', type=int, default=None, help="Hôtels par lot (BATCH_SIZE)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help="Exécutions par taille (meilleure valeur gardée)")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Fichier des résultats de référence")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Enregistrer les résultats comme nouvelle référence")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Écart défavorable toléré (0.15 = 15 %%)")
+    args = parser.parse_args(argv)
+
+    if args.batch_size is None:
+        from scrape_booking_hotels import BATCH_SIZE
+        args.batch_size = BATCH_SIZE
+
+    baselines = load_baselines(args.baseline)
+    print(f"📏 Base {args.db}, génération {args.mode}, lots de {args.batch_size} hôtels, "
+          f"meilleur de {args.repeat} exécutions\n")
+    print(f"{'Offres':>10}{'hôtels':>9}{'gén. hôtels/s':>15}{'bout en bout s':>16}"
+          f"{'OFFRE lignes/s':>16}{'RSS pic Ko':>12}")
+
+    regressions = []
+    for size in args.sizes:
+        results = []
+        for _ in range(max(1, args.repeat)):
+            # Un processus neuf par exécution (pic mémoire propre à l'exécution)
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                results.append(executor.submit(run_size, size, args.db, args.mode, args.batch_size,
+                                               args.database).result())
+        result = best_of(results)
+        print(f"{result['offers']:>10}{result['hotels']:>9}{result['generation_hotels_per_second']:>15,.0f}"
+              f"{result['end_to_end_seconds']:>16.2f}{result['rows_per_second'].get('OFFRE', 0):>16,.0f}"
+              f"{result['rss_peak_kb'] if result['rss_peak_kb'] is not None else '-':>12}")
+
+        key = f"{args.db}:{args.mode}:{size}"
+        if args.save_baseline:
+            baselines[key] = result
+        elif key in baselines:
+            regressions.extend((size, *regression)
+                               for regression in find_regressions(result, baselines[key], args.threshold))
+
+    if args.save_baseline:
+        save_baselines(args.baseline, baselines)
+        print(f"\n💾 Référence enregistrée : {args.baseline}")
+        return 0
+
+    if not any(f"{args.db}:{args.mode}:{size}" in baselines for size in args.sizes):
+        print("\nℹ️  Aucune référence pour ces tailles (--save-baseline pour en enregistrer une)")
+        return 0
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) au-delà de {args.threshold:.0%} :")
+        for size, name, reference, value, change in regressions:
+            print(f"  • {size} offres, {name} : {reference:,.1f} → {value:,.1f} ({change:+.0%})")
+        return 1
+
+    print(f"\n✅ Aucune régression au-delà de {args.threshold:.0%} par rapport à la référence")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
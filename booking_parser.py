@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+============================================================================
+ANALYSE DES PAGES DE RÉSULTATS BOOKING.COM
+============================================================================
+Extrait les cartes d'hôtels d'une page de recherche. Chaque carte devient
+un dictionnaire : booking_id, name, city, country, stars, rating,
+review_count, price, latitude, longitude (None si absent de la page).
+
+Trois moteurs, du plus rapide au plus lent :
+  - selectolax (pip install selectolax)
+  - lxml       (pip install lxml)
+  - bs4        (pip install beautifulsoup4, avec html.parser)
+Le premier moteur installé est utilisé par défaut.
+============================================================================
+"""
+
+import re
+
+# Ordre de préférence des moteurs
+BACKENDS = ('selectolax', 'lxml', 'bs4')
+
+# Sélecteurs des cartes de la page de résultats
+CARD_TESTID = 'property-card'
+TITLE_TESTID = 'title'
+TITLE_LINK_TESTID = 'title-link'
+STARS_TESTID = 'rating-stars'
+SCORE_TESTID = 'review-score'
+PRICE_TESTID = 'price-and-discounted-price'
+
+# Nombre d'avis : '1 234 expériences vécues', '2 345 avis', '987 reviews'
+REVIEWS_PATTERN = re.compile(r'(\d[\d\s.,  ]*)\s*(?:avis|expériences?|reviews?)', re.I)
+
+
+# ============================================================================
+# NORMALISATION DES CHAMPS
+# ============================================================================
+
+def _clean(text):
+    """Espaces multiples / insécables réduits à un espace"""
+    return ' '.join((text or '').split())
+
+
+def _parse_decimal(text):
+    """Premier nombre décimal d'un texte ('8,7' ou '8.7'), None si absent"""
+    match = re.search(r'\d+(?:[.,]\d+)?', text or '')
+    return float(match.group().replace(',', '.')) if match else None
+
+
+def _parse_integer(text):
+    """Entier d'un texte avec séparateurs de milliers ('1 234 avis', '€ 2,345')"""
+    match = re.search(r'\d[\d\s.,  ]*', text or '')
+    if not match:
+        return None
+    digits = re.sub(r'\D', '', match.group())
+    return int(digits) if digits else None
+
+
+def _booking_id(href, city_name, index):
+    """Identifiant stable à partir du lien de l'hôtel (/hotel/fr/<slug>.fr.html)"""
+    match = re.search(r'/hotel/[a-z]{2}/([^./?]+)', href or '')
+    if match:
+        return f"booking_{match.group(1)}"
+    return f"booking_{city_name.lower()}_{index + 1}"
+
+
+def _to_hotel(raw, index, city_name, country_name):
+    """Convertir les champs bruts d'une carte en dictionnaire d'hôtel"""
+    score_texts = raw['score_texts']
+    rating = None
+    review_count = None
+    for text in score_texts:
+        if rating is None and re.fullmatch(r'\s*\d+(?:[.,]\d)?\s*', text):
+            rating = _parse_decimal(text)
+        elif review_count is None:
+            match = REVIEWS_PATTERN.search(text)
+            if match:
+                review_count = _parse_integer(match.group(1))
+
+    latitude = longitude = None
+    if raw['latlng']:
+        try:
+            latitude, longitude = (float(value) for value in raw['latlng'].split(','))
+        except ValueError:
+            pass
+
+    return {
+        'booking_id': _booking_id(raw['href'], city_name, index),
+        'name': _clean(raw['name']),
+        'city': city_name,
+        'country': country_name,
+        'stars': raw['stars'] or None,
+        'rating': rating,
+        'review_count': review_count,
+        'price': _parse_integer(raw['price']),
+        'latitude': latitude,
+        'longitude': longitude,
+    }
+
+
+# ============================================================================
+# MOTEURS D'ANALYSE
+# ============================================================================
+
+def _cards_selectolax(html):
+    """Champs bruts des cartes avec selectolax (moteur Lexbor)"""
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    for card in tree.css(f'[data-testid="{CARD_TESTID}"]'):
+        title = card.css_first(f'[data-testid="{TITLE_TESTID}"]')
+        link = card.css_first(f'a[data-testid="{TITLE_LINK_TESTID}"]')
+        stars = card.css_first(f'[data-testid="{STARS_TESTID}"]')
+        score = card.css_first(f'[data-testid="{SCORE_TESTID}"]')
+        price = card.css_first(f'[data-testid="{PRICE_TESTID}"]')
+        latlng = card.css_first('[data-atlas-latlng]')
+        yield {
+            'name': title.text() if title else '',
+            'href': link.attributes.get('href') if link else None,
+            'stars': len(stars.css('span')) if stars else 0,
+            'score_texts': [node.text() for node in score.css('div')] if score else [],
+            'price': price.text() if price else '',
+            'latlng': latlng.attributes.get('data-atlas-latlng') if latlng else None,
+        }
+
+
+def _cards_lxml(html):
+    """Champs bruts des cartes avec lxml (XPath)"""
+    import lxml.html
+
+    tree = lxml.html.fromstring(html)
+
+    def first(node, testid, tag='*'):
+        found = node.xpath(f'.//{tag}[@data-testid="{testid}"]')
+        return found[0] if found else None
+
+    for card in tree.xpath(f'//*[@data-testid="{CARD_TESTID}"]'):
+        title = first(card, TITLE_TESTID)
+        link = first(card, TITLE_LINK_TESTID, 'a')
+        stars = first(card, STARS_TESTID)
+        score = first(card, SCORE_TESTID)
+        price = first(card, PRICE_TESTID)
+        latlng = card.xpath('.//@data-atlas-latlng')
+        yield {
+            'name': title.text_content() if title is not None else '',
+            'href': link.get('href') if link is not None else None,
+            'stars': len(stars.xpath('.//span')) if stars is not None else 0,
+            'score_texts': [node.text_content() for node in score.xpath('.//div')] if score is not None else [],
+            'price': price.text_content() if price is not None else '',
+            'latlng': latlng[0] if latlng else None,
+        }
+
+
+def _cards_bs4(html):
+    """Champs bruts des cartes avec BeautifulSoup (html.parser, le plus lent)"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for card in soup.select(f'[data-testid="{CARD_TESTID}"]'):
+        title = card.select_one(f'[data-testid="{TITLE_TESTID}"]')
+        link = card.select_one(f'a[data-testid="{TITLE_LINK_TESTID}"]')
+        stars = card.select_one(f'[data-testid="{STARS_TESTID}"]')
+        score = card.select_one(f'[data-testid="{SCORE_TESTID}"]')
+        price = card.select_one(f'[data-testid="{PRICE_TESTID}"]')
+        latlng = card.select_one('[data-atlas-latlng]')
+        yield {
+            'name': title.get_text() if title else '',
+            'href': link.get('href') if link else None,
+            'stars': len(stars.select('span')) if stars else 0,
+            'score_texts': [node.get_text() for node in score.select('div')] if score else [],
+            'price': price.get_text() if price else '',
+            'latlng': latlng.get('data-atlas-latlng') if latlng else None,
+        }
+
+
+_CARD_EXTRACTORS = {
+    'selectolax': _cards_selectolax,
+    'lxml': _cards_lxml,
+    'bs4': _cards_bs4,
+}
+
+_MODULES = {
+    'selectolax': 'selectolax.lexbor',
+    'lxml': 'lxml.html',
+    'bs4': 'bs4',
+}
+
+
+def available_backends():
+    """Moteurs installés, dans l'ordre de préférence"""
+    import importlib
+
+    backends = []
+    for backend in BACKENDS:
+        try:
+            importlib.import_module(_MODULES[backend])
+            backends.append(backend)
+        except ImportError:
+            pass
+    return backends
+
+
+_default_backend = None
+
+
+def default_backend():
+    """Moteur le plus rapide disponible (détecté une seule fois)"""
+    global _default_backend
+    if _default_backend is None:
+        backends = available_backends()
+        _default_backend = backends[0] if backends else 'bs4'
+    return _default_backend
+
+
+def parse_search_page(html, city_name='', country_name='', backend=None):
+    """
+    Extraire les hôtels d'une page de résultats Booking.com
+    Retourne une liste de dictionnaires (voir l'en-tête du module)
+    Les champs absents de la page valent None
+    """
+    extractor = _CARD_EXTRACTORS[backend or default_backend()]
+    return [
+        _to_hotel(raw, index, city_name, country_name)
+        for index, raw in enumerate(extractor(html))
+    ]
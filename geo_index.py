@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+============================================================================
+INDEX SPATIAL DES HÔTELS (GEOHASH)
+============================================================================
+Chaque hôtel reçoit au chargement un geohash (table HOTEL_GEO) : des
+coordonnées proches partagent un même préfixe. Une recherche par rayon ou
+par rectangle ne parcourt que les cellules qui couvrent la zone (plages de
+préfixes, index trié en mémoire ou clé de la table), puis filtre exactement.
+
+Utilisation :
+    index = GeoIndex.from_connection(connection)
+    index.within_radius(48.8566, 2.3522, 5)      → [(distance_km, id_hotel)]
+    find_hotels_near(connection, 48.8566, 2.3522, 5)   (directement en SQL)
+============================================================================
+"""
+
+import math
+from bisect import bisect_left
+
+# Alphabet base 32 du geohash (sans a, i, l, o)
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Précision stockée en base : 9 caractères ≈ cellule de 5 m × 5 m
+GEOHASH_PRECISION = 9
+
+# Nombre max de cellules couvrant une zone de recherche (précision choisie en conséquence)
+MAX_COVER_CELLS = 32
+
+# Rayon moyen de la Terre (km)
+EARTH_RADIUS_KM = 6371.0088
+
+
+# ============================================================================
+# ENCODAGE
+# ============================================================================
+
+def cell_bits(precision):
+    """Bits de longitude et de latitude d'un geohash de precision caractères"""
+    bits = 5 * precision
+    return (bits + 1) // 2, bits // 2
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Geohash (chaîne de precision caractères) d'un point"""
+    lon_bits, lat_bits = cell_bits(precision)
+    lon_cell = min(int((longitude + 180.0) / 360.0 * (1 << lon_bits)), (1 << lon_bits) - 1)
+    lat_cell = min(int((latitude + 90.0) / 180.0 * (1 << lat_bits)), (1 << lat_bits) - 1)
+
+    # Bits entrelacés : longitude, latitude, longitude... (poids fort d'abord)
+    code = 0
+    for bit in range(5 * precision):
+        if bit % 2 == 0:
+            code = (code << 1) | ((lon_cell >> (lon_bits - 1 - bit // 2)) & 1)
+        else:
+            code = (code << 1) | ((lat_cell >> (lat_bits - 1 - bit // 2)) & 1)
+    return ''.join(BASE32[(code >> (5 * (precision - 1 - idx))) & 31] for idx in range(precision))
+
+
+def geohash_encode_array(latitudes, longitudes, precision=GEOHASH_PRECISION):
+    """Geohash de tableaux de coordonnées (NumPy), même résultat que geohash_encode"""
+    import numpy as np
+
+    lon_bits, lat_bits = cell_bits(precision)
+    lon_cells = np.minimum(((np.asarray(longitudes) + 180.0) / 360.0 * (1 << lon_bits)).astype(np.int64),
+                           (1 << lon_bits) - 1)
+    lat_cells = np.minimum(((np.asarray(latitudes) + 90.0) / 180.0 * (1 << lat_bits)).astype(np.int64),
+                           (1 << lat_bits) - 1)
+
+    codes = np.zeros(len(lon_cells), dtype=np.int64)
+    for bit in range(5 * precision):
+        if bit % 2 == 0:
+            codes = (codes << 1) | ((lon_cells >> (lon_bits - 1 - bit // 2)) & 1)
+        else:
+            codes = (codes << 1) | ((lat_cells >> (lat_bits - 1 - bit // 2)) & 1)
+
+    alphabet = np.asarray(list(BASE32))
+    characters = [alphabet[(codes >> (5 * (precision - 1 - idx))) & 31].tolist() for idx in range(precision)]
+    return [''.join(chars) for chars in zip(*characters)]
+
+
+def geohash_bbox(geohash):
+    """Rectangle (lat_min, lon_min, lat_max, lon_max) de la cellule d'un geohash"""
+    code = 0
+    for char in geohash:
+        code = (code << 5) | BASE32.index(char)
+    lon_bits, lat_bits = cell_bits(len(geohash))
+
+    lon_cell = lat_cell = 0
+    for bit in range(5 * len(geohash)):
+        value = (code >> (5 * len(geohash) - 1 - bit)) & 1
+        if bit % 2 == 0:
+            lon_cell = (lon_cell << 1) | value
+        else:
+            lat_cell = (lat_cell << 1) | value
+
+    lon_size = 360.0 / (1 << lon_bits)
+    lat_size = 180.0 / (1 << lat_bits)
+    return (-90.0 + lat_cell * lat_size, -180.0 + lon_cell * lon_size,
+            -90.0 + (lat_cell + 1) * lat_size, -180.0 + (lon_cell + 1) * lon_size)
+
+
+# ============================================================================
+# ZONES DE RECHERCHE
+# ============================================================================
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distance orthodromique entre deux points (km)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bbox(latitude, longitude, radius_km):
+    """Rectangle (lat_min, lon_min, lat_max, lon_max) contenant le cercle (lon_min > lon_max : antiméridien)"""
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - d_lat, latitude + d_lat
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        # Pôle dans le cercle : toutes les longitudes
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+
+    d_lon = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude)))))
+    if d_lon >= 180.0:
+        return min_lat, -180.0, max_lat, 180.0
+    min_lon = (longitude - d_lon + 540.0) % 360.0 - 180.0
+    max_lon = (longitude + d_lon + 540.0) % 360.0 - 180.0
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def split_bbox(min_lat, min_lon, max_lat, max_lon):
+    """Rectangles sans passage de l'antiméridien (2 si min_lon > max_lon)"""
+    if min_lon > max_lon:
+        return [(min_lat, min_lon, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon)]
+    return [(min_lat, min_lon, max_lat, max_lon)]
+
+
+def covering_cells(min_lat, min_lon, max_lat, max_lon, max_cells=MAX_COVER_CELLS, max_precision=GEOHASH_PRECISION):
+    """
+    Préfixes geohash dont les cellules recouvrent le rectangle : précision la plus
+    fine possible sans dépasser max_cells cellules (moins de faux positifs à filtrer)
+    """
+    boxes = split_bbox(min_lat, min_lon, max_lat, max_lon)
+    best = ['']
+    for precision in range(1, max_precision + 1):
+        lon_bits, lat_bits = cell_bits(precision)
+        lon_size = 360.0 / (1 << lon_bits)
+        lat_size = 180.0 / (1 << lat_bits)
+
+        ranges = []
+        for box_min_lat, box_min_lon, box_max_lat, box_max_lon in boxes:
+            lat_first = int((box_min_lat + 90.0) // lat_size)
+            lat_last = min(int((box_max_lat + 90.0) // lat_size), (1 << lat_bits) - 1)
+            lon_first = int((box_min_lon + 180.0) // lon_size)
+            lon_last = min(int((box_max_lon + 180.0) // lon_size), (1 << lon_bits) - 1)
+            ranges.append((lat_first, lat_last, lon_first, lon_last))
+        count = sum((lat_last - lat_first + 1) * (lon_last - lon_first + 1)
+                    for lat_first, lat_last, lon_first, lon_last in ranges)
+        if count > max_cells:
+            break
+
+        # Centre de chaque cellule encodé à cette précision
+        best = sorted({
+            geohash_encode(-90.0 + (lat_cell + 0.5) * lat_size, -180.0 + (lon_cell + 0.5) * lon_size, precision)
+            for lat_first, lat_last, lon_first, lon_last in ranges
+            for lat_cell in range(lat_first, lat_last + 1)
+            for lon_cell in range(lon_first, lon_last + 1)
+        })
+    return best
+
+
+def in_bbox(latitude, longitude, min_lat, min_lon, max_lat, max_lon):
+    """True si le point est dans le rectangle (min_lon > max_lon : antiméridien)"""
+    if not min_lat <= latitude <= max_lat:
+        return False
+    if min_lon > max_lon:
+        return longitude >= min_lon or longitude <= max_lon
+    return min_lon <= longitude <= max_lon
+
+
+# ============================================================================
+# INDEX EN MÉMOIRE
+# ============================================================================
+
+class GeoIndex:
+    """
+    Index spatial en mémoire : points triés par geohash, chaque recherche
+    lit seulement les plages de préfixes couvrant la zone (bisect) puis
+    filtre par distance ou rectangle exact, sans parcourir tout le catalogue
+    """
+
+    def __init__(self, precision=GEOHASH_PRECISION):
+        self.precision = precision
+        self.points = []       # (geohash, latitude, longitude, clé)
+        self.hashes = None     # geohashes triés (construits à la première recherche)
+
+    def __len__(self):
+        return len(self.points)
+
+    def add(self, key, latitude, longitude, geohash=None):
+        """Ajouter un point (clé : id_hotel par exemple)"""
+        geohash = geohash or geohash_encode(latitude, longitude, self.precision)
+        self.points.append((geohash, latitude, longitude, key))
+        self.hashes = None
+
+    def _sorted(self):
+        """Trier les points par geohash (une fois après des ajouts)"""
+        if self.hashes is None:
+            self.points.sort(key=lambda point: point[0])
+            self.hashes = [point[0] for point in self.points]
+        return self.hashes
+
+    def _scan(self, prefixes):
+        """Points dont le geohash commence par l'un des préfixes"""
+        hashes = self._sorted()
+        for prefix in prefixes:
+            # '{' suit 'z' : borne haute de tous les geohashes de préfixe prefix
+            start = bisect_left(hashes, prefix)
+            end = bisect_left(hashes, prefix + '{', start)
+            yield from self.points[start:end]
+
+    def within_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """Clés des points du rectangle (min_lon > max_lon : passage de l'antiméridien)"""
+        return [key for _, latitude, longitude, key in self._scan(covering_cells(min_lat, min_lon, max_lat, max_lon))
+                if in_bbox(latitude, longitude, min_lat, min_lon, max_lat, max_lon)]
+
+    def within_radius(self, latitude, longitude, radius_km, limit=None):
+        """[(distance_km, clé)] des points à moins de radius_km, du plus proche au plus loin"""
+        found = []
+        for _, point_lat, point_lon, key in self._scan(covering_cells(*radius_bbox(latitude, longitude, radius_km))):
+            distance = haversine_km(latitude, longitude, point_lat, point_lon)
+            if distance <= radius_km:
+                found.append((distance, key))
+        found.sort()
+        return found[:limit] if limit else found
+
+    @classmethod
+    def from_connection(cls, connection, precision=GEOHASH_PRECISION):
+        """Index des hôtels chargés (HOTEL + HOTEL_GEO), clé = id_hotel"""
+        index = cls(precision)
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT h.id_hotel, h.latitude, h.longitude, g.geohash "
+                           "FROM HOTEL h JOIN HOTEL_GEO g ON g.id_hotel = h.id_hotel")
+            for hotel_id, latitude, longitude, geohash in cursor.fetchall():
+                index.add(hotel_id, float(latitude), float(longitude), geohash[:precision])
+        finally:
+            cursor.close()
+        return index
+
+
+# ============================================================================
+# RECHERCHE EN BASE (CLÉ geohash DE HOTEL_GEO)
+# ============================================================================
+
+def find_hotels_near(connection, latitude, longitude, radius_km, limit=None):
+    """
+    [(distance_km, id_hotel)] des hôtels à moins de radius_km, du plus proche au plus loin
+    Une requête sur les plages de préfixes (LIKE 'préfixe%' : parcours d'index sur geohash),
+    distances exactes calculées sur les seuls candidats
+    """
+    prefixes = covering_cells(*radius_bbox(latitude, longitude, radius_km))
+    cursor = connection.cursor()
+    try:
+        condition = ' OR '.join(['g.geohash LIKE %s'] * len(prefixes))
+        cursor.execute("SELECT h.id_hotel, h.latitude, h.longitude FROM HOTEL_GEO g "
+                       f"JOIN HOTEL h ON h.id_hotel = g.id_hotel WHERE {condition}",
+                       [prefix + '%' for prefix in prefixes])
+        candidates = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    found = []
+    for hotel_id, point_lat, point_lon in candidates:
+        distance = haversine_km(latitude, longitude, float(point_lat), float(point_lon))
+        if distance <= radius_km:
+            found.append((distance, hotel_id))
+    found.sort()
+    return found[:limit] if limit else found
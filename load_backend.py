@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+============================================================================
+TEST DE CHARGE DU BACKEND (TRAFIC DE RÉSERVATION REJOUÉ)
+============================================================================
+Rejoue un mélange configurable de requêtes sur le backend Node lancé en local
+(recherche, fiche hôtel, chambres, offres, avis, réservations), à partir des
+hôtels / chambres / offres présents dans la base MySQL (les derniers chargés).
+
+- débit visé en requêtes/seconde (charge ouverte : les requêtes partent à
+  heure fixe, même si le backend ralentit)
+- latence mesurée depuis l'heure prévue de la requête : l'attente due à un
+  backend saturé est comptée (pas d'omission coordonnée)
+- percentiles de latence et taux d'erreur par route, rapport JSON optionnel
+- aucun service externe : backend local + MySQL local
+
+Les réservations créées portent LOAD_TEST_MARKER dans special_requests,
+--cleanup les supprime à la fin.
+
+Utilisation : python load_backend.py [--rate 50] [--duration 30]
+              [--mix search=30,detail=25,rooms=10,offers=15,offer=5,avis=10,reservation=5]
+              [--url http://localhost:3000] [--json rapport.json] [--cleanup]
+============================================================================
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter, namedtuple
+from datetime import date, timedelta
+from urllib.parse import quote
+
+from run_metrics import StageMetrics, percentile, QUANTILES
+
+# Backend lancé en local (backend/server.js)
+BACKEND_URL = 'http://localhost:3000'
+
+# Débit visé (requêtes/seconde) et durée du test (secondes)
+DEFAULT_RATE = 50
+DEFAULT_DURATION = 30
+
+# Requêtes en vol au maximum : au-delà, les requêtes prévues attendent leur tour
+# (l'attente est comptée dans leur latence)
+MAX_IN_FLIGHT = 200
+
+# Délai max d'une requête (secondes), au-delà : erreur 'timeout'
+REQUEST_TIMEOUT = 10
+
+# Offres lues dans la base (les plus récentes) pour construire les requêtes
+SAMPLE_OFFERS = 5000
+
+# Génération reproductible des requêtes
+LOAD_SEED = 1
+
+# Marqueur des réservations créées par le test (special_requests)
+LOAD_TEST_MARKER = 'load-test'
+
+# Mélange par défaut : poids relatifs des routes
+DEFAULT_MIX = {
+    'search': 30,
+    'detail': 25,
+    'rooms': 10,
+    'offers': 15,
+    'offer': 5,
+    'avis': 10,
+    'reservation': 5,
+}
+
+# Une offre chargée : de quoi construire toutes les requêtes
+Target = namedtuple('Target', ['id_hotel', 'city', 'id_chambre', 'id_offre', 'price', 'currency'])
+
+
+# ============================================================================
+# DONNÉES CIBLES (BASE MYSQL)
+# ============================================================================
+
+def load_targets(connection, limit=SAMPLE_OFFERS):
+    """Dernières offres chargées avec leur chambre et leur hôtel"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            SELECT o.id_hotel, h.ville_hotel, o.id_chambre, o.id_offre, o.prix_nuit, o.devise
+            FROM OFFRE o JOIN HOTEL h ON h.id_hotel = o.id_hotel
+            ORDER BY o.id_offre DESC
+            LIMIT %s
+        """, (limit,))
+        return [Target(hotel_id, city, room_id, offer_id, float(price), currency)
+                for hotel_id, city, room_id, offer_id, price, currency in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def delete_test_reservations(connection):
+    """Supprimer les réservations créées par le test, retourne leur nombre"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("DELETE FROM RESERVATION WHERE special_requests = %s", (LOAD_TEST_MARKER,))
+        connection.commit()
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def connect(database=None):
+    """Connexion à la base de DB_CONFIG (celle du backend)"""
+    import mysql.connector
+    from scrape_booking_hotels import DB_CONFIG
+
+    config = dict(DB_CONFIG, database=database) if database else DB_CONFIG
+    return mysql.connector.connect(**config)
+
+
+# ============================================================================
+# REQUÊTES PAR ROUTE
+# ============================================================================
+# Chaque route retourne (méthode, chemin, corps JSON ou None) pour une offre
+
+def reservation_body(target, rng):
+    """Corps d'une réservation de 1 à 7 nuits, arrivée dans 7 à 120 jours"""
+    nights = rng.randint(1, 7)
+    check_in = date.today() + timedelta(days=rng.randint(7, 120))
+    return {
+        'id_offre': target.id_offre,
+        'id_hotel': target.id_hotel,
+        'id_chambre': target.id_chambre,
+        'check_in': check_in.isoformat(),
+        'check_out': (check_in + timedelta(days=nights)).isoformat(),
+        'nbre_nuits': nights,
+        'nbre_adults': rng.randint(1, 2),
+        'nbre_children': 0,
+        'prix_nuit': target.price,
+        'total_price': round(target.price * nights, 2),
+        'devise': target.currency,
+        'special_requests': LOAD_TEST_MARKER,
+    }
+
+
+ROUTES = {
+    'search': lambda target, rng: ('GET', f"/api/search?q={quote(target.city)}", None),
+    'detail': lambda target, rng: ('GET', f"/api/hotels/{target.id_hotel}", None),
+    'rooms': lambda target, rng: ('GET', f"/api/hotels/{target.id_hotel}/chambres", None),
+    'offers': lambda target, rng: ('GET', f"/api/chambres/{target.id_chambre}", None),
+    'offer': lambda target, rng: ('GET', f"/api/offres/{target.id_offre}", None),
+    'avis': lambda target, rng: ('GET', f"/api/hotels/{target.id_hotel}/avis", None),
+    'reservation': lambda target, rng: ('POST', "/api/reservations", reservation_body(target, rng)),
+}
+
+
+def parse_mix(text):
+    """'search=30,detail=20' → {'search': 30, 'detail': 20} (routes connues, poids positifs)"""
+    mix = {}
+    for part in filter(None, (item.strip() for item in text.split(','))):
+        route, _, weight = part.partition('=')
+        route = route.strip()
+        if route not in ROUTES:
+            raise ValueError(f"Route inconnue : {route!r} (attendu : {', '.join(ROUTES)})")
+        mix[route] = float(weight) if weight else 1.0
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Mélange vide : au moins une route avec un poids positif")
+    return mix
+
+
+def plan_requests(targets, mix, count, seed=LOAD_SEED):
+    """count requêtes (route, méthode, chemin, corps) tirées selon le mélange"""
+    rng = random.Random(seed)
+    routes = list(mix)
+    weights = [mix[route] for route in routes]
+    plan = []
+    for route in rng.choices(routes, weights, k=count):
+        method, path, body = ROUTES[route](rng.choice(targets), rng)
+        plan.append((route, method, path, body))
+    return plan
+
+
+# ============================================================================
+# EXÉCUTION (ASYNCIO + AIOHTTP)
+# ============================================================================
+
+class LoadRun:
+    """
+    Résultats d'un test de charge
+    - metrics : latences par route (StageMetrics, étape = route)
+    - errors  : {route: Counter(statut HTTP ou type d'erreur)}
+    """
+
+    def __init__(self):
+        self.metrics = StageMetrics()
+        self.errors = {}
+        self.started = None
+        self.finished = None
+
+    def record(self, route, seconds, error=None):
+        """Enregistrer une requête (durée depuis l'heure prévue, erreur éventuelle)"""
+        self.metrics.record(route, seconds)
+        if error is not None:
+            self.errors.setdefault(route, Counter())[error] += 1
+
+    def summary(self):
+        """{route: requests, errors, error_rate, p50, p90, p99, max (millisecondes), errors_by_kind}"""
+        result = {}
+        for route, values in self.metrics.summary().items():
+            errors = self.errors.get(route, Counter())
+            failed = sum(errors.values())
+            result[route] = {
+                'requests': values['calls'],
+                'errors': failed,
+                'error_rate': round(failed / values['calls'], 4),
+                **{f"p{quantile * 100:g}_ms": round(values[f"p{quantile * 100:g}"] * 1000, 2)
+                   for quantile in QUANTILES},
+                'max_ms': round(values['max'] * 1000, 2),
+                'errors_by_kind': {str(kind): count for kind, count in errors.most_common()},
+            }
+        return result
+
+    def report(self, target_rate):
+        """Rapport complet : débit visé et obtenu, résumé par route et global"""
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        routes = self.summary()
+        total = sum(values['requests'] for values in routes.values())
+        with self.metrics.lock:
+            samples = sorted(sample for entry in self.metrics.stages.values() for sample in entry['samples'])
+        return {
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'target_rate': target_rate,
+            'achieved_rate': round(total / elapsed, 1) if elapsed > 0 else None,
+            'seconds': round(elapsed, 3),
+            'requests': total,
+            'errors': sum(values['errors'] for values in routes.values()),
+            **{f"p{quantile * 100:g}_ms": round(percentile(samples, quantile) * 1000, 2) for quantile in QUANTILES},
+            'routes': routes,
+        }
+
+
+async def send(session, base_url, request, scheduled, run, semaphore, timeout):
+    """Envoyer une requête prévue à scheduled (horloge perf_counter) et l'enregistrer"""
+    import asyncio
+    import aiohttp
+
+    route, method, path, body = request
+    error = None
+    try:
+        async with semaphore:
+            async with session.request(method, base_url + path, json=body,
+                                       timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                await response.read()
+                if response.status >= 400:
+                    error = response.status
+    except asyncio.TimeoutError:
+        error = 'timeout'
+    except aiohttp.ClientError as e:
+        error = type(e).__name__
+    run.record(route, time.perf_counter() - scheduled, error)
+
+
+async def run_load(plan, rate, base_url=BACKEND_URL, max_in_flight=MAX_IN_FLIGHT, timeout=REQUEST_TIMEOUT):
+    """Envoyer les requêtes du plan au débit visé (une toutes les 1/rate secondes), retourne le LoadRun"""
+    import asyncio
+    import aiohttp
+
+    run = LoadRun()
+    semaphore = asyncio.Semaphore(max_in_flight)
+    connector = aiohttp.TCPConnector(limit=max_in_flight, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        run.started = time.perf_counter()
+        tasks = []
+        for index, request in enumerate(plan):
+            scheduled = run.started + index / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(send(session, base_url, request, scheduled, run, semaphore,
+                                                    timeout)))
+        await asyncio.gather(*tasks)
+        run.finished = time.perf_counter()
+    return run
+
+
+def print_report(report):
+    """Tableau par route : requêtes, erreurs, percentiles de latence"""
+    print(f"\n📊 {report['requests']} requêtes en {report['seconds']:.1f}s "
+          f"({report['achieved_rate']} req/s pour {report['target_rate']} visées), "
+          f"{report['errors']} erreur(s)")
+    print(f"  {'Route':<14}{'requêtes':>10}{'erreurs':>9}{'% err.':>8}{'p50 ms':>9}{'p90 ms':>9}"
+          f"{'p99 ms':>9}{'max ms':>9}")
+    for route, values in sorted(report['routes'].items(), key=lambda item: -item[1]['requests']):
+        print(f"  {route:<14}{values['requests']:>10}{values['errors']:>9}{values['error_rate']:>8.1%}"
+              f"{values['p50_ms']:>9.1f}{values['p90_ms']:>9.1f}{values['p99_ms']:>9.1f}{values['max_ms']:>9.1f}")
+        if values['errors_by_kind']:
+            kinds = ', '.join(f"{kind} × {count}" for kind, count in values['errors_by_kind'].items())
+            print(f"  {'':<14}⚠️  {kinds}")
+
+
+# ============================================================================
+# POINT D'ENTRÉE
+# ============================================================================
+
+def main():
+    """Point d'entrée du test de charge"""
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="Test de charge du backend (trafic de réservation rejoué)")
+    parser.add_argument('--url', default=BACKEND_URL, help="Adresse du backend")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="Débit visé (requêtes/seconde)")
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION, help="Durée du test (secondes)")
+    parser.add_argument('--mix', default=','.join(f"{route}={weight}" for route, weight in DEFAULT_MIX.items()),
+                        help=f"Poids des routes (routes : {', '.join(ROUTES)})")
+    parser.add_argument('--max-in-flight', type=int, default=MAX_IN_FLIGHT, help="Requêtes simultanées au maximum")
+    parser.add_argument('--timeout', type=float, default=REQUEST_TIMEOUT, help="Délai max d'une requête (secondes)")
+    parser.add_argument('--sample', type=int, default=SAMPLE_OFFERS, help="Offres lues dans la base")
+    parser.add_argument('--database', default=None, help="Base MySQL (par défaut : celle de DB_CONFIG)")
+    parser.add_argument('--seed', type=int, default=LOAD_SEED, help="Graine du tirage des requêtes")
+    parser.add_argument('--json', metavar='FICHIER', default=None, help="Écrire le rapport JSON")
+    parser.add_argument('--cleanup', action='store_true', help="Supprimer les réservations créées à la fin")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.rate <= 0 or args.duration <= 0:
+        parser.error("--rate et --duration doivent être positifs")
+
+    connection = connect(args.database)
+    try:
+        targets = load_targets(connection, args.sample)
+        if not targets:
+            print("❌ Aucune offre dans la base : lance d'abord le chargement (scrape_booking_hotels.py)")
+            return 1
+
+        count = max(1, int(args.rate * args.duration))
+        plan = plan_requests(targets, mix, count, args.seed)
+        print(f"🚦 {count} requêtes vers {args.url} à {args.rate:g} req/s "
+              f"({len(targets)} offres, {len({target.id_hotel for target in targets})} hôtels)")
+
+        run = asyncio.run(run_load(plan, args.rate, args.url, args.max_in_flight, args.timeout))
+        report = run.report(args.rate)
+        print_report(report)
+
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as report_file:
+                json.dump(report, report_file, indent=2, ensure_ascii=False)
+            print(f"\n💾 Rapport : {args.json}")
+
+        if args.cleanup and 'reservation' in mix:
+            print(f"🧹 {delete_test_reservations(connection)} réservation(s) de test supprimée(s)")
+    finally:
+        connection.close()
+
+    return 1 if report['requests'] and report['errors'] == report['requests'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
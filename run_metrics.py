@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+============================================================================
+MESURES DES ÉTAPES DU CHARGEMENT
+============================================================================
+Temps et volumes par étape (téléchargement, analyse, génération, insertion
+par table, commit), avec percentiles, export JSON et format texte Prometheus.
+Affichage de la progression par niveaux, limité dans le temps : la console
+ne ralentit plus les gros chargements.
+============================================================================
+"""
+
+import json
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Nombre max de durées conservées par étape (échantillonnage au-delà)
+MAX_SAMPLES = 10000
+
+# Percentiles calculés pour chaque étape
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Niveaux d'affichage, du plus discret au plus bavard
+LEVELS = ('quiet', 'progress', 'verbose')
+
+# Préfixe des métriques Prometheus
+METRIC_PREFIX = 'hotel_seed'
+
+
+# ============================================================================
+# TEMPS PAR ÉTAPE
+# ============================================================================
+
+class StageMetrics:
+    """
+    Durées et volumes par étape, partageables entre threads
+    - record(stage, secondes, éléments) ou with measure(stage, éléments)
+    - durées échantillonnées (MAX_SAMPLES par étape) pour les percentiles
+    - export() / merge() : regrouper les mesures faites dans d'autres processus
+    """
+
+    def __init__(self, max_samples=MAX_SAMPLES):
+        self.max_samples = max_samples
+        self.stages = {}
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+        # Générateur privé : l'échantillonnage ne touche pas au module random
+        self.sampler = random.Random(0)
+
+    def record(self, stage, seconds, items=1):
+        """Enregistrer une exécution de l'étape (durée en secondes, éléments traités)"""
+        with self.lock:
+            entry = self.stages.get(stage)
+            if entry is None:
+                entry = self.stages[stage] = {'calls': 0, 'items': 0, 'seconds': 0.0, 'max': 0.0, 'samples': []}
+            entry['calls'] += 1
+            entry['items'] += items
+            entry['seconds'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            self._sample(entry, seconds)
+
+    def _sample(self, entry, seconds):
+        """Échantillonnage par réservoir : chaque durée a la même chance d'être gardée"""
+        samples = entry['samples']
+        if len(samples) < self.max_samples:
+            samples.append(seconds)
+        else:
+            slot = self.sampler.randrange(entry['calls'])
+            if slot < self.max_samples:
+                samples[slot] = seconds
+
+    @contextmanager
+    def measure(self, stage, items=1):
+        """Mesurer le bloc with comme une exécution de l'étape"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, items)
+
+    def export(self):
+        """Mesures brutes (sérialisables) puis remise à zéro, pour merge() dans un autre processus"""
+        with self.lock:
+            stages, self.stages = self.stages, {}
+        return stages
+
+    def merge(self, stages):
+        """Ajouter les mesures brutes d'export()"""
+        with self.lock:
+            for stage, other in stages.items():
+                entry = self.stages.setdefault(stage, {'calls': 0, 'items': 0, 'seconds': 0.0, 'max': 0.0,
+                                                       'samples': []})
+                entry['calls'] += other['calls']
+                entry['items'] += other['items']
+                entry['seconds'] += other['seconds']
+                entry['max'] = max(entry['max'], other['max'])
+                samples = entry['samples'] + other['samples']
+                if len(samples) > self.max_samples:
+                    samples = self.sampler.sample(samples, self.max_samples)
+                entry['samples'] = samples
+
+    def summary(self):
+        """{étape: calls, items, seconds, items_per_second, max, p50, p90, p99}"""
+        with self.lock:
+            stages = {stage: dict(entry, samples=sorted(entry['samples'])) for stage, entry in self.stages.items()}
+
+        result = {}
+        for stage, entry in stages.items():
+            samples = entry['samples']
+            result[stage] = {
+                'calls': entry['calls'],
+                'items': entry['items'],
+                'seconds': round(entry['seconds'], 6),
+                'items_per_second': round(entry['items'] / entry['seconds'], 1) if entry['seconds'] > 0 else None,
+                'max': round(entry['max'], 6),
+            }
+            for quantile in QUANTILES:
+                result[stage][f"p{quantile * 100:g}"] = round(percentile(samples, quantile), 6)
+        return result
+
+    def report(self):
+        """Rapport complet (durée totale de l'exécution + étapes)"""
+        return {
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'wall_seconds': round(time.perf_counter() - self.started, 3),
+            'stages': self.summary(),
+        }
+
+    def write_json(self, path):
+        """Écrire le rapport JSON"""
+        with open(path, 'w', encoding='utf-8') as report_file:
+            json.dump(self.report(), report_file, indent=2, ensure_ascii=False)
+
+    def prometheus(self):
+        """Mesures au format texte Prometheus (summary par étape + compteur d'éléments)"""
+        summary = self.summary()
+        lines = [
+            f"# HELP {METRIC_PREFIX}_stage_seconds Durée des exécutions de chaque étape",
+            f"# TYPE {METRIC_PREFIX}_stage_seconds summary",
+        ]
+        for stage, values in summary.items():
+            label = prometheus_label(stage)
+            for quantile in QUANTILES:
+                lines.append(f'{METRIC_PREFIX}_stage_seconds{{stage="{label}",quantile="{quantile:g}"}} '
+                             f'{values[f"p{quantile * 100:g}"]}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_sum{{stage="{label}"}} {values["seconds"]}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_count{{stage="{label}"}} {values["calls"]}')
+
+        lines.append(f"# HELP {METRIC_PREFIX}_stage_items_total Éléments traités par chaque étape")
+        lines.append(f"# TYPE {METRIC_PREFIX}_stage_items_total counter")
+        for stage, values in summary.items():
+            lines.append(f'{METRIC_PREFIX}_stage_items_total{{stage="{prometheus_label(stage)}"}} {values["items"]}')
+
+        lines.append(f"# HELP {METRIC_PREFIX}_wall_seconds Durée totale de l'exécution")
+        lines.append(f"# TYPE {METRIC_PREFIX}_wall_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_wall_seconds {time.perf_counter() - self.started:.3f}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """Écrire les mesures au format Prometheus (fichier lisible par le textfile collector)"""
+        with open(path, 'w', encoding='utf-8') as metrics_file:
+            metrics_file.write(self.prometheus())
+
+    def print_table(self):
+        """Afficher le tableau des étapes, de la plus coûteuse à la moins coûteuse"""
+        summary = self.summary()
+        if not summary:
+            return
+        print(f"\n⏱️  ÉTAPES ({time.perf_counter() - self.started:.2f}s au total):")
+        print(f"  {'Étape':<24}{'appels':>8}{'éléments':>11}{'total s':>10}{'élém./s':>12}"
+              f"{'p50 ms':>9}{'p99 ms':>9}")
+        for stage, values in sorted(summary.items(), key=lambda item: -item[1]['seconds']):
+            rate = f"{values['items_per_second']:,.0f}" if values['items_per_second'] else '-'
+            print(f"  {stage:<24}{values['calls']:>8}{values['items']:>11}{values['seconds']:>10.2f}{rate:>12}"
+                  f"{values['p50'] * 1000:>9.1f}{values['p99'] * 1000:>9.1f}")
+
+
+def percentile(sorted_values, quantile):
+    """Percentile (rang le plus proche) d'une liste triée, 0 si vide"""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, int(round(quantile * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def prometheus_label(value):
+    """Échapper une valeur de label Prometheus"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# ============================================================================
+# AFFICHAGE DE LA PROGRESSION
+# ============================================================================
+
+class ProgressReporter:
+    """
+    Affichage par niveaux :
+    - 'quiet'    : rien pendant le chargement (en-têtes, erreurs et résumé seulement)
+    - 'progress' : une ligne de progression au plus toutes les interval secondes
+    - 'verbose'  : en plus, une ligne par hôtel et par lot (ancien affichage)
+    """
+
+    def __init__(self, level='progress', interval=2.0, unit='hôtels écrits', stream=None):
+        if level not in LEVELS:
+            raise ValueError(f"Niveau d'affichage inconnu : {level!r} (attendu : {', '.join(LEVELS)})")
+        self.level = level
+        self.interval = interval
+        self.unit = unit
+        self.stream = stream
+        self.count = 0
+        self.started = time.perf_counter()
+        self.last_print = self.started
+        self.lock = threading.Lock()
+
+    @property
+    def verbose(self):
+        """True si les lignes de détail sont affichées (à tester avant de formater un message coûteux)"""
+        return self.level == 'verbose'
+
+    def detail(self, message):
+        """Ligne de détail (niveau 'verbose' uniquement)"""
+        if self.level == 'verbose':
+            print(message, file=self.stream or sys.stdout)
+
+    def advance(self, count=1):
+        """Avancer le compteur, afficher la progression si interval secondes sont passées"""
+        with self.lock:
+            self.count += count
+            now = time.perf_counter()
+            if self.level == 'quiet' or now - self.last_print < self.interval:
+                return
+            self.last_print = now
+            total = self.count
+        elapsed = now - self.started
+        print(f"  ⏳ {thousands(total)} {self.unit} ({thousands(total / elapsed)}/s, {elapsed:.0f}s)",
+              file=self.stream or sys.stdout)
+
+
+def thousands(value):
+    """Nombre arrondi avec espaces entre les milliers (12 345)"""
+    return f"{value:,.0f}".replace(',', ' ')
@@ -10,17 +10,29 @@ Insère les données dans MySQL : hôtels, chambres, photos, offres, avis
 ============================================================================
 """
 
-import requests
-from bs4 import BeautifulSoup
-import mysql.connector
-from mysql.connector import Error
 import time
 import random
 import json
+import hashlib
+import sqlite3
+import argparse
 from datetime import datetime, timedelta
 import re
 from urllib.parse import quote
 import sys
+import os
+from booking_parser import parse_search_page
+from run_metrics import StageMetrics, ProgressReporter
+from geo_index import geohash_encode, geohash_encode_array
+import math
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from collections import deque, namedtuple
+from functools import lru_cache
+import queue
+import tempfile
 
 # ============================================================================
 # CONFIGURATION
@@ -44,22 +56,150 @@ HEADERS = {
     'Upgrade-Insecure-Requests': '1'
 }
 
+# Nombre d'hôtels par lot d'insertion (une transaction par lot)
+BATCH_SIZE = 25
+
+# Identifiants HOTEL/CHAMBRE attribués côté client (plus de lastrowid par parent)
+# Demande les droits ALTER et LOCK TABLES ; toujours actif en mode 'vectorized',
+# 'load_data' et 'upsert' et pour le rechargement d'un instantané
+CLIENT_SIDE_IDS = False
+ID_BLOCK_SIZE = 1000
+
+# Mode de chargement : 'insert' (INSERT multi-lignes), 'load_data' ou 'upsert'
+# ('load_data' = fichiers TSV par table + LOAD DATA LOCAL INFILE, pour les gros volumes)
+LOAD_MODE = 'insert'
+# 'upsert' : mise à jour incrémentale par hotel_id_api, seuls les hôtels dont le
+# contenu a changé (empreinte SHA-256) sont réécrits (table de suivi HOTEL_SYNC)
+STAGING_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'staging')
+
+# Stockage des URLs de photos : 'inline' (URL dans IMG_HOTEL / IMG_CHAMBRE) ou
+# 'dictionary' (URLs distinctes dans PHOTO_URL, référencées par identifiant dans
+# IMG_HOTEL_URL / IMG_CHAMBRE_URL, tables créées automatiquement)
+PHOTO_URL_MODE = 'inline'
+
+# Sortie des données générées :
+# - 'mysql'    : base MySQL de DB_CONFIG
+# - 'sqlite'   : fichier SQLITE_PATH, tables créées automatiquement (LOAD_MODE 'insert')
+# - 'snapshot' : instantané en colonnes dans SNAPSHOT_DIR (une table Arrow par table SQL),
+#                rechargeable dans MySQL sans régénérer (--restore-snapshot), pip install pyarrow
+OUTPUT_SINK = 'mysql'
+SQLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hotel_booking.sqlite3')
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshot')
+SNAPSHOT_FORMAT = 'arrow'          # 'arrow' (IPC, lu en mémoire projetée) ou 'parquet' (compressé)
+SNAPSHOT_CHUNK_HOTELS = 1000       # Hôtels par paquet (une transaction par paquet au rechargement)
+
+# Traitement parallèle des destinations (1 = une seule connexion, séquentiel)
+# Chaque worker prend une connexion du pool mysql.connector.pooling (max 32)
+WORKERS = 1
+POOL_SIZE = WORKERS + 1
+
+# Mode de génération : 'standard' (hôtel par hôtel) ou 'vectorized' (NumPy, par
+# paquets de VECTOR_CHUNK_HOTELS hôtels, pour générer des millions d'offres en test de charge)
+# 'vectorized' ignore les pages de recherche téléchargées (pip install numpy)
+GENERATION_MODE = 'standard'
+VECTOR_CHUNK_HOTELS = 1000
+
+# Génération reproductible : avec une graine, chaque destination (mode 'standard')
+# ou chaque paquet de VECTOR_CHUNK_HOTELS hôtels (mode 'vectorized') a son propre
+# générateur aléatoire dérivé de la graine : même jeu de données quel que soit le
+# nombre de processus. GENERATION_DATE fixe la date de référence des avis
+GENERATION_SEED = None         # Entier, None = aléatoire à chaque exécution
+GENERATION_DATE = None         # 'AAAA-MM-JJ', None = aujourd'hui
+GENERATION_PROCESSES = 1       # > 1 : génération répartie dans un ProcessPoolExecutor
+
+# Calendrier des tarifs (table TARIF_NUIT) : prix de chaque nuit de chaque offre sur
+# RATE_CALENDAR_DAYS nuits à partir de la date de référence, calculé avec NumPy
+# (0 = pas de calendrier). Prix de la nuit = prix de l'offre × saison (sommet au
+# peak_month de la destination) × majoration du week-end × remise de dernière minute
+RATE_CALENDAR_DAYS = 0
+RATE_SEASON_AMPLITUDE = 0.25        # ±25 % entre haute et basse saison
+RATE_WEEKEND_UPLIFT = 0.15          # Nuits du vendredi et du samedi
+RATE_LAST_MINUTE_DAYS = 7           # Nuits proches de la date de référence...
+RATE_LAST_MINUTE_DISCOUNT = 0.10    # ... remisées
+
+# File bornée entre la génération et l'écriture : le producteur est bloqué
+# (contre-pression) quand l'écriture prend du retard
+PIPELINE_QUEUE_SIZE = 50
+
+# Journal de progression (SQLite local) : hôtels déjà validés en base,
+# pour reprendre un chargement interrompu avec --resume (même configuration : run_config)
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seed_journal.sqlite3')
+
+# Session de chargement : FOREIGN_KEY_CHECKS / UNIQUE_CHECKS désactivés pendant
+# l'insertion, index secondaires optionnellement supprimés puis reconstruits,
+# ANALYZE TABLE en fin de chargement
+BULK_SESSION = True
+DROP_SECONDARY_INDEXES = False
+DEFERRED_INDEX_TABLES = ('CHAMBRE', 'OFFRE', 'AVIS')
+
+# Affichage et mesures : 'quiet' (en-têtes et résumé), 'progress' (une ligne de
+# progression au plus toutes les PROGRESS_INTERVAL secondes) ou 'verbose' (une ligne par hôtel)
+LOG_LEVEL = 'progress'
+PROGRESS_INTERVAL = 2.0
+# Temps par étape (téléchargement, analyse, génération, insertion par table, commit)
+# écrits en fin d'exécution : rapport JSON et format texte Prometheus (None = non écrit)
+METRICS_JSON_PATH = None
+METRICS_PROMETHEUS_PATH = None
+# Profil cProfile de l'exécution (option --profile sans fichier), lisible avec pstats ou snakeviz
+PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seed_profile.prof')
+PROFILE_TOP = 25                    # Fonctions affichées (temps cumulé décroissant)
+# Modules coûteux à importer, importés seulement par les chemins qui en ont besoin
+LAZY_MODULES = ('mysql.connector', 'numpy', 'pyarrow', 'aiohttp', 'selectolax', 'lxml', 'bs4')
+
+# Limitation du débit des requêtes HTTP sortantes (par hôte)
+HTTP_RATE_LIMIT = 0.5      # Requêtes par seconde et par hôte
+HTTP_BURST = 1             # Requêtes autorisées d'affilée avant limitation
+HTTP_JITTER = 1.0          # Délai aléatoire supplémentaire max (secondes)
+HTTP_TIMEOUT = 15
+
+# Téléchargement asynchrone des pages de recherche (aiohttp)
+FETCH_SEARCH_PAGES = False          # True = télécharger les pages de recherche Booking.com
+BOOKING_BASE_URL = 'https://www.booking.com'   # Remplaçable par un serveur local de test
+HTTP_CONCURRENCY_PER_HOST = 4       # Connexions keep-alive simultanées par hôte
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF = 1.0                  # Délai de base du backoff exponentiel (secondes)
+
+# Cache disque des pages téléchargées (revalidation ETag/Last-Modified, éviction LRU)
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'http_cache')
+HTTP_CACHE_TTL = 24 * 3600          # Durée de fraîcheur d'une page (secondes)
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
 # 12 destinations de ton index.html
+# latitude / longitude : centre de la destination, radius_km : rayon de dispersion des hôtels,
+# peak_month : mois le plus cher (saisonnalité du calendrier des tarifs)
 DESTINATIONS = [
-    {'name': 'Paris', 'country': 'France', 'target_hotels': 9},
-    {'name': 'Amsterdam', 'country': 'Netherlands', 'target_hotels': 8},
-    {'name': 'St Petersburg', 'country': 'Russia', 'target_hotels': 8},
-    {'name': 'Prague', 'country': 'Czech Republic', 'target_hotels': 8},
-    {'name': 'Tahiti', 'country': 'French Polynesia', 'target_hotels': 8},
-    {'name': 'Zanzibar', 'country': 'Tanzania', 'target_hotels': 8},
-    {'name': 'Male', 'country': 'Maldives', 'target_hotels': 8},  # Capitale des Maldives
-    {'name': 'Cancun', 'country': 'Mexico', 'target_hotels': 9},
-    {'name': 'Dubai', 'country': 'United Arab Emirates', 'target_hotels': 9},
-    {'name': 'Bali', 'country': 'Indonesia', 'target_hotels': 8},
-    {'name': 'New York', 'country': 'United States', 'target_hotels': 9},
-    {'name': 'Tokyo', 'country': 'Japan', 'target_hotels': 9}
+    {'name': 'Paris', 'country': 'France', 'target_hotels': 9,
+     'latitude': 48.8566, 'longitude': 2.3522, 'radius_km': 6, 'peak_month': 6},
+    {'name': 'Amsterdam', 'country': 'Netherlands', 'target_hotels': 8,
+     'latitude': 52.3676, 'longitude': 4.9041, 'radius_km': 5, 'peak_month': 7},
+    {'name': 'St Petersburg', 'country': 'Russia', 'target_hotels': 8,
+     'latitude': 59.9311, 'longitude': 30.3609, 'radius_km': 8, 'peak_month': 6},  # Nuits blanches
+    {'name': 'Prague', 'country': 'Czech Republic', 'target_hotels': 8,
+     'latitude': 50.0755, 'longitude': 14.4378, 'radius_km': 5, 'peak_month': 7},
+    {'name': 'Tahiti', 'country': 'French Polynesia', 'target_hotels': 8,
+     'latitude': -17.6509, 'longitude': -149.4260, 'radius_km': 15, 'peak_month': 7},  # Saison sèche
+    {'name': 'Zanzibar', 'country': 'Tanzania', 'target_hotels': 8,
+     'latitude': -6.1659, 'longitude': 39.2026, 'radius_km': 20, 'peak_month': 8},
+    {'name': 'Male', 'country': 'Maldives', 'target_hotels': 8,  # Capitale des Maldives
+     'latitude': 4.1755, 'longitude': 73.5093, 'radius_km': 25, 'peak_month': 2},
+    {'name': 'Cancun', 'country': 'Mexico', 'target_hotels': 9,
+     'latitude': 21.1619, 'longitude': -86.8515, 'radius_km': 10, 'peak_month': 3},
+    {'name': 'Dubai', 'country': 'United Arab Emirates', 'target_hotels': 9,
+     'latitude': 25.2048, 'longitude': 55.2708, 'radius_km': 15, 'peak_month': 1},
+    {'name': 'Bali', 'country': 'Indonesia', 'target_hotels': 8,
+     'latitude': -8.6500, 'longitude': 115.2167, 'radius_km': 20, 'peak_month': 8},
+    {'name': 'New York', 'country': 'United States', 'target_hotels': 9,
+     'latitude': 40.7128, 'longitude': -74.0060, 'radius_km': 8, 'peak_month': 12},
+    {'name': 'Tokyo', 'country': 'Japan', 'target_hotels': 9,
+     'latitude': 35.6762, 'longitude': 139.6503, 'radius_km': 10, 'peak_month': 4}  # Cerisiers
 ]
 
+# Destinations sans coordonnées (ex. destination ajoutée à la main) : centre et rayon par défaut
+DEFAULT_DESTINATION_CENTER = (48.8566, 2.3522)
+DEFAULT_RADIUS_KM = 10
+DEFAULT_PEAK_MONTH = 7
+
 # URLs Unsplash pour photos génériques (fallback)
 UNSPLASH_CATEGORIES = {
     'hotel_exterior': 'hotel+building+exterior',
@@ -76,10 +216,34 @@ UNSPLASH_CATEGORIES = {
 # FONCTIONS UTILITAIRES
 # ============================================================================
 
-def create_db_connection():
-    """Créer une connexion à la base de données MySQL"""
+class Error(Exception):
+    """
+    Erreur de base de données tant que mysql.connector n'est pas importé (SQLite,
+    instantané) ; remplacée par mysql.connector.Error dès mysql_connector()
+    """
+
+    def __init__(self, msg=None, *args):
+        super().__init__(msg, *args)
+        self.msg = msg
+
+
+def mysql_connector():
+    """
+    Importer mysql.connector à la première connexion MySQL (import paresseux :
+    la génération vers SQLite ou un instantané démarre sans lui)
+    Les except Error du script attrapent ensuite mysql.connector.Error
+    """
+    global Error
+    import mysql.connector
+
+    Error = mysql.connector.Error
+    return mysql.connector
+
+
+def create_db_connection(**options):
+    """Créer une connexion à la base de données MySQL (options en plus de DB_CONFIG)"""
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
+        connection = mysql_connector().connect(**DB_CONFIG, **options)
         if connection.is_connected():
             print("✅ Connexion MySQL réussie")
             return connection
@@ -88,8 +252,27 @@ def create_db_connection():
         sys.exit(1)
 
 
+def create_connection_pool(size=POOL_SIZE, **options):
+    """Créer un pool de connexions MySQL (une connexion par worker)"""
+    mysql_connector()
+    from mysql.connector import pooling
+
+    try:
+        pool = pooling.MySQLConnectionPool(pool_name='hotel_booking_seed', pool_size=size,
+                                           **DB_CONFIG, **options)
+        print(f"✅ Pool MySQL de {size} connexions prêt")
+        return pool
+    except Error as e:
+        print(f"❌ Erreur de connexion MySQL: {e}")
+        sys.exit(1)
+
+
+@lru_cache(maxsize=None)
 def generate_unsplash_url(category, search_term='', width=800, height=600):
-    """Générer une URL Unsplash pour image générique"""
+    """
+    Générer une URL Unsplash pour image générique
+    Mémoïsée : une même URL est toujours la même chaîne en mémoire
+    """
     if search_term:
         query = f"{UNSPLASH_CATEGORIES.get(category, 'hotel')},{search_term.replace(' ', '+')}"
     else:
@@ -98,9 +281,40 @@ def generate_unsplash_url(category, search_term='', width=800, height=600):
     return f"https://source.unsplash.com/{width}x{height}/?{query}"
 
 
-def random_delay(min_seconds=2, max_seconds=5):
-    """Délai aléatoire pour éviter d'être bloqué"""
-    time.sleep(random.uniform(min_seconds, max_seconds))
+class RateLimiter:
+    """
+    Limiteur de débit à seau de jetons, un seau par hôte
+    Partagé entre threads (verrou) : reserve() calcule l'attente sous verrou,
+    l'appelant dort ensuite (asyncio.sleep) sans bloquer les autres
+    """
+
+    def __init__(self, rate=HTTP_RATE_LIMIT, burst=HTTP_BURST, jitter=HTTP_JITTER):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.jitter = jitter
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def reserve(self, url):
+        """Réserver un jeton pour l'hôte de l'URL, retourne le délai d'attente en secondes"""
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        with self.lock:
+            tokens, last = self.buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            # Jetons négatifs = requêtes déjà en file d'attente sur cet hôte
+            tokens -= 1
+            self.buckets[host] = (tokens, now)
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        return wait + random.uniform(0, self.jitter)
+
+
+# Limiteur unique pour tout le script
+RATE_LIMITER = RateLimiter()
+
+# Mesures par étape et affichage de la progression, communs à tout le script
+METRICS = StageMetrics()
+PROGRESS = ProgressReporter(LOG_LEVEL, PROGRESS_INTERVAL)
 
 
 def clean_text(text):
@@ -122,497 +336,3311 @@ def generate_booking_search_url(city_name, country_name):
     """Générer URL de recherche Booking.com"""
     # Format: https://www.booking.com/searchresults.fr.html?ss=Paris
     query = quote(f"{city_name}, {country_name}")
-    return f"https://www.booking.com/searchresults.fr.html?ss={query}&checkin={datetime.now().strftime('%Y-%m-%d')}&checkout={(datetime.now() + timedelta(days=2)).strftime('%Y-%m-%d')}"
+    return f"{BOOKING_BASE_URL}/searchresults.fr.html?ss={query}&checkin={datetime.now().strftime('%Y-%m-%d')}&checkout={(datetime.now() + timedelta(days=2)).strftime('%Y-%m-%d')}"
+
+
+# ============================================================================
+# TÉLÉCHARGEMENT ASYNCHRONE DES PAGES
+# ============================================================================
+
+# Codes HTTP pour lesquels une nouvelle tentative a du sens
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def accept_encoding():
+    """En-tête Accept-Encoding : br seulement si le module brotli est installé"""
+    try:
+        import brotli  # noqa: F401
+        return 'gzip, deflate, br'
+    except ImportError:
+        return 'gzip, deflate'
+
+
+def normalize_url(url):
+    """Normaliser une URL pour le cache : schéma/hôte en minuscules, paramètres triés, sans fragment"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+
+class HttpCache:
+    """
+    Cache disque des réponses HTTP, adressé par le SHA-256 de l'URL normalisée
+    - <clé>.body : contenu de la page, <clé>.json : URL, ETag, Last-Modified, date
+    - une page plus vieille que ttl est revalidée (If-None-Match / If-Modified-Since)
+    - au-delà de max_bytes, les pages les moins récemment utilisées sont supprimées
+    - fichiers écrits à côté puis renommés (os.replace) : une écriture interrompue
+      ne laisse jamais de page tronquée servie comme fraîche
+    Partageable entre threads
+    """
+
+    def __init__(self, directory=HTTP_CACHE_DIR, ttl=HTTP_CACHE_TTL, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'revalidated': 0, 'stored': 0, 'evicted': 0}
+        os.makedirs(directory, exist_ok=True)
+        self.total_bytes = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+    def _write(self, path, write):
+        """Écrire un fichier du cache de façon atomique (fichier temporaire puis os.replace)"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with open(fd, 'w', encoding='utf-8') as tmp_file:
+                write(tmp_file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _paths(self, url):
+        key = hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + '.body', base + '.json'
+
+    def lookup(self, url):
+        """
+        Chercher une page : retourne (body, meta, frais)
+        body est None si la page n'est pas en cache
+        """
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as meta_file:
+                meta = json.load(meta_file)
+            with open(body_path, encoding='utf-8') as body_file:
+                body = body_file.read()
+        except (OSError, ValueError):
+            with self.lock:
+                self.stats['misses'] += 1
+            return None, None, False
+
+        fresh = time.time() - meta['stored_at'] < self.ttl
+        with self.lock:
+            self.stats['hits' if fresh else 'stale'] += 1
+        if fresh:
+            self._touch(body_path)
+        return body, meta, fresh
+
+    def revalidation_headers(self, meta):
+        """En-têtes de requête conditionnelle pour une page périmée"""
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def refresh(self, url, meta):
+        """Réponse 304 : la page en cache redevient fraîche"""
+        body_path, meta_path = self._paths(url)
+        meta['stored_at'] = time.time()
+        self._write(meta_path, lambda meta_file: json.dump(meta, meta_file))
+        self._touch(body_path)
+        with self.lock:
+            self.stats['revalidated'] += 1
+
+    def store(self, url, body, headers):
+        """
+        Enregistrer une réponse 200 puis évincer si la taille max est dépassée
+        Ancienne méta supprimée, page écrite, puis méta écrite en dernier : après une
+        interruption, la page est absente du cache (lookup sans méta = miss)
+        """
+        body_path, meta_path = self._paths(url)
+        meta = {
+            'url': normalize_url(url),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'stored_at': time.time()
+        }
+        old_size = sum(os.path.getsize(path) for path in (body_path, meta_path) if os.path.exists(path))
+        try:
+            os.remove(meta_path)
+        except FileNotFoundError:
+            pass
+        self._write(body_path, lambda body_file: body_file.write(body))
+        self._write(meta_path, lambda meta_file: json.dump(meta, meta_file))
+        new_size = os.path.getsize(body_path) + os.path.getsize(meta_path)
+
+        with self.lock:
+            self.stats['stored'] += 1
+            self.total_bytes += new_size - old_size
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _touch(self, body_path):
+        """Marquer une page comme récemment utilisée (date de modification du fichier)"""
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Supprimer les pages les moins récemment utilisées (appelé sous verrou)"""
+        entries = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith('.body')),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            meta_path = entry.path[:-len('.body')] + '.json'
+            for path in (entry.path, meta_path):
+                try:
+                    self.total_bytes -= os.path.getsize(path)
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.stats['evicted'] += 1
+
+
+class AsyncPageFetcher:
+    """
+    Téléchargement asynchrone (asyncio + aiohttp) des pages Booking.com
+    - une session unique : pool de connexions keep-alive réutilisées entre pages
+    - au plus per_host requêtes simultanées par hôte
+    - délai max par requête, nouvelles tentatives avec backoff exponentiel
+    - décompression gzip/deflate/br automatique
+    - débit limité par le RateLimiter partagé
+    - cache disque optionnel (HttpCache) : pages fraîches servies sans requête
+    À utiliser avec : async with AsyncPageFetcher() as fetcher
+    """
+
+    def __init__(self, limiter=None, per_host=HTTP_CONCURRENCY_PER_HOST, timeout=HTTP_TIMEOUT,
+                 retries=HTTP_MAX_RETRIES, backoff=HTTP_BACKOFF, cache=None):
+        self.limiter = RATE_LIMITER if limiter is None else limiter
+        self.cache = cache
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = None
+        self.semaphores = {}
+
+    async def __aenter__(self):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit_per_host=self.per_host, keepalive_timeout=30)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={**HEADERS, 'Accept-Encoding': accept_encoding()},
+            auto_decompress=True
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def fetch(self, url):
+        """Télécharger une page et retourner son HTML décodé (durée mesurée : étape 'fetch')"""
+        start = time.perf_counter()
+        try:
+            return await self._fetch(url)
+        finally:
+            METRICS.record('fetch', time.perf_counter() - start)
+
+    async def _fetch(self, url):
+        """Téléchargement avec cache, limitation de débit et nouvelles tentatives"""
+        import asyncio
+        import aiohttp
+
+        cached_body, cached_meta, headers = None, None, {}
+        if self.cache:
+            cached_body, cached_meta, fresh = self.cache.lookup(url)
+            if fresh:
+                return cached_body
+            if cached_body is not None:
+                headers = self.cache.revalidation_headers(cached_meta)
+
+        host = urlsplit(url).netloc
+        semaphore = self.semaphores.setdefault(host, asyncio.Semaphore(self.per_host))
+
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            async with semaphore:
+                if self.limiter:
+                    await asyncio.sleep(self.limiter.reserve(url))
+                try:
+                    async with self.session.get(url, headers=headers) as response:
+                        if response.status == 304 and cached_body is not None:
+                            self.cache.refresh(url, cached_meta)
+                            return cached_body
+                        if response.status not in RETRY_STATUSES:
+                            response.raise_for_status()
+                            body = await response.text()
+                            if self.cache:
+                                self.cache.store(url, body, response.headers)
+                            return body
+                        error = aiohttp.ClientResponseError(
+                            response.request_info, response.history,
+                            status=response.status, message=response.reason
+                        )
+                        retry_after = response.headers.get('Retry-After')
+                except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                    error = e
+
+            if attempt == self.retries:
+                raise error
+
+            # Backoff exponentiel avec gigue, ou Retry-After si le serveur l'indique
+            delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+            await asyncio.sleep(delay)
+
+    async def fetch_all(self, urls):
+        """Télécharger plusieurs pages en parallèle, retourne {url: html ou exception}"""
+        import asyncio
+
+        results = await asyncio.gather(*(self.fetch(url) for url in urls), return_exceptions=True)
+        return dict(zip(urls, results))
+
+
+def fetch_search_pages(destinations, cache=None):
+    """Télécharger les pages de recherche des destinations, retourne {nom: html}"""
+    import asyncio
+
+    urls = {dest['name']: generate_booking_search_url(dest['name'], dest['country']) for dest in destinations}
+
+    async def run():
+        async with AsyncPageFetcher(cache=cache) as fetcher:
+            return await fetcher.fetch_all(list(urls.values()))
+
+    print(f"🌐 Téléchargement de {len(urls)} pages de recherche...")
+    results = asyncio.run(run())
+
+    pages = {}
+    for name, url in urls.items():
+        result = results[url]
+        if isinstance(result, Exception):
+            print(f"  ⚠️  {name}: page non récupérée ({result!r}), données générées")
+        else:
+            pages[name] = result
+    return pages
+
+
+# ============================================================================
+# ENREGISTREMENTS (CHAMPS DANS L'ORDRE DES COLONNES DES TABLES)
+# ============================================================================
+# Tuples nommés au lieu de dictionnaires : pas de dictionnaire ni de copie des
+# clés par objet. Les premiers champs sont les colonnes de la table (TABLE_SCHEMAS),
+# la ligne à insérer est donc une simple tranche du tuple
+
+Hotel = namedtuple('Hotel', [
+    # Colonnes HOTEL
+    'booking_id', 'name', 'description', 'address', 'postal_code', 'city', 'country',
+    'phone', 'email', 'image', 'stars', 'rating', 'review_count', 'latitude', 'longitude',
+    # Données liées
+    'amenities', 'photos', 'rooms', 'reviews',
+])
+HOTEL_COLUMN_COUNT = 15
+
+# Colonnes HOTEL_AMENITIES
+Amenities = namedtuple('Amenities', [
+    'parking', 'restaurant', 'ac', 'non_smoking', 'pet_allowed', 'wifi',
+    'tv', 'minibar', 'safe', 'pool', 'spa', 'gym',
+])
+
+Room = namedtuple('Room', [
+    # Colonnes CHAMBRE
+    'name', 'category', 'beds', 'bed_count', 'max_adults', 'max_children',
+    'surface', 'view', 'description',
+    # Données liées
+    'base_price', 'photos', 'offers',
+])
+ROOM_COLUMN_COUNT = 9
+
+# Colonnes OFFRE
+Offer = namedtuple('Offer', [
+    'name', 'price', 'currency', 'cancellation', 'cancellation_days', 'cancellation_fee',
+    'refundable', 'breakfast', 'board', 'description',
+])
+
+# Colonnes AVIS
+Review = namedtuple('Review', [
+    'username', 'rating', 'title', 'comment', 'date', 'country', 'traveler_type', 'language',
+])
 
 
 # ============================================================================
 # SCRAPING BOOKING.COM
 # ============================================================================
 
-def scrape_booking_hotels(destination):
+# Vocabulaire et distributions de la génération, partagés par le générateur
+# hôtel par hôtel et le générateur vectorisé (NumPy)
+HOTEL_NAME_PREFIXES = ['Grand', 'Le', 'Hotel', 'Resort', 'Palace', 'Luxury', 'The', 'Royal']
+HOTEL_NAME_SUFFIXES = ['Hotel', 'Resort', 'Palace', 'Suites', 'Inn', 'Lodge']
+HOTEL_NAME_TYPES = ['Boutique', 'Spa', 'Beach', 'City', 'Garden', 'Plaza']
+STREET_TYPES = ['Avenue', 'Rue', 'Boulevard', 'Street']
+STREET_NAMES = ['des Champs', 'du Centre', 'Principale', 'Royale', 'de la Paix']
+HOTEL_STARS = [3, 4, 4, 5, 5]  # Plus d'hôtels 4-5 étoiles
+HOTEL_DESCRIPTION = ("Magnifique établissement situé au cœur de {city}. Cet hôtel offre un service "
+                     "exceptionnel et des équipements modernes pour un séjour inoubliable. Idéalement "
+                     "situé pour découvrir les attractions principales de la ville.")
+
+# Probabilité de présence de chaque équipement (1.0 = toujours), dans l'ordre de Amenities
+AMENITY_RATES = {
+    'parking': 1 / 2,
+    'restaurant': 2 / 3,  # Plus de restaurants
+    'ac': 1.0,
+    'non_smoking': 1.0,
+    'pet_allowed': 1 / 2,
+    'wifi': 1.0,          # Toujours WiFi
+    'tv': 1.0,
+    'minibar': 1 / 2,
+    'safe': 1.0,
+    'pool': 1 / 2,
+    'spa': 1 / 2,
+    'gym': 2 / 3,
+}
+
+HOTEL_PHOTO_KINDS = ('hotel_exterior', 'hotel_lobby', 'hotel_restaurant', 'hotel_pool', 'hotel_spa')
+ROOM_PHOTO_KINDS = ('room_bed', 'room_bathroom', 'room_view')
+
+# Types de chambres : champs fixes + plages de surface (m²) et de prix de base (€)
+ROOM_TYPES = [
+    {
+        'name': 'Standard',
+        'category': 'Confort',
+        'beds': '1 lit double',
+        'bed_count': 1,
+        'max_adults': 2,
+        'max_children': 1,
+        'surface_range': (20, 30),
+        'views': ['Ville', 'Cour intérieure', 'Rue'],
+        'description': 'Chambre confortable avec tout le nécessaire pour un séjour agréable.',
+        'price_range': (80, 150)
+    },
+    {
+        'name': 'Deluxe',
+        'category': 'Supérieure',
+        'beds': '1 lit king-size',
+        'bed_count': 1,
+        'max_adults': 2,
+        'max_children': 2,
+        'surface_range': (30, 45),
+        'views': ['Ville', 'Monument', 'Mer', 'Montagne'],
+        'description': 'Chambre spacieuse avec équipements haut de gamme et vue panoramique.',
+        'price_range': (150, 280)
+    },
+    {
+        'name': 'Suite Junior',
+        'category': 'Luxe',
+        'beds': '1 lit king-size',
+        'bed_count': 1,
+        'max_adults': 2,
+        'max_children': 2,
+        'surface_range': (45, 65),
+        'views': ['Panoramique', 'Mer', 'Monument', 'Montagne'],
+        'description': 'Suite élégante avec salon séparé et équipements premium.',
+        'price_range': (280, 450)
+    },
+    {
+        'name': 'Suite Présidentielle',
+        'category': 'Prestige',
+        'beds': '1 lit king-size + 1 canapé-lit',
+        'bed_count': 2,
+        'max_adults': 4,
+        'max_children': 2,
+        'surface_range': (65, 120),
+        'views': ['Panoramique'],
+        'description': 'Suite luxueuse avec deux chambres, salon spacieux et terrasse privée.',
+        'price_range': (450, 850)
+    }
+]
+
+# Offres par chambre : champs fixes et coefficient appliqué au prix de base
+OFFER_TYPES = {
+    'flexible': {
+        'name': 'Flexible',
+        'cancellation': 'Annulation gratuite jusqu\'à 24h avant l\'arrivée',
+        'cancellation_days': 1,
+        'refundable': True,
+        'breakfast': False,
+        'board': 'none',
+        'description': 'Tarif flexible avec annulation gratuite'
+    },
+    'non_refundable': {
+        'name': 'Non remboursable',
+        'cancellation': 'Non remboursable',
+        'cancellation_days': 0,
+        'refundable': False,
+        'breakfast': False,
+        'board': 'none',
+        'description': 'Tarif avantageux non remboursable'
+    },
+    'breakfast': {
+        'name': 'Petit-déjeuner inclus',
+        'cancellation': 'Annulation gratuite jusqu\'à 48h avant l\'arrivée',
+        'cancellation_days': 2,
+        'refundable': True,
+        'breakfast': True,
+        'board': 'breakfast',
+        'description': 'Avec petit-déjeuner buffet'
+    },
+    'half_board': {
+        'name': 'Demi-pension',
+        'cancellation': 'Annulation gratuite jusqu\'à 7 jours avant l\'arrivée',
+        'cancellation_days': 7,
+        'refundable': True,
+        'breakfast': True,
+        'board': 'half_board',
+        'description': 'Petit-déjeuner et dîner inclus'
+    },
+    'full_board': {
+        'name': 'Pension complète',
+        'cancellation': 'Annulation gratuite jusqu\'à 7 jours avant l\'arrivée',
+        'cancellation_days': 7,
+        'refundable': True,
+        'breakfast': True,
+        'board': 'full_board',
+        'description': 'Tous les repas inclus'
+    },
+}
+OFFER_MULTIPLIERS = {
+    'flexible': 1.0,
+    'non_refundable': 0.80,  # -20%
+    'breakfast': 1.15,       # +15%
+    'half_board': 1.25,
+    'full_board': 1.40,
+}
+# Offres prêtes à l'emploi (prix fixé par make_offer)
+OFFER_TEMPLATES = {
+    offer_type: Offer(price=None, currency='EUR', cancellation_fee=0.00, **fields)
+    for offer_type, fields in OFFER_TYPES.items()
+}
+BREAKFAST_OFFER_RATE = 0.7     # Part des chambres avec une offre petit-déjeuner
+BOARD_OFFER_MIN_PRICE = 250    # Demi-pension ou pension complète au-delà de ce prix de base
+
+REVIEW_FIRST_NAMES = ['Marie', 'Jean', 'Sophie', 'Pierre', 'Emma', 'Lucas', 'Chloé', 'Thomas',
+                      'John', 'Sarah', 'Michael', 'Lisa', 'David', 'Anna', 'Hans', 'Julia']
+REVIEW_INITIALS = ['L.', 'M.', 'K.', 'S.', 'D.']
+REVIEW_TITLES = [
+    'Séjour exceptionnel !',
+    'Parfait pour un week-end',
+    'Excellent hôtel',
+    'Très bien situé',
+    'Je recommande vivement',
+    'Superbe établissement'
+]
+# {city} et {hotel} sont remplacés par la ville et le nom de l'hôtel
+REVIEW_COMMENTS = [
+    "Hôtel magnifique situé au cœur de {city}. Personnel aux petits soins et chambres impeccables.",
+    "Excellent séjour à {hotel}. La vue depuis la chambre était superbe et le service irréprochable.",
+    "Un hôtel de qualité avec un emplacement idéal pour visiter {city}. Le petit-déjeuner était délicieux.",
+    "Très satisfait de notre séjour. Chambres spacieuses, propres et bien équipées. Je reviendrai !",
+    "Personnel accueillant et professionnel. L'hôtel est idéalement situé près des attractions principales."
+]
+REVIEW_COUNTRIES = ['FR', 'UK', 'DE', 'US', 'IT', 'ES', 'NL', 'BE']
+TRAVELER_TYPES = ['couple', 'famille', 'solo', 'business']
+
+
+def destination_area(destination):
+    """
+    Zone des hôtels d'une destination : (latitude, longitude du centre, demi-largeurs
+    en degrés de latitude et de longitude) pour un carré de radius_km autour du centre
+    Destination sans coordonnées : même ville de DESTINATIONS, sinon centre par défaut
+    """
+    known = next((d for d in DESTINATIONS if d['name'] == destination['name']), {})
+    latitude = destination.get('latitude', known.get('latitude', DEFAULT_DESTINATION_CENTER[0]))
+    longitude = destination.get('longitude', known.get('longitude', DEFAULT_DESTINATION_CENTER[1]))
+    radius_km = destination.get('radius_km', known.get('radius_km', DEFAULT_RADIUS_KM))
+    lat_spread = radius_km / 111.32  # km par degré de latitude
+    lon_spread = radius_km / (111.32 * max(math.cos(math.radians(latitude)), 0.01))
+    return latitude, longitude, lat_spread, lon_spread
+
+
+def wrap_longitude(longitude):
+    """Longitude ramenée dans [-180, 180[ (hôtels de part et d'autre de l'antiméridien)"""
+    return (longitude + 540.0) % 360.0 - 180.0
+
+
+@lru_cache(maxsize=None)
+def city_photo_urls(kinds, city_name):
+    """URLs des photos d'une ville : un seul tuple partagé par tous ses hôtels / chambres"""
+    return tuple(generate_unsplash_url(kind, city_name) for kind in kinds)
+
+
+def iter_booking_hotels(destination, search_page=None, rng=random):
     """
-    Scraper les hôtels d'une destination depuis Booking.com
-    IMPORTANT: Le scraping de Booking.com est complexe car ils ont des protections anti-bot
-    Cette version utilise une approche simplifiée avec Unsplash pour les images
+    Générateur : produit les hôtels d'une destination un par un
+    (mémoire constante quel que soit target_hotels)
+    Si search_page (HTML de la page de recherche) est fourni, les champs trouvés
+    sur la page (nom, étoiles, note, avis, coordonnées) remplacent les valeurs générées
+    rng : générateur aléatoire (random.Random, cf. destination_rng), module random par défaut
     """
     print(f"\n🔍 Recherche d'hôtels à {destination['name']}, {destination['country']}...")
     
     city_name = destination['name']
     country_name = destination['country']
     target_count = destination['target_hotels']
+    center_lat, center_lon, lat_spread, lon_spread = destination_area(destination)
     
     # Générer des données d'hôtels fictives mais réalistes
     # (En production, tu utiliserais l'API Booking.com ou Selenium pour scraper)
-    hotels = []
-    
-    # Noms d'hôtels typiques par catégorie
-    hotel_prefixes = ['Grand', 'Le', 'Hotel', 'Resort', 'Palace', 'Luxury', 'The', 'Royal']
-    hotel_suffixes = ['Hotel', 'Resort', 'Palace', 'Suites', 'Inn', 'Lodge']
-    hotel_types = ['Boutique', 'Spa', 'Beach', 'City', 'Garden', 'Plaza']
+    page_hotels = []
+    if search_page:
+        with METRICS.measure('parse'):
+            page_hotels = parse_search_page(search_page, city_name, country_name)
     
     for i in range(target_count):
+        start = time.perf_counter()
+        
         # Générer un nom d'hôtel réaliste
-        prefix = random.choice(hotel_prefixes)
-        suffix = random.choice(hotel_suffixes)
-        type_name = random.choice(hotel_types) if random.random() > 0.5 else ''
+        prefix = rng.choice(HOTEL_NAME_PREFIXES)
+        suffix = rng.choice(HOTEL_NAME_SUFFIXES)
+        type_name = rng.choice(HOTEL_NAME_TYPES) if rng.random() > 0.5 else ''
         
         hotel_name = f"{prefix} {city_name} {type_name} {suffix}".strip()
+        page_hotel = page_hotels[i] if i < len(page_hotels) else {}
+        if page_hotel.get('name'):
+            hotel_name = page_hotel['name']
+        
+        # Photos (URLs Unsplash)
+        photos = city_photo_urls(HOTEL_PHOTO_KINDS, city_name)
         
         # Données de l'hôtel
-        hotel = {
-            'booking_id': f"booking_{city_name.lower()}_{i+1}",
-            'name': hotel_name,
-            'description': f"Magnifique établissement situé au cœur de {city_name}. Cet hôtel offre un service exceptionnel et des équipements modernes pour un séjour inoubliable. Idéalement situé pour découvrir les attractions principales de la ville.",
-            'city': city_name,
-            'country': country_name,
-            'address': f"{random.randint(1, 999)} {random.choice(['Avenue', 'Rue', 'Boulevard', 'Street'])} {random.choice(['des Champs', 'du Centre', 'Principale', 'Royale', 'de la Paix'])}",
-            'postal_code': f"{random.randint(10000, 99999)}",
-            'phone': f"+{random.randint(1, 999)}-{random.randint(100, 999)}-{random.randint(1000, 9999)}",
-            'email': f"contact@{hotel_name.lower().replace(' ', '')}.com",
-            'stars': random.choice([3, 4, 4, 5, 5]),  # Plus d'hôtels 4-5 étoiles
-            'rating': round(random.uniform(7.5, 9.8), 1),
-            'review_count': random.randint(250, 2500),
-            'latitude': 48.8566 + random.uniform(-0.5, 0.5),  # Coords approximatives
-            'longitude': 2.3522 + random.uniform(-0.5, 0.5),
+        hotel = Hotel(
+            booking_id=f"booking_{city_name.lower()}_{i+1}",
+            name=hotel_name,
+            description=HOTEL_DESCRIPTION.format(city=city_name),
+            address=f"{rng.randint(1, 999)} {rng.choice(STREET_TYPES)} {rng.choice(STREET_NAMES)}",
+            postal_code=f"{rng.randint(10000, 99999)}",
+            city=city_name,
+            country=country_name,
+            phone=f"+{rng.randint(1, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            email=f"contact@{hotel_name.lower().replace(' ', '')}.com",
+            image=photos[0],  # Image principale
+            stars=rng.choice(HOTEL_STARS),
+            rating=round(rng.uniform(7.5, 9.8), 1),
+            review_count=rng.randint(250, 2500),
+            latitude=center_lat + rng.uniform(-1, 1) * lat_spread,
+            longitude=wrap_longitude(center_lon + rng.uniform(-1, 1) * lon_spread),
             
             # Équipements
-            'amenities': {
-                'parking': random.choice([True, False]),
-                'restaurant': random.choice([True, True, False]),  # Plus de restaurants
-                'wifi': True,  # Toujours WiFi
-                'pool': random.choice([True, False]),
-                'spa': random.choice([True, False]),
-                'gym': random.choice([True, True, False]),
-                'ac': True,
-                'non_smoking': True,
-                'pet_allowed': random.choice([True, False]),
-                'tv': True,
-                'minibar': random.choice([True, False]),
-                'safe': True
-            },
-            
-            # Photos (URLs Unsplash)
-            'photos': [
-                generate_unsplash_url('hotel_exterior', city_name),
-                generate_unsplash_url('hotel_lobby', city_name),
-                generate_unsplash_url('hotel_restaurant', city_name),
-                generate_unsplash_url('hotel_pool', city_name),
-                generate_unsplash_url('hotel_spa', city_name),
-            ],
+            amenities=Amenities._make(rng.random() < rate for rate in AMENITY_RATES.values()),
+            photos=photos,
             
             # Types de chambres
-            'rooms': generate_hotel_rooms(city_name),
+            rooms=generate_hotel_rooms(city_name, rng),
             
             # Avis
-            'reviews': generate_hotel_reviews(hotel_name, city_name)
-        }
+            reviews=generate_hotel_reviews(hotel_name, city_name, rng)
+        )
         
-        hotels.append(hotel)
-        print(f"  ✅ {hotel_name} - {hotel['stars']}⭐ - Note: {hotel['rating']}/10")
-    
-    return hotels
+        # Valeurs réelles de la page de recherche, quand elles existent
+        overrides = {key: page_hotel[key] for key in ('booking_id', 'stars', 'rating', 'review_count', 'latitude', 'longitude')
+                     if page_hotel.get(key) is not None}
+        if overrides:
+            hotel = hotel._replace(**overrides)
+        
+        METRICS.record('generate', time.perf_counter() - start)
+        PROGRESS.detail(f"  ✅ {hotel_name} - {hotel.stars}⭐ - Note: {hotel.rating}/10")
+        yield hotel
 
 
-def generate_hotel_rooms(city_name):
+def generate_hotel_rooms(city_name, rng=random):
     """Générer les types de chambres pour un hôtel"""
-    room_types = [
-        {
-            'name': 'Standard',
-            'category': 'Confort',
-            'beds': '1 lit double',
-            'bed_count': 1,
-            'max_adults': 2,
-            'max_children': 1,
-            'surface': random.randint(20, 30),
-            'view': random.choice(['Ville', 'Cour intérieure', 'Rue']),
-            'description': 'Chambre confortable avec tout le nécessaire pour un séjour agréable.',
-            'base_price': random.randint(80, 150)
-        },
-        {
-            'name': 'Deluxe',
-            'category': 'Supérieure',
-            'beds': '1 lit king-size',
-            'bed_count': 1,
-            'max_adults': 2,
-            'max_children': 2,
-            'surface': random.randint(30, 45),
-            'view': random.choice(['Ville', 'Monument', 'Mer', 'Montagne']),
-            'description': 'Chambre spacieuse avec équipements haut de gamme et vue panoramique.',
-            'base_price': random.randint(150, 280)
-        },
-        {
-            'name': 'Suite Junior',
-            'category': 'Luxe',
-            'beds': '1 lit king-size',
-            'bed_count': 1,
-            'max_adults': 2,
-            'max_children': 2,
-            'surface': random.randint(45, 65),
-            'view': random.choice(['Panoramique', 'Mer', 'Monument', 'Montagne']),
-            'description': 'Suite élégante avec salon séparé et équipements premium.',
-            'base_price': random.randint(280, 450)
-        },
-        {
-            'name': 'Suite Présidentielle',
-            'category': 'Prestige',
-            'beds': '1 lit king-size + 1 canapé-lit',
-            'bed_count': 2,
-            'max_adults': 4,
-            'max_children': 2,
-            'surface': random.randint(65, 120),
-            'view': 'Panoramique',
-            'description': 'Suite luxueuse avec deux chambres, salon spacieux et terrasse privée.',
-            'base_price': random.randint(450, 850)
-        }
-    ]
-    
-    # Ajouter des photos pour chaque type de chambre
-    for room in room_types:
-        room['photos'] = [
-            generate_unsplash_url('room_bed', city_name),
-            generate_unsplash_url('room_bathroom', city_name),
-            generate_unsplash_url('room_view', city_name),
-        ]
+    rooms = []
+    for room_type in ROOM_TYPES:
+        surface = rng.randint(*room_type['surface_range'])
+        view = rng.choice(room_type['views'])
+        base_price = rng.randint(*room_type['price_range'])
         
-        # Générer des offres pour chaque chambre
-        room['offers'] = generate_room_offers(room['name'], room['base_price'])
+        rooms.append(Room(
+            room_type['name'], room_type['category'], room_type['beds'], room_type['bed_count'],
+            room_type['max_adults'], room_type['max_children'], surface, view, room_type['description'],
+            base_price,
+            # Photos de chaque type de chambre
+            city_photo_urls(ROOM_PHOTO_KINDS, city_name),
+            # Offres de chaque chambre
+            generate_room_offers(room_type['name'], base_price, rng)
+        ))
     
-    return room_types
+    return rooms
 
 
-def generate_room_offers(room_name, base_price):
+def make_offer(offer_type, base_price):
+    """Construire une offre à partir de son type et du prix de base de la chambre"""
+    template = OFFER_TEMPLATES[offer_type]
+    return Offer(template.name, round(base_price * OFFER_MULTIPLIERS[offer_type]), *template[2:])
+
+
+def generate_room_offers(room_name, base_price, rng=random):
     """Générer les offres/tarifs pour une chambre"""
-    offers = [
-        {
-            'name': 'Flexible',
-            'price': base_price,
-            'cancellation': 'Annulation gratuite jusqu\'à 24h avant l\'arrivée',
-            'cancellation_days': 1,
-            'refundable': True,
-            'breakfast': False,
-            'board': 'none',
-            'description': 'Tarif flexible avec annulation gratuite'
-        },
-        {
-            'name': 'Non remboursable',
-            'price': round(base_price * 0.80),  # -20%
-            'cancellation': 'Non remboursable',
-            'cancellation_days': 0,
-            'refundable': False,
-            'breakfast': False,
-            'board': 'none',
-            'description': 'Tarif avantageux non remboursable'
-        }
-    ]
+    offers = [make_offer('flexible', base_price), make_offer('non_refundable', base_price)]
     
     # Ajouter une offre avec petit-déjeuner
-    if random.random() > 0.3:
-        offers.append({
-            'name': 'Petit-déjeuner inclus',
-            'price': round(base_price * 1.15),  # +15%
-            'cancellation': 'Annulation gratuite jusqu\'à 48h avant l\'arrivée',
-            'cancellation_days': 2,
-            'refundable': True,
-            'breakfast': True,
-            'board': 'breakfast',
-            'description': 'Avec petit-déjeuner buffet'
-        })
+    if rng.random() < BREAKFAST_OFFER_RATE:
+        offers.append(make_offer('breakfast', base_price))
     
     # Pour les chambres haut de gamme, ajouter demi-pension ou pension complète
-    if base_price > 250:
-        board_type = random.choice(['half_board', 'full_board'])
-        board_name = 'Demi-pension' if board_type == 'half_board' else 'Pension complète'
-        multiplier = 1.25 if board_type == 'half_board' else 1.40
-        
-        offers.append({
-            'name': board_name,
-            'price': round(base_price * multiplier),
-            'cancellation': 'Annulation gratuite jusqu\'à 7 jours avant l\'arrivée',
-            'cancellation_days': 7,
-            'refundable': True,
-            'breakfast': True,
-            'board': board_type,
-            'description': 'Petit-déjeuner et dîner inclus' if board_type == 'half_board' else 'Tous les repas inclus'
-        })
+    if base_price > BOARD_OFFER_MIN_PRICE:
+        offers.append(make_offer(rng.choice(['half_board', 'full_board']), base_price))
     
     return offers
 
 
-def generate_hotel_reviews(hotel_name, city_name):
+def generate_hotel_reviews(hotel_name, city_name, rng=random):
     """Générer des avis réalistes pour un hôtel"""
-    first_names = ['Marie', 'Jean', 'Sophie', 'Pierre', 'Emma', 'Lucas', 'Chloé', 'Thomas', 
-                   'John', 'Sarah', 'Michael', 'Lisa', 'David', 'Anna', 'Hans', 'Julia']
-    
-    positive_titles = [
-        'Séjour exceptionnel !',
-        'Parfait pour un week-end',
-        'Excellent hôtel',
-        'Très bien situé',
-        'Je recommande vivement',
-        'Superbe établissement'
-    ]
-    
-    positive_comments = [
-        f"Hôtel magnifique situé au cœur de {city_name}. Personnel aux petits soins et chambres impeccables.",
-        f"Excellent séjour à {hotel_name}. La vue depuis la chambre était superbe et le service irréprochable.",
-        f"Un hôtel de qualité avec un emplacement idéal pour visiter {city_name}. Le petit-déjeuner était délicieux.",
-        f"Très satisfait de notre séjour. Chambres spacieuses, propres et bien équipées. Je reviendrai !",
-        f"Personnel accueillant et professionnel. L'hôtel est idéalement situé près des attractions principales."
-    ]
-    
-    countries = ['FR', 'UK', 'DE', 'US', 'IT', 'ES', 'NL', 'BE']
-    traveler_types = ['couple', 'famille', 'solo', 'business']
-    
     reviews = []
-    num_reviews = random.randint(3, 6)
+    num_reviews = rng.randint(3, 6)
     
     for _ in range(num_reviews):
-        review = {
-            'username': f"{random.choice(first_names)} {random.choice(['L.', 'M.', 'K.', 'S.', 'D.'])}",
-            'rating': round(random.uniform(7.5, 10.0), 1),
-            'title': random.choice(positive_titles),
-            'comment': random.choice(positive_comments),
-            'date': (datetime.now() - timedelta(days=random.randint(10, 180))).strftime('%Y-%m-%d'),
-            'country': random.choice(countries),
-            'traveler_type': random.choice(traveler_types)
-        }
+        review = Review(
+            username=f"{rng.choice(REVIEW_FIRST_NAMES)} {rng.choice(REVIEW_INITIALS)}",
+            rating=round(rng.uniform(7.5, 10.0), 1),
+            title=rng.choice(REVIEW_TITLES),
+            comment=rng.choice(REVIEW_COMMENTS).format(city=city_name, hotel=hotel_name),
+            date=(reference_date() - timedelta(days=rng.randint(10, 180))).strftime('%Y-%m-%d'),
+            country=rng.choice(REVIEW_COUNTRIES),
+            traveler_type=rng.choice(TRAVELER_TYPES),
+            language='fr'
+        )
         reviews.append(review)
     
     return reviews
 
 
 # ============================================================================
-# INSERTION EN BASE DE DONNÉES
+# GÉNÉRATION VECTORISÉE (NUMPY) POUR LES TESTS DE CHARGE
 # ============================================================================
 
-def insert_hotel_to_db(connection, hotel_data):
-    """Insérer un hôtel complet dans la base de données"""
-    cursor = connection.cursor()
-    
+def pick(np, rng, values, size):
+    """Tirage uniforme de size éléments de values (tableau d'objets)"""
+    return np.asarray(values, dtype=object)[rng.integers(0, len(values), size)]
+
+
+def catalog_keys(destination, start, count):
+    """Clés (booking_id, ville) des hôtels start..start+count-1 d'une destination"""
+    city_name = destination['name']
+    return [(f"booking_{city_name.lower()}_{i + 1}", city_name) for i in range(start, start + count)]
+
+
+def generate_catalog_batch(destination, start, count, first_hotel_id, first_room_id, rng):
+    """
+    Générer count hôtels d'une destination (indices start..) colonne par colonne :
+    chaque champ est tiré en un seul appel NumPy pour tout le paquet, puis les
+    colonnes sont assemblées en lignes (zip). Mêmes distributions que iter_booking_hotels
+    Retourne {table: [lignes]} au format de build_batch_rows (identifiants compris)
+    """
+    import numpy as np
+
+    city_name = destination['name']
+    country_name = destination['country']
+    n = count
+    hotel_ids = np.arange(first_hotel_id, first_hotel_id + n)
+    center_lat, center_lon, lat_spread, lon_spread = destination_area(destination)
+
+    # --- HOTEL ---
+    type_names = np.where(rng.random(n) > 0.5, pick(np, rng, HOTEL_NAME_TYPES, n), '')
+    names = [
+        f"{prefix} {city_name} {type_name} {suffix}".strip()
+        for prefix, type_name, suffix in zip(pick(np, rng, HOTEL_NAME_PREFIXES, n), type_names,
+                                             pick(np, rng, HOTEL_NAME_SUFFIXES, n))
+    ]
+    addresses = [
+        f"{number} {street_type} {street_name}"
+        for number, street_type, street_name in zip(rng.integers(1, 1000, n).tolist(),
+                                                    pick(np, rng, STREET_TYPES, n),
+                                                    pick(np, rng, STREET_NAMES, n))
+    ]
+    postal_codes = rng.integers(10000, 100000, n).astype(str).tolist()
+    phones = [
+        f"+{a}-{b}-{c}"
+        for a, b, c in zip(rng.integers(1, 1000, n).tolist(), rng.integers(100, 1000, n).tolist(),
+                           rng.integers(1000, 10000, n).tolist())
+    ]
+    hotel_photos = city_photo_urls(HOTEL_PHOTO_KINDS, city_name)
+
+    hotel_columns = [
+        hotel_ids.tolist(),
+        [booking_id for booking_id, _ in catalog_keys(destination, start, n)],
+        names,
+        [HOTEL_DESCRIPTION.format(city=city_name)] * n,
+        addresses,
+        postal_codes,
+        [city_name] * n,
+        [country_name] * n,
+        phones,
+        [f"contact@{name.lower().replace(' ', '')}.com" for name in names],
+        [hotel_photos[0]] * n,
+        np.asarray(HOTEL_STARS)[rng.integers(0, len(HOTEL_STARS), n)].tolist(),
+        np.round(rng.uniform(7.5, 9.8, n), 1).tolist(),
+        rng.integers(250, 2501, n).tolist(),
+        (center_lat + rng.uniform(-1, 1, n) * lat_spread).tolist(),
+        wrap_longitude(center_lon + rng.uniform(-1, 1, n) * lon_spread).tolist(),
+    ]
+
+    # --- HOTEL_AMENITIES ---
+    amenities = {name: (rng.random(n) < rate).tolist() for name, rate in AMENITY_RATES.items()}
+    amenity_columns = [hotel_ids.tolist()] + [amenities[name] for name in Amenities._fields]
+
+    # --- IMG_HOTEL : mêmes URLs pour tous les hôtels de la ville ---
+    photo_count = len(HOTEL_PHOTO_KINDS)
+    hotel_photo_columns = [
+        np.repeat(hotel_ids, photo_count).tolist(),
+        hotel_photos * n,
+        HOTEL_PHOTO_CATEGORIES[:photo_count] * n,
+        list(range(photo_count)) * n,
+    ]
+
+    # --- CHAMBRE : len(ROOM_TYPES) chambres par hôtel, ordre hôtel puis type ---
+    type_count = len(ROOM_TYPES)
+    room_total = n * type_count
+    room_ids = np.arange(first_room_id, first_room_id + room_total)
+    room_hotel_ids = np.repeat(hotel_ids, type_count)
+    surfaces = np.column_stack([rng.integers(low, high + 1, n)
+                                for low, high in (t['surface_range'] for t in ROOM_TYPES)]).ravel()
+    views = np.column_stack([pick(np, rng, t['views'], n) for t in ROOM_TYPES]).ravel()
+    base_prices = np.column_stack([rng.integers(low, high + 1, n)
+                                   for low, high in (t['price_range'] for t in ROOM_TYPES)]).ravel()
+
+    room_columns = [room_ids.tolist(), room_hotel_ids.tolist()]
+    room_columns += [[room_type[field] for room_type in ROOM_TYPES] * n
+                     for field in ('name', 'category', 'beds', 'bed_count', 'max_adults', 'max_children')]
+    room_columns += [surfaces.tolist(), views.tolist(), [t['description'] for t in ROOM_TYPES] * n]
+
+    # --- IMG_CHAMBRE ---
+    room_photos = city_photo_urls(ROOM_PHOTO_KINDS, city_name)
+    room_photo_count = len(ROOM_PHOTO_KINDS)
+    room_photo_columns = [
+        np.repeat(room_ids, room_photo_count).tolist(),
+        room_photos * room_total,
+        ROOM_PHOTO_CATEGORIES[:room_photo_count] * room_total,
+        list(range(room_photo_count)) * room_total,
+    ]
+
+    # --- OFFRE : 4 emplacements par chambre (flexible, non remboursable,
+    # petit-déjeuner, pension), -1 = pas d'offre ---
+    offer_types = list(OFFER_TYPES)
+    slots = np.empty((room_total, 4), dtype=np.int64)
+    slots[:, 0] = offer_types.index('flexible')
+    slots[:, 1] = offer_types.index('non_refundable')
+    slots[:, 2] = np.where(rng.random(room_total) < BREAKFAST_OFFER_RATE, offer_types.index('breakfast'), -1)
+    board = np.where(rng.random(room_total) < 0.5, offer_types.index('half_board'), offer_types.index('full_board'))
+    slots[:, 3] = np.where(base_prices > BOARD_OFFER_MIN_PRICE, board, -1)
+
+    offer_kinds = slots.ravel()
+    present = offer_kinds >= 0
+    offer_kinds = offer_kinds[present]
+    offer_rooms = np.repeat(np.arange(room_total), 4)[present]
+    multipliers = np.asarray([OFFER_MULTIPLIERS[offer_type] for offer_type in offer_types])
+    # np.round arrondit au pair comme round() : mêmes prix que generate_room_offers
+    prices = np.round(base_prices[offer_rooms] * multipliers[offer_kinds]).astype(np.int64)
+
+    templates = [OFFER_TYPES[offer_type] for offer_type in offer_types]
+    offer_fields = [[templates[kind][field] for kind in offer_kinds.tolist()]
+                    for field in ('name', 'cancellation', 'cancellation_days', 'refundable',
+                                  'breakfast', 'board', 'description')]
+    offer_count = len(offer_kinds)
+    offer_columns = [
+        room_hotel_ids[offer_rooms].tolist(),
+        room_ids[offer_rooms].tolist(),
+        offer_fields[0],
+        prices.tolist(),
+        ['EUR'] * offer_count,
+        offer_fields[1],
+        offer_fields[2],
+        [0.00] * offer_count,
+        offer_fields[3],
+        offer_fields[4],
+        offer_fields[5],
+        offer_fields[6],
+    ]
+
+    # --- AVIS : 3 à 6 avis par hôtel ---
+    review_counts = rng.integers(3, 7, n)
+    review_hotels = np.repeat(np.arange(n), review_counts)
+    review_total = len(review_hotels)
+    today = np.datetime64(reference_date().date(), 'D')
+    review_dates = today - rng.integers(10, 181, review_total).astype('timedelta64[D]')
+    comment_indexes = rng.integers(0, len(REVIEW_COMMENTS), review_total)
+
+    review_columns = [
+        hotel_ids[review_hotels].tolist(),
+        [f"{first_name} {initial}" for first_name, initial in zip(pick(np, rng, REVIEW_FIRST_NAMES, review_total),
+                                                                  pick(np, rng, REVIEW_INITIALS, review_total))],
+        np.round(rng.uniform(7.5, 10.0, review_total), 1).tolist(),
+        pick(np, rng, REVIEW_TITLES, review_total).tolist(),
+        [REVIEW_COMMENTS[index].format(city=city_name, hotel=names[hotel])
+         for index, hotel in zip(comment_indexes.tolist(), review_hotels.tolist())],
+        np.datetime_as_string(review_dates, unit='D').tolist(),
+        pick(np, rng, REVIEW_COUNTRIES, review_total).tolist(),
+        pick(np, rng, TRAVELER_TYPES, review_total).tolist(),
+        ['fr'] * review_total,
+    ]
+
+    # Assemblage des colonnes en lignes, dans l'ordre de TABLE_SCHEMAS
+    columns = {
+        'HOTEL': hotel_columns,
+        'IMG_HOTEL': hotel_photo_columns,
+        'HOTEL_AMENITIES': amenity_columns,
+        'HOTEL_GEO': [hotel_ids.tolist(), geohash_encode_array(hotel_columns[HOTEL_LATITUDE_INDEX],
+                                                            hotel_columns[HOTEL_LONGITUDE_INDEX])],
+        'CHAMBRE': room_columns,
+        'IMG_CHAMBRE': room_photo_columns,
+        'OFFRE': offer_columns,
+        'AVIS': review_columns,
+    }
+    rows = {table: list(zip(*table_columns)) for table, table_columns in columns.items()}
+
+    # --- TARIF_NUIT : calendrier de chaque offre (une seule ville par paquet) ---
+    rows['TARIF_NUIT'] = build_rate_rows(offer_columns[1], offer_fields[0], prices, [city_name] * offer_count)
+    rows['HOTEL_RECHERCHE'] = build_summary_rows(rows)
+    return rows
+
+
+def iter_catalog_tasks(writer, destinations, journal=None, seed=None, chunk_size=VECTOR_CHUNK_HOTELS):
+    """
+    Générateur des paquets du mode vectorisé : ((arguments de generate_catalog_shard),
+    clés des hôtels). Les identifiants sont réservés ici, dans l'ordre des paquets ;
+    les destinations et paquets déjà journalisés sont ignorés
+    """
+    if getattr(writer, 'id_allocators', None) is None or not hasattr(writer, 'write_rows'):
+        raise ValueError("GENERATION_MODE 'vectorized' : identifiants côté client et mode 'insert' ou 'load_data' requis")
+
+    chunk_size = max(1, chunk_size)
+    for dest in destinations:
+        if journal and journal.destination_done(dest):
+            print(f"\n⏭️  {dest['name']} déjà chargée, ignorée")
+            continue
+        print_destination_header(dest)
+
+        target_count = dest['target_hotels']
+        for start in range(0, target_count, chunk_size):
+            count = min(chunk_size, target_count - start)
+            keys = catalog_keys(dest, start, count)
+            if journal and all(journal.is_done(booking_id) for booking_id, _ in keys):
+                continue
+
+            first_hotel_id = writer.id_allocators['HOTEL'].allocate(writer.connection, count)
+            first_room_id = writer.id_allocators['CHAMBRE'].allocate(writer.connection, count * len(ROOM_TYPES))
+            yield (dest, start, count, first_hotel_id, first_room_id, seed), keys
+
+
+# ============================================================================
+# GÉNÉRATION REPRODUCTIBLE ET RÉPARTIE SUR PLUSIEURS PROCESSUS
+# ============================================================================
+
+def derive_seed(seed, *parts):
+    """Graine 64 bits dérivée de la graine principale et d'un identifiant de flux (destination, paquet)"""
+    key = ':'.join(str(part) for part in (seed,) + parts)
+    return int.from_bytes(hashlib.sha256(key.encode('utf-8')).digest()[:8], 'big')
+
+
+def reference_date():
+    """Date de référence des dates générées (GENERATION_DATE, sinon maintenant)"""
+    return datetime.strptime(GENERATION_DATE, '%Y-%m-%d') if GENERATION_DATE else datetime.now()
+
+
+def destination_rng(destination, seed=None):
+    """Générateur aléatoire propre à une destination (graine dérivée, ou aléatoire sans graine)"""
+    if seed is None:
+        return random.Random()
+    return random.Random(derive_seed(seed, destination['name']))
+
+
+def catalog_rng(destination, start, seed=None):
+    """Générateur NumPy propre à un paquet d'hôtels du mode vectorisé"""
+    import numpy as np
+
+    if seed is None:
+        return np.random.default_rng()
+    return np.random.default_rng(derive_seed(seed, destination['name'], start))
+
+
+def generate_destination_shard(destination, search_page=None, seed=None):
+    """Tâche de processus (mode 'standard') : liste des hôtels d'une destination"""
+    return list(iter_booking_hotels(destination, search_page, destination_rng(destination, seed)))
+
+
+def generate_catalog_shard(destination, start, count, first_hotel_id, first_room_id, seed=None):
+    """Tâche de processus (mode 'vectorized') : lignes d'un paquet d'hôtels"""
+    with METRICS.measure('generate', count):
+        return generate_catalog_batch(destination, start, count, first_hotel_id, first_room_id,
+                                      catalog_rng(destination, start, seed))
+
+
+def _init_generation_process(generation_date, log_level):
+    """Initialisation des processus de génération (réglages modifiés après l'import)"""
+    global GENERATION_DATE
+    GENERATION_DATE = generation_date
+    PROGRESS.level = log_level
+
+
+def _run_measured(function, *arguments):
+    """Tâche de processus : résultat de function et mesures faites dans le processus"""
+    result = function(*arguments)
+    return result, METRICS.export()
+
+
+def map_shards(function, tasks, processes=None):
+    """
+    Générateur : (function(*arguments), contexte) pour chaque (arguments, contexte) de tasks,
+    dans l'ordre des tâches. Avec processes > 1, les tâches tournent dans un
+    ProcessPoolExecutor, au plus 2 × processes en cours (mémoire bornée) ; leurs
+    mesures (METRICS) sont ajoutées à celles du processus principal
+    """
+    processes = GENERATION_PROCESSES if processes is None else processes
+    if processes <= 1:
+        for arguments, context in tasks:
+            yield function(*arguments), context
+        return
+
+    executor = ProcessPoolExecutor(max_workers=processes, initializer=_init_generation_process,
+                                   initargs=(GENERATION_DATE, PROGRESS.level))
+    pending = deque()
+
+    def next_result():
+        future, context = pending.popleft()
+        result, stages = future.result()
+        METRICS.merge(stages)
+        return result, context
+
     try:
-        # 1. Insérer l'hôtel
-        hotel_query = """
-        INSERT INTO HOTEL (
-            hotel_id_api, nom_hotel, description_hotel, rue_hotel, code_postal_hotel,
-            ville_hotel, pays_hotel, tel_hotel, email_hotel, img_hotel,
-            nbre_etoile_hotel, note_moy_hotel, nbre_avis_hotel, latitude, longitude,
-            date_scraping
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-        """
-        
-        hotel_values = (
-            hotel_data['booking_id'],
-            hotel_data['name'],
-            hotel_data['description'],
-            hotel_data['address'],
-            hotel_data['postal_code'],
-            hotel_data['city'],
-            hotel_data['country'],
-            hotel_data['phone'],
-            hotel_data['email'],
-            hotel_data['photos'][0] if hotel_data['photos'] else None,  # Image principale
-            hotel_data['stars'],
-            hotel_data['rating'],
-            hotel_data['review_count'],
-            hotel_data['latitude'],
-            hotel_data['longitude']
-        )
-        
-        cursor.execute(hotel_query, hotel_values)
-        hotel_id = cursor.lastrowid
-        
-        # 2. Insérer les photos de l'hôtel
-        for idx, photo_url in enumerate(hotel_data['photos']):
-            photo_query = """
-            INSERT INTO IMG_HOTEL (id_hotel, url_img, categorie_img, ordre_affichage)
-            VALUES (%s, %s, %s, %s)
-            """
-            category = ['facade', 'hall', 'restaurant', 'piscine', 'spa'][idx] if idx < 5 else 'autre'
-            cursor.execute(photo_query, (hotel_id, photo_url, category, idx))
-        
-        # 3. Insérer les équipements de l'hôtel
-        amenities_query = """
-        INSERT INTO HOTEL_AMENITIES (
-            id_hotel, parking, restaurant, climatisation, non_fumeur, pet_allowed,
-            wi_fi, television, mini_bar, coffre_fort, piscine, spa, salle_sport
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        amenities = hotel_data['amenities']
-        amenities_values = (
-            hotel_id,
-            amenities['parking'],
-            amenities['restaurant'],
-            amenities['ac'],
-            amenities['non_smoking'],
-            amenities['pet_allowed'],
-            amenities['wifi'],
-            amenities['tv'],
-            amenities['minibar'],
-            amenities['safe'],
-            amenities['pool'],
-            amenities['spa'],
-            amenities['gym']
-        )
-        cursor.execute(amenities_query, amenities_values)
-        
-        # 4. Insérer les chambres et leurs offres
-        for room in hotel_data['rooms']:
-            # Insérer la chambre
-            room_query = """
-            INSERT INTO CHAMBRE (
-                id_hotel, type_room, cat_room, type_lit, nbre_lit,
-                nbre_adults_max, nbre_children_max, surface_m2, vue, description_room
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            room_values = (
-                hotel_id,
-                room['name'],
-                room['category'],
-                room['beds'],
-                room['bed_count'],
-                room['max_adults'],
-                room['max_children'],
-                room['surface'],
-                room['view'],
-                room['description']
-            )
-            cursor.execute(room_query, room_values)
-            room_id = cursor.lastrowid
-            
-            # Insérer les photos de la chambre
-            for idx, photo_url in enumerate(room['photos']):
-                photo_query = """
-                INSERT INTO IMG_CHAMBRE (id_chambre, url_img, cat_img, ordre_affichage)
-                VALUES (%s, %s, %s, %s)
-                """
-                category = ['generale', 'salle_bain', 'vue'][idx] if idx < 3 else 'autre'
-                cursor.execute(photo_query, (room_id, photo_url, category, idx))
-            
-            # Insérer les offres de la chambre
-            for offer in room['offers']:
-                offer_query = """
-                INSERT INTO OFFRE (
-                    id_hotel, id_chambre, nom_offre, prix_nuit, devise,
-                    conditions_annulation, delai_annulation_gratuite, frais_annulation,
-                    remboursable, petit_dejeuner_inclus, pension, description_offre,
-                    date_scraping
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-                """
-                
-                offer_values = (
-                    hotel_id,
-                    room_id,
-                    offer['name'],
-                    offer['price'],
-                    'EUR',
-                    offer['cancellation'],
-                    offer['cancellation_days'],
-                    0.00,  # Pas de frais d'annulation dans cet exemple
-                    offer['refundable'],
-                    offer['breakfast'],
-                    offer['board'],
-                    offer['description']
-                )
-                cursor.execute(offer_query, offer_values)
-        
-        # 5. Insérer les avis
-        for review in hotel_data['reviews']:
-            review_query = """
-            INSERT INTO AVIS (
-                id_hotel, pseudo_user, note, titre_avis, commentaire,
-                date_avis, pays_origine, type_voyageur, langue, date_scraping
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())
-            """
-            
-            review_values = (
-                hotel_id,
-                review['username'],
-                review['rating'],
-                review['title'],
-                review['comment'],
-                review['date'],
-                review['country'],
-                review['traveler_type'],
-                'fr'
-            )
-            cursor.execute(review_query, review_values)
-        
-        connection.commit()
-        print(f"  ✅ {hotel_data['name']} inséré en BDD avec {len(hotel_data['rooms'])} chambres et {len(hotel_data['reviews'])} avis")
-        return True
-        
-    except Error as e:
-        connection.rollback()
-        print(f"  ❌ Erreur lors de l'insertion de {hotel_data['name']}: {e}")
-        return False
+        for arguments, context in tasks:
+            pending.append((executor.submit(_run_measured, function, *arguments), context))
+            if len(pending) >= 2 * processes:
+                yield next_result()
+        while pending:
+            yield next_result()
     finally:
-        cursor.close()
+        executor.shutdown(wait=True, cancel_futures=True)
 
 
 # ============================================================================
-# FONCTION PRINCIPALE
+# INSERTION EN BASE DE DONNÉES
 # ============================================================================
 
-def main():
-    """Fonction principale du script"""
-    print("=" * 80)
-    print("🏨 SCRAPING BOOKING.COM - RÉCUPÉRATION DE 100 HÔTELS")
-    print("=" * 80)
-    print(f"\n📍 Destinations cibles: {len(DESTINATIONS)} villes")
-    print(f"🎯 Objectif: ~100 hôtels au total\n")
-    
-    # Connexion à la base de données
-    connection = create_db_connection()
-    
-    total_hotels = 0
-    total_rooms = 0
-    total_offers = 0
-    total_reviews = 0
-    
-    try:
-        # Parcourir chaque destination
-        for dest in DESTINATIONS:
-            print(f"\n{'='*80}")
-            print(f"🌍 DESTINATION: {dest['name']}, {dest['country']}")
-            print(f"{'='*80}")
-            
-            # Scraper les hôtels
-            hotels = scrape_booking_hotels(dest)
-            
-            # Insérer en base de données
-            print(f"\n💾 Insertion en base de données...")
+# Colonnes insérées par table, dans l'ordre des tuples construits ci-dessous.
+# Les colonnes de la 2e liste reçoivent NOW() côté serveur.
+TABLE_SCHEMAS = {
+    'HOTEL': (
+        ('hotel_id_api', 'nom_hotel', 'description_hotel', 'rue_hotel', 'code_postal_hotel',
+         'ville_hotel', 'pays_hotel', 'tel_hotel', 'email_hotel', 'img_hotel',
+         'nbre_etoile_hotel', 'note_moy_hotel', 'nbre_avis_hotel', 'latitude', 'longitude'),
+        ('date_scraping',)
+    ),
+    'IMG_HOTEL': (
+        ('id_hotel', 'url_img', 'categorie_img', 'ordre_affichage'),
+        ()
+    ),
+    'IMG_HOTEL_URL': (
+        ('id_hotel', 'id_url', 'categorie_img', 'ordre_affichage'),
+        ()
+    ),
+    'HOTEL_AMENITIES': (
+        ('id_hotel', 'parking', 'restaurant', 'climatisation', 'non_fumeur', 'pet_allowed',
+         'wi_fi', 'television', 'mini_bar', 'coffre_fort', 'piscine', 'spa', 'salle_sport'),
+        ()
+    ),
+    'HOTEL_GEO': (
+        ('id_hotel', 'geohash'),
+        ()
+    ),
+    'CHAMBRE': (
+        ('id_hotel', 'type_room', 'cat_room', 'type_lit', 'nbre_lit',
+         'nbre_adults_max', 'nbre_children_max', 'surface_m2', 'vue', 'description_room'),
+        ()
+    ),
+    'IMG_CHAMBRE': (
+        ('id_chambre', 'url_img', 'cat_img', 'ordre_affichage'),
+        ()
+    ),
+    'IMG_CHAMBRE_URL': (
+        ('id_chambre', 'id_url', 'cat_img', 'ordre_affichage'),
+        ()
+    ),
+    'OFFRE': (
+        ('id_hotel', 'id_chambre', 'nom_offre', 'prix_nuit', 'devise',
+         'conditions_annulation', 'delai_annulation_gratuite', 'frais_annulation',
+         'remboursable', 'petit_dejeuner_inclus', 'pension', 'description_offre'),
+        ('date_scraping',)
+    ),
+    'TARIF_NUIT': (
+        ('id_chambre', 'nom_offre', 'date_nuit', 'prix_nuit'),
+        ()
+    ),
+    'HOTEL_RECHERCHE': (
+        ('id_hotel', 'ville_hotel', 'nbre_etoile_hotel', 'equipements', 'prix_min', 'prix_max',
+         'prix_min_sans_repas', 'prix_max_sans_repas', 'prix_min_petit_dejeuner', 'prix_max_petit_dejeuner',
+         'prix_min_demi_pension', 'prix_max_demi_pension', 'prix_min_pension_complete', 'prix_max_pension_complete',
+         'nbre_avis', 'somme_notes', 'note_moyenne'),
+        ()
+    ),
+    'AVIS': (
+        ('id_hotel', 'pseudo_user', 'note', 'titre_avis', 'commentaire',
+         'date_avis', 'pays_origine', 'type_voyageur', 'langue'),
+        ('date_scraping',)
+    ),
+}
+
+HOTEL_PHOTO_CATEGORIES = ['facade', 'hall', 'restaurant', 'piscine', 'spa']
+ROOM_PHOTO_CATEGORIES = ['generale', 'salle_bain', 'vue']
+
+# Clés primaires des tables parentes (identifiants attribués côté client)
+PRIMARY_KEYS = {
+    'HOTEL': 'id_hotel',
+    'CHAMBRE': 'id_chambre',
+}
+
+# Nombre max de lignes par requête INSERT multi-lignes (reste sous max_allowed_packet)
+MAX_ROWS_PER_STATEMENT = 1000
+
+
+def build_hotel_row(hotel_data):
+    """Tuple de valeurs HOTEL : les premiers champs de Hotel"""
+    return hotel_data[:HOTEL_COLUMN_COUNT]
+
+
+def build_hotel_photo_rows(hotel_id, photos):
+    """Construire les tuples IMG_HOTEL d'un hôtel"""
+    return [
+        (hotel_id, photo_url,
+         HOTEL_PHOTO_CATEGORIES[idx] if idx < len(HOTEL_PHOTO_CATEGORIES) else 'autre', idx)
+        for idx, photo_url in enumerate(photos)
+    ]
+
+
+def build_amenities_row(hotel_id, amenities):
+    """Tuple de valeurs HOTEL_AMENITIES"""
+    return (hotel_id,) + amenities
+
+
+def build_room_row(hotel_id, room):
+    """Tuple de valeurs CHAMBRE : id_hotel + les premiers champs de Room"""
+    return (hotel_id,) + room[:ROOM_COLUMN_COUNT]
+
+
+def build_room_photo_rows(room_id, photos):
+    """Construire les tuples IMG_CHAMBRE d'une chambre"""
+    return [
+        (room_id, photo_url,
+         ROOM_PHOTO_CATEGORIES[idx] if idx < len(ROOM_PHOTO_CATEGORIES) else 'autre', idx)
+        for idx, photo_url in enumerate(photos)
+    ]
+
+
+def build_offer_row(hotel_id, room_id, offer):
+    """Tuple de valeurs OFFRE"""
+    return (hotel_id, room_id) + offer
+
+
+def build_review_row(hotel_id, review):
+    """Tuple de valeurs AVIS"""
+    return (hotel_id,) + review
+
+
+def insert_rows(cursor, table, rows, chunk_size=MAX_ROWS_PER_STATEMENT, with_id=False,
+                id_column=None, upsert=False):
+    """
+    Insérer plusieurs lignes avec des requêtes INSERT ... VALUES (...), (...), ...
+    Une seule requête (donc un seul aller-retour réseau) par paquet de chunk_size lignes
+    Avec with_id=True, chaque ligne commence par sa clé primaire (PRIMARY_KEYS),
+    avec id_column, par la colonne indiquée
+    Avec upsert=True, les lignes existantes sont mises à jour (ON DUPLICATE KEY UPDATE)
+    Durée et nombre de lignes mesurés par table (étape 'insert.<TABLE>')
+    """
+    if not rows:
+        return 0
+
+    columns, now_columns = TABLE_SCHEMAS[table]
+    if with_id:
+        id_column = PRIMARY_KEYS[table]
+    if id_column:
+        columns = (id_column,) + columns
+    column_list = ', '.join(columns + now_columns)
+    placeholder = '(' + ', '.join(['%s'] * len(columns) + ['NOW()'] * len(now_columns)) + ')'
+    suffix = ''
+    if upsert:
+        updated = [column for column in columns + now_columns if column != id_column]
+        suffix = ' ON DUPLICATE KEY UPDATE ' + ', '.join(f"{column} = VALUES({column})" for column in updated)
+
+    with METRICS.measure(f"insert.{table}", len(rows)):
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            query = f"INSERT INTO {table} ({column_list}) VALUES " + ', '.join([placeholder] * len(chunk)) + suffix
+            cursor.execute(query, [value for row in chunk for value in row])
+
+    return len(rows)
+
+
+class IdAllocator:
+    """
+    Attribution des identifiants côté client pour une table parente (HOTEL, CHAMBRE)
+    MAX(id) et l'AUTO_INCREMENT courant sont lus une seule fois par bloc, table
+    verrouillée (LOCK TABLES ... WRITE), puis l'AUTO_INCREMENT est repoussé après le
+    bloc réservé avant de libérer le verrou : aucun autre client (backend compris)
+    ne peut insérer entre la lecture et la réservation
+    Partageable entre threads : un seul allocateur par table pour tous les workers
+    """
+
+    def __init__(self, table, block_size=ID_BLOCK_SIZE):
+        self.table = table
+        self.id_column = PRIMARY_KEYS[table]
+        self.block_size = max(1, block_size)
+        self.next_id = 0
+        self.end_id = 0
+        self.lock = threading.Lock()
+
+    def reserve(self, connection, count):
+        """Réserver un nouveau bloc d'au moins count identifiants (hors transaction : LOCK / ALTER TABLE)"""
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"LOCK TABLES {self.table} WRITE")
+            try:
+                cursor.execute(f"SELECT COALESCE(MAX({self.id_column}), 0) + 1 FROM {self.table}")
+                start = max(cursor.fetchone()[0], self.end_id)
+                # AUTO_INCREMENT au-delà de MAX(id) : lignes supprimées ou insertions annulées
+                cursor.execute(f"SHOW CREATE TABLE {self.table}")
+                row = cursor.fetchone()
+                match = row and re.search(r'AUTO_INCREMENT=(\d+)', row[1])
+                if match:
+                    start = max(start, int(match.group(1)))
+                size = max(count, self.block_size)
+                cursor.execute(f"ALTER TABLE {self.table} AUTO_INCREMENT = {start + size}")
+            finally:
+                cursor.execute("UNLOCK TABLES")
+        finally:
+            cursor.close()
+
+        self.next_id = start
+        self.end_id = start + size
+
+    def allocate(self, connection, count=1):
+        """Retourner le premier identifiant d'une plage contiguë de count identifiants"""
+        with self.lock:
+            if self.next_id + count > self.end_id:
+                self.reserve(connection, count)
+            first_id = self.next_id
+            self.next_id += count
+            return first_id
+
+
+def create_id_allocators():
+    """Un allocateur par table parente"""
+    return {table: IdAllocator(table) for table in PRIMARY_KEYS}
+
+
+def build_batch_rows(batch, first_hotel_id, first_room_id):
+    """
+    Construire en mémoire toutes les lignes d'un lot d'hôtels, avec des identifiants
+    attribués séquentiellement à partir de first_hotel_id / first_room_id
+    Retourne {table: [lignes]} ; HOTEL et CHAMBRE incluent leur clé primaire,
+    HOTEL_GEO, TARIF_NUIT et HOTEL_RECHERCHE sont calculées à partir des autres tables
+    """
+    rows = {table: [] for table in TABLE_SCHEMAS}
+    hotel_id = first_hotel_id
+    room_id = first_room_id
+
+    for hotel_data in batch:
+        rows['HOTEL'].append((hotel_id,) + build_hotel_row(hotel_data))
+        rows['IMG_HOTEL'].extend(build_hotel_photo_rows(hotel_id, hotel_data.photos))
+        rows['HOTEL_AMENITIES'].append(build_amenities_row(hotel_id, hotel_data.amenities))
+        rows['AVIS'].extend(build_review_row(hotel_id, review) for review in hotel_data.reviews)
+
+        for room in hotel_data.rooms:
+            rows['CHAMBRE'].append((room_id,) + build_room_row(hotel_id, room))
+            rows['IMG_CHAMBRE'].extend(build_room_photo_rows(room_id, room.photos))
+            rows['OFFRE'].extend(build_offer_row(hotel_id, room_id, offer) for offer in room.offers)
+            room_id += 1
+
+        hotel_id += 1
+
+    rows.update(build_derived_rows(rows))
+    return rows
+
+
+class HotelBatchWriter:
+    """
+    Écriture groupée des hôtels : les lignes de chaque table sont accumulées
+    sur plusieurs hôtels puis envoyées en INSERT multi-lignes, avec une seule
+    transaction (un seul COMMIT) par lot de batch_size hôtels
+
+    Avec client_ids=True, les identifiants HOTEL/CHAMBRE sont attribués côté client
+    (IdAllocator) : tout le lot est construit en mémoire puis chaque table, parents
+    compris, part en une requête multi-lignes, sans aller-retour par parent
+    """
+
+    def __init__(self, connection, batch_size=None, client_ids=None, id_allocators=None, photo_urls=None):
+        self.connection = connection
+        self.batch_size = max(1, BATCH_SIZE if batch_size is None else batch_size)
+        self.pending = []
+        self.stats = {'hotels': 0, 'rooms': 0, 'offers': 0, 'reviews': 0, 'failed': 0}
+        self.on_commit = None  # Rappel après chaque COMMIT : on_commit([(booking_id, ville)])
+        self.id_allocators = None
+        if CLIENT_SIDE_IDS if client_ids is None else client_ids:
+            self.id_allocators = id_allocators or create_id_allocators()
+        self.photo_urls = photo_urls or PhotoUrlRegistry(connection)
+
+    def add(self, hotel_data):
+        """Ajouter un hôtel au lot courant (flush automatique quand le lot est plein)"""
+        self.pending.append(hotel_data)
+        if len(self.pending) >= self.batch_size:
+            return self.flush()
+        return 0
+
+    def flush(self):
+        """Écrire le lot courant dans une transaction, retourne le nombre d'hôtels insérés"""
+        if not self.pending:
+            return 0
+
+        batch, self.pending = self.pending, []
+        rows = None
+
+        try:
+            # URLs des photos et identifiants réservés avant d'ouvrir la transaction
+            self.photo_urls.register(self.connection, batch_photo_urls(batch))
+            if self.id_allocators:
+                room_count = sum(len(hotel_data.rooms) for hotel_data in batch)
+                rows = self.photo_urls.normalize(build_batch_rows(
+                    batch,
+                    self.id_allocators['HOTEL'].allocate(self.connection, len(batch)),
+                    self.id_allocators['CHAMBRE'].allocate(self.connection, room_count)
+                ))
+
+            cursor = self.connection.cursor()
+            try:
+                if rows is not None:
+                    # Parents puis enfants, une requête multi-lignes par table
+                    for table, table_rows in rows.items():
+                        insert_rows(cursor, table, table_rows, with_id=table in PRIMARY_KEYS)
+                else:
+                    rows = self._insert_with_lastrowid(cursor, batch)
+
+                with METRICS.measure('commit', len(batch)):
+                    self.connection.commit()
+            finally:
+                cursor.close()
+
+        except Error as e:
+            self.connection.rollback()
+            self.stats['failed'] += len(batch)
+            print(f"  ❌ Erreur lors de l'insertion du lot de {len(batch)} hôtels: {e}")
+            return 0
+
+        for hotel_data in batch:
+            self.stats['hotels'] += 1
+            self.stats['rooms'] += len(hotel_data.rooms)
+            self.stats['offers'] += sum(len(room.offers) for room in hotel_data.rooms)
+            self.stats['reviews'] += len(hotel_data.reviews)
+        if self.on_commit:
+            self.on_commit([(hotel_data.booking_id, hotel_data.city) for hotel_data in batch])
+
+        PROGRESS.detail(f"  ✅ Lot de {len(batch)} hôtels inséré en BDD "
+                        f"({len(rows['OFFRE'])} offres, {len(rows['AVIS'])} avis)")
+        PROGRESS.advance(len(batch))
+        return len(batch)
+
+    def finish(self):
+        """Écrire le dernier lot incomplet"""
+        return self.flush()
+
+    def write_rows(self, rows, keys):
+        """
+        Écrire des lignes déjà construites ({table: [lignes]}, identifiants compris,
+        ex. generate_catalog_batch) dans une transaction
+        keys : [(booking_id, ville)] des hôtels écrits, pour on_commit
+        """
+        try:
+            rows = self.photo_urls.prepare(self.connection, rows)
+        except Error as e:
+            self.stats['failed'] += len(keys)
+            print(f"  ❌ Erreur lors de l'enregistrement des URLs de photos: {e}")
+            return 0
+
+        cursor = self.connection.cursor()
+        try:
+            for table, table_rows in rows.items():
+                insert_rows(cursor, table, table_rows, with_id=table in PRIMARY_KEYS)
+            with METRICS.measure('commit', len(rows['HOTEL'])):
+                self.connection.commit()
+        except Error as e:
+            self.connection.rollback()
+            self.stats['failed'] += len(rows['HOTEL'])
+            print(f"  ❌ Erreur lors de l'insertion du paquet de {len(rows['HOTEL'])} hôtels: {e}")
+            return 0
+        finally:
+            cursor.close()
+
+        self.stats['hotels'] += len(rows['HOTEL'])
+        self.stats['rooms'] += len(rows['CHAMBRE'])
+        self.stats['offers'] += len(rows['OFFRE'])
+        self.stats['reviews'] += len(rows['AVIS'])
+        if self.on_commit:
+            self.on_commit(keys)
+
+        PROGRESS.detail(f"  ✅ Paquet de {len(rows['HOTEL'])} hôtels inséré en BDD "
+                        f"({len(rows['OFFRE'])} offres, {len(rows['AVIS'])} avis)")
+        PROGRESS.advance(len(rows['HOTEL']))
+        return len(rows['HOTEL'])
+
+    def _insert_with_lastrowid(self, cursor, batch):
+        """Parents HOTEL/CHAMBRE ligne par ligne (lastrowid), enfants groupés par table"""
+        rows = {table: [] for table in ('IMG_HOTEL', 'HOTEL_AMENITIES', 'IMG_CHAMBRE', 'OFFRE', 'AVIS')}
+        hotel_rows = []
+
+        for hotel_data in batch:
+            insert_rows(cursor, 'HOTEL', [build_hotel_row(hotel_data)])
+            hotel_id = cursor.lastrowid
+            hotel_rows.append((hotel_id,) + build_hotel_row(hotel_data))
+
+            rows['IMG_HOTEL'].extend(build_hotel_photo_rows(hotel_id, hotel_data.photos))
+            rows['HOTEL_AMENITIES'].append(build_amenities_row(hotel_id, hotel_data.amenities))
+            rows['AVIS'].extend(build_review_row(hotel_id, review) for review in hotel_data.reviews)
+
+            for room in hotel_data.rooms:
+                insert_rows(cursor, 'CHAMBRE', [build_room_row(hotel_id, room)])
+                room_id = cursor.lastrowid
+                rows['IMG_CHAMBRE'].extend(build_room_photo_rows(room_id, room.photos))
+                rows['OFFRE'].extend(build_offer_row(hotel_id, room_id, offer) for offer in room.offers)
+
+        rows.update(build_derived_rows(dict(rows, HOTEL=hotel_rows)))
+        for table, table_rows in self.photo_urls.normalize(rows).items():
+            insert_rows(cursor, table, table_rows)
+
+        return rows
+
+
+# ============================================================================
+# TABLES DÉRIVÉES : GEOHASH, CALENDRIER DES TARIFS, RÉSUMÉ DE RECHERCHE
+# ============================================================================
+
+# Tables calculées à partir des lignes de chaque lot (MySQL : create_derived_tables)
+# - HOTEL_GEO : geohash des coordonnées (recherche par rayon / rectangle, cf. geo_index.py)
+# - TARIF_NUIT : prix de chaque nuit d'une offre (chambre + nom de l'offre, comme dans
+#   IncrementalHotelWriter) ; total d'un séjour = SUM(prix_nuit) sur la plage de dates
+# - HOTEL_RECHERCHE : une ligne par hôtel pour la page de résultats (ville, étoiles,
+#   équipements en masque de bits, prix min/max par pension, avis réellement écrits)
+DERIVED_TABLE_QUERIES = [
+    """
+    CREATE TABLE IF NOT EXISTS HOTEL_GEO (
+        id_hotel INT NOT NULL PRIMARY KEY,
+        geohash VARCHAR(12) NOT NULL,
+        KEY idx_hotel_geo_geohash (geohash)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS TARIF_NUIT (
+        id_chambre INT NOT NULL,
+        nom_offre VARCHAR(255) NOT NULL,
+        date_nuit DATE NOT NULL,
+        prix_nuit DECIMAL(10, 2) NOT NULL,
+        PRIMARY KEY (id_chambre, nom_offre, date_nuit)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS HOTEL_RECHERCHE (
+        id_hotel INT NOT NULL PRIMARY KEY,
+        ville_hotel VARCHAR(100) NOT NULL,
+        nbre_etoile_hotel INT,
+        equipements INT NOT NULL DEFAULT 0,
+        prix_min DECIMAL(10, 2),
+        prix_max DECIMAL(10, 2),
+        prix_min_sans_repas DECIMAL(10, 2),
+        prix_max_sans_repas DECIMAL(10, 2),
+        prix_min_petit_dejeuner DECIMAL(10, 2),
+        prix_max_petit_dejeuner DECIMAL(10, 2),
+        prix_min_demi_pension DECIMAL(10, 2),
+        prix_max_demi_pension DECIMAL(10, 2),
+        prix_min_pension_complete DECIMAL(10, 2),
+        prix_max_pension_complete DECIMAL(10, 2),
+        nbre_avis INT NOT NULL DEFAULT 0,
+        somme_notes DECIMAL(10, 1) NOT NULL DEFAULT 0,
+        note_moyenne DECIMAL(4, 2),
+        KEY idx_hotel_recherche_ville (ville_hotel, nbre_etoile_hotel, prix_min)
+    )
+    """,
+]
+
+# Bit de chaque colonne de HOTEL_AMENITIES dans HOTEL_RECHERCHE.equipements
+# ex. wi-fi et piscine : WHERE equipements & 544 = 544 (cf. amenity_mask('wi_fi', 'piscine'))
+AMENITY_BITS = {name: 1 << idx for idx, name in enumerate(TABLE_SCHEMAS['HOTEL_AMENITIES'][0][1:])}
+
+# Pension des offres (OFFER_TYPES 'board') → suffixe des colonnes prix_min_* / prix_max_*
+BOARD_COLUMNS = {
+    'none': 'sans_repas',
+    'breakfast': 'petit_dejeuner',
+    'half_board': 'demi_pension',
+    'full_board': 'pension_complete',
+}
+
+# Position des colonnes dans les lignes HOTEL (id_hotel en tête), OFFRE et AVIS
+HOTEL_CITY_INDEX = 1 + TABLE_SCHEMAS['HOTEL'][0].index('ville_hotel')
+HOTEL_STARS_INDEX = 1 + TABLE_SCHEMAS['HOTEL'][0].index('nbre_etoile_hotel')
+HOTEL_LATITUDE_INDEX = 1 + TABLE_SCHEMAS['HOTEL'][0].index('latitude')
+HOTEL_LONGITUDE_INDEX = 1 + TABLE_SCHEMAS['HOTEL'][0].index('longitude')
+OFFER_BOARD_INDEX = TABLE_SCHEMAS['OFFRE'][0].index('pension')
+REVIEW_NOTE_INDEX = TABLE_SCHEMAS['AVIS'][0].index('note')
+
+
+def create_derived_tables(connection):
+    """Créer HOTEL_GEO, TARIF_NUIT et HOTEL_RECHERCHE si elles n'existent pas (MySQL)"""
+    cursor = connection.cursor()
+    try:
+        for query in DERIVED_TABLE_QUERIES:
+            cursor.execute(query)
+    finally:
+        cursor.close()
+
+
+def destination_peak_month(city_name):
+    """Mois de haute saison d'une ville de DESTINATIONS (DEFAULT_PEAK_MONTH sinon)"""
+    known = next((d for d in DESTINATIONS if d['name'] == city_name), {})
+    return known.get('peak_month', DEFAULT_PEAK_MONTH)
+
+
+@lru_cache(maxsize=None)
+def rate_calendar(peak_month, start, days):
+    """
+    Dates ('AAAA-MM-JJ') et facteurs de prix (tableau NumPy) des days nuits à partir
+    de start : saison (cosinus, sommet au 15 du peak_month) × week-end × dernière minute
+    """
+    import numpy as np
+
+    nights = np.datetime64(start, 'D') + np.arange(days)
+    day_of_year = (nights - nights.astype('datetime64[Y]')).astype(np.int64)
+    peak_day = datetime(2001, peak_month, 15).timetuple().tm_yday - 1
+    factors = 1 + RATE_SEASON_AMPLITUDE * np.cos(2 * np.pi * (day_of_year - peak_day) / 365.25)
+
+    # 1970-01-01 est un jeudi : (jours + 3) % 7 donne 0 = lundi ... 4 = vendredi, 5 = samedi
+    weekday = (nights.astype(np.int64) + 3) % 7
+    factors *= np.where((weekday == 4) | (weekday == 5), 1 + RATE_WEEKEND_UPLIFT, 1.0)
+    factors[:RATE_LAST_MINUTE_DAYS] *= 1 - RATE_LAST_MINUTE_DISCOUNT
+
+    factors.flags.writeable = False  # Partagé par le cache
+    return np.datetime_as_string(nights, unit='D').tolist(), factors
+
+
+def build_rate_rows(room_ids, offer_names, prices, cities):
+    """
+    Lignes TARIF_NUIT (id_chambre, nom_offre, date_nuit, prix_nuit) d'offres données en
+    listes parallèles, sur RATE_CALENDAR_DAYS nuits : un seul produit NumPy
+    (offres × nuits) prix de l'offre × facteurs de sa ville. [] sans calendrier
+    """
+    days = RATE_CALENDAR_DAYS
+    if days <= 0 or not len(room_ids):
+        return []
+    import numpy as np
+
+    start = reference_date().date().isoformat()
+    city_names = sorted(set(cities))
+    calendars = [rate_calendar(destination_peak_month(city), start, days) for city in city_names]
+    dates = calendars[0][0]
+    factors = np.stack([city_factors for _, city_factors in calendars])
+    positions = {city: idx for idx, city in enumerate(city_names)}
+    city_indexes = np.asarray([positions[city] for city in cities])
+
+    nightly = np.rint(np.asarray(prices, dtype=np.float64)[:, None] * factors[city_indexes]).astype(np.int64)
+    return list(zip(np.repeat(np.asarray(room_ids), days).tolist(),
+                    np.repeat(np.asarray(offer_names, dtype=object), days).tolist(),
+                    dates * len(room_ids),
+                    nightly.ravel().tolist()))
+
+
+def amenity_mask(*names):
+    """Masque de bits d'équipements pour filtrer HOTEL_RECHERCHE (ex. amenity_mask('wi_fi', 'piscine'))"""
+    return sum(AMENITY_BITS[name] for name in set(names))
+
+
+def build_summary_rows(rows, kept_reviews=None):
+    """
+    Lignes HOTEL_RECHERCHE des hôtels de rows ({table: [lignes]}, HOTEL avec id_hotel) :
+    masque des équipements, prix min/max par pension et avis calculés à partir des
+    lignes HOTEL_AMENITIES, OFFRE et AVIS écrites avec l'hôtel
+    kept_reviews : {id_hotel: (nombre, somme des notes)} des avis déjà en base et conservés
+    """
+    amenities = {row[0]: sum(bit for bit, value in zip(AMENITY_BITS.values(), row[1:]) if value)
+                 for row in rows.get('HOTEL_AMENITIES', ())}
+
+    prices = {}
+    for row in rows.get('OFFRE', ()):
+        hotel_prices = prices.setdefault(row[0], {})
+        board_prices = hotel_prices.setdefault(row[OFFER_BOARD_INDEX], [row[3], row[3]])
+        board_prices[0] = min(board_prices[0], row[3])
+        board_prices[1] = max(board_prices[1], row[3])
+
+    reviews = dict(kept_reviews or {})
+    for row in rows.get('AVIS', ()):
+        count, total = reviews.get(row[0], (0, 0.0))
+        reviews[row[0]] = (count + 1, total + row[REVIEW_NOTE_INDEX])
+
+    summary_rows = []
+    for row in rows['HOTEL']:
+        hotel_id = row[0]
+        hotel_prices = prices.get(hotel_id, {})
+        board_columns = []
+        for board in BOARD_COLUMNS:
+            board_columns.extend(hotel_prices.get(board, (None, None)))
+        count, total = reviews.get(hotel_id, (0, 0.0))
+        summary_rows.append(
+            (hotel_id, row[HOTEL_CITY_INDEX], row[HOTEL_STARS_INDEX], amenities.get(hotel_id, 0),
+             min((low for low, _ in hotel_prices.values()), default=None),
+             max((high for _, high in hotel_prices.values()), default=None))
+            + tuple(board_columns)
+            + (count, round(total, 1), round(total / count, 2) if count else None)
+        )
+    return summary_rows
+
+
+def build_derived_rows(rows, kept_reviews=None):
+    """
+    Lignes HOTEL_GEO, TARIF_NUIT et HOTEL_RECHERCHE d'un lot ({table: [lignes]} avec
+    HOTEL (id_hotel compris), HOTEL_AMENITIES, OFFRE et AVIS)
+    """
+    hotel_rows = rows['HOTEL']
+    offer_rows = rows['OFFRE']
+    cities = {row[0]: row[HOTEL_CITY_INDEX] for row in hotel_rows}
+    return {
+        'HOTEL_GEO': [(row[0], geohash_encode(row[HOTEL_LATITUDE_INDEX], row[HOTEL_LONGITUDE_INDEX]))
+                      for row in hotel_rows
+                      if row[HOTEL_LATITUDE_INDEX] is not None and row[HOTEL_LONGITUDE_INDEX] is not None],
+        'TARIF_NUIT': build_rate_rows([row[1] for row in offer_rows], [row[2] for row in offer_rows],
+                                      [row[3] for row in offer_rows], [cities[row[0]] for row in offer_rows]),
+        'HOTEL_RECHERCHE': build_summary_rows(rows, kept_reviews),
+    }
+
+
+# ============================================================================
+# URLS DES PHOTOS (DICTIONNAIRE D'URLS DISTINCTES)
+# ============================================================================
+
+# Tables photo avec URL en clair → tables avec identifiant PHOTO_URL
+PHOTO_URL_TABLES = {
+    'IMG_HOTEL': 'IMG_HOTEL_URL',
+    'IMG_CHAMBRE': 'IMG_CHAMBRE_URL',
+}
+
+PHOTO_URL_TABLE_QUERIES = [
+    """
+    CREATE TABLE IF NOT EXISTS PHOTO_URL (
+        id_url INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+        url_img VARCHAR(500) NOT NULL,
+        UNIQUE KEY uq_photo_url (url_img)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS IMG_HOTEL_URL (
+        id_hotel INT NOT NULL,
+        id_url INT NOT NULL,
+        categorie_img VARCHAR(50),
+        ordre_affichage INT,
+        KEY idx_img_hotel_url_hotel (id_hotel)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS IMG_CHAMBRE_URL (
+        id_chambre INT NOT NULL,
+        id_url INT NOT NULL,
+        cat_img VARCHAR(50),
+        ordre_affichage INT,
+        KEY idx_img_chambre_url_chambre (id_chambre)
+    )
+    """,
+]
+
+
+def active_tables():
+    """Tables de TABLE_SCHEMAS alimentées avec PHOTO_URL_MODE (parents avant enfants)"""
+    if PHOTO_URL_MODE == 'dictionary':
+        unused = set(PHOTO_URL_TABLES)
+    else:
+        unused = set(PHOTO_URL_TABLES.values())
+    return [table for table in TABLE_SCHEMAS if table not in unused]
+
+
+def batch_photo_urls(batch):
+    """URLs des photos (hôtels et chambres) d'un lot d'hôtels"""
+    urls = [url for hotel_data in batch for url in hotel_data.photos]
+    urls.extend(url for hotel_data in batch for room in hotel_data.rooms for url in room.photos)
+    return urls
+
+
+class PhotoUrlRegistry:
+    """
+    URLs des photos écrites pendant l'exécution : nombre de références et URLs distinctes
+    En mode 'dictionary', chaque URL distincte est enregistrée une seule fois dans
+    PHOTO_URL et les lignes IMG_HOTEL / IMG_CHAMBRE deviennent des lignes
+    IMG_HOTEL_URL / IMG_CHAMBRE_URL (identifiant au lieu du texte de l'URL)
+    Partageable entre threads : un seul registre pour tous les workers
+    """
+
+    def __init__(self, connection=None, mode=PHOTO_URL_MODE):
+        self.mode = mode
+        self.ids = {}
+        self.seen = set()
+        self.references = 0
+        self.lock = threading.Lock()
+
+        if mode == 'dictionary':
+            cursor = connection.cursor()
+            try:
+                for query in PHOTO_URL_TABLE_QUERIES:
+                    cursor.execute(query)
+                # URLs déjà connues (exécutions précédentes)
+                cursor.execute("SELECT url_img, id_url FROM PHOTO_URL")
+                self.ids.update(cursor.fetchall())
+            finally:
+                cursor.close()
+
+    def register(self, connection, urls):
+        """
+        Enregistrer dans PHOTO_URL les URLs encore inconnues, dans une transaction
+        propre : à appeler avant d'ouvrir la transaction du lot
+        """
+        if self.mode != 'dictionary':
+            return
+        with self.lock:
+            missing = sorted({url for url in urls if url not in self.ids})
+            if not missing:
+                return
+            cursor = connection.cursor()
+            try:
+                for start in range(0, len(missing), MAX_ROWS_PER_STATEMENT):
+                    chunk = missing[start:start + MAX_ROWS_PER_STATEMENT]
+                    cursor.execute("INSERT IGNORE INTO PHOTO_URL (url_img) VALUES " + ', '.join(['(%s)'] * len(chunk)), chunk)
+                    cursor.execute(f"SELECT url_img, id_url FROM PHOTO_URL WHERE url_img IN ({placeholders(chunk)})", chunk)
+                    self.ids.update(cursor.fetchall())
+                connection.commit()
+            finally:
+                cursor.close()
+
+    def normalize(self, rows):
+        """
+        Compter les URLs des lignes photo de rows ({table: [lignes]}) et, en mode
+        'dictionary', les remplacer par leur identifiant (URLs enregistrées avant)
+        """
+        with self.lock:
+            for table in PHOTO_URL_TABLES:
+                urls = [row[1] for row in rows.get(table, ())]
+                self.references += len(urls)
+                self.seen.update(urls)
+
+        if self.mode == 'dictionary':
+            for table, url_table in PHOTO_URL_TABLES.items():
+                rows[url_table] = [(owner_id, self.ids[url], category, order)
+                                   for owner_id, url, category, order in rows.get(table, ())]
+                rows[table] = []
+        return rows
+
+    def prepare(self, connection, rows):
+        """register puis normalize, pour des lignes complètes, avant la transaction"""
+        self.register(connection, [row[1] for table in PHOTO_URL_TABLES for row in rows.get(table, ())])
+        return self.normalize(rows)
+
+
+# ============================================================================
+# MISE À JOUR INCRÉMENTALE (UPSERT PAR hotel_id_api)
+# ============================================================================
+
+# Table de suivi : empreinte du contenu de chaque hôtel déjà chargé
+SYNC_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS HOTEL_SYNC (
+    hotel_id_api VARCHAR(100) NOT NULL PRIMARY KEY,
+    id_hotel INT NOT NULL,
+    content_hash CHAR(64) NOT NULL,
+    date_sync DATETIME NOT NULL
+)
+"""
+
+
+def hotel_content_hash(hotel_data):
+    """Empreinte SHA-256 du graphe d'un hôtel (hôtel, équipements, chambres, offres, avis)"""
+    content = {
+        'hotel': build_hotel_row(hotel_data),
+        'photos': hotel_data.photos,
+        'amenities': build_amenities_row(None, hotel_data.amenities),
+        'rooms': [
+            {
+                'room': build_room_row(None, room),
+                'photos': room.photos,
+                'offers': [build_offer_row(None, None, offer) for offer in room.offers]
+            }
+            for room in hotel_data.rooms
+        ],
+        'reviews': [build_review_row(None, review) for review in hotel_data.reviews]
+    }
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def placeholders(values):
+    """'%s, %s, ...' pour une clause IN"""
+    return ', '.join(['%s'] * len(values))
+
+
+class IncrementalHotelWriter:
+    """
+    Mise à jour incrémentale : chaque hôtel est identifié par hotel_id_api (booking_id)
+    - empreinte inchangée → hôtel ignoré
+    - nouvel hôtel → insertion groupée comme HotelBatchWriter
+    - hôtel modifié → HOTEL et chambres/offres existantes mis à jour sur place
+      (INSERT ... ON DUPLICATE KEY UPDATE, les identifiants référencés par les
+      réservations ne changent pas), photos/équipements/avis générés remplacés
+    Une transaction par lot, même interface que HotelBatchWriter
+    """
+
+    def __init__(self, connection, batch_size=None, id_allocators=None, photo_urls=None):
+        self.connection = connection
+        self.batch_size = max(1, BATCH_SIZE if batch_size is None else batch_size)
+        self.pending = []
+        self.stats = {'hotels': 0, 'updated': 0, 'skipped': 0, 'rooms': 0, 'offers': 0, 'reviews': 0, 'failed': 0}
+        self.on_commit = None
+        self.id_allocators = id_allocators or create_id_allocators()
+        self.photo_urls = photo_urls or PhotoUrlRegistry(connection)
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute(SYNC_TABLE_QUERY)
+        finally:
+            cursor.close()
+
+    def add(self, hotel_data):
+        """Ajouter un hôtel au lot courant (flush automatique quand le lot est plein)"""
+        self.pending.append(hotel_data)
+        if len(self.pending) >= self.batch_size:
+            return self.flush()
+        return 0
+
+    def finish(self):
+        """Écrire le dernier lot incomplet"""
+        return self.flush()
+
+    def flush(self):
+        """Comparer les empreintes du lot puis écrire les hôtels nouveaux ou modifiés"""
+        if not self.pending:
+            return 0
+
+        # Un même booking_id deux fois dans le lot : la dernière version l'emporte
+        batch = list({hotel_data.booking_id: hotel_data for hotel_data in self.pending}.values())
+        self.pending = []
+        hashes = {hotel_data.booking_id: hotel_content_hash(hotel_data) for hotel_data in batch}
+
+        try:
+            # URLs des photos enregistrées avant d'ouvrir la transaction
+            self.photo_urls.register(self.connection, batch_photo_urls(batch))
+        except Error as e:
+            self.stats['failed'] += len(batch)
+            print(f"  ❌ Erreur lors de l'enregistrement des URLs de photos: {e}")
+            return 0
+
+        cursor = self.connection.cursor()
+        try:
+            known_hashes, existing_ids = self._lookup(cursor, list(hashes))
+            new_hotels = [h for h in batch if h.booking_id not in existing_ids]
+            changed_hotels = [h for h in batch if h.booking_id in existing_ids
+                              and known_hashes.get(h.booking_id) != hashes[h.booking_id]]
+            skipped = len(batch) - len(new_hotels) - len(changed_hotels)
+
+            # Identifiants réservés avant la première écriture, lecture terminée : ALTER TABLE
+            # ... AUTO_INCREMENT valide implicitement la transaction et attend les verrous de
+            # métadonnées des autres workers. Chambres des hôtels modifiés : borne haute
+            self.connection.rollback()
+            first_hotel_id = first_room_id = None
+            if new_hotels:
+                first_hotel_id = self.id_allocators['HOTEL'].allocate(self.connection, len(new_hotels))
+            room_count = sum(len(hotel_data.rooms) for hotel_data in new_hotels + changed_hotels)
+            if room_count:
+                first_room_id = self.id_allocators['CHAMBRE'].allocate(self.connection, room_count)
+
+            written_ids = {}
+            if new_hotels:
+                written_ids.update(self._insert_new(cursor, new_hotels, first_hotel_id, first_room_id))
+            if changed_hotels:
+                new_room_count = sum(len(hotel_data.rooms) for hotel_data in new_hotels)
+                self._update_changed(cursor, changed_hotels, existing_ids,
+                                     first_room_id + new_room_count if first_room_id is not None else None)
+                written_ids.update((h.booking_id, existing_ids[h.booking_id]) for h in changed_hotels)
+
+            sync_rows = [(booking_id, hotel_id, hashes[booking_id]) for booking_id, hotel_id in written_ids.items()]
+            if sync_rows:
+                row_placeholder = '(%s, %s, %s, NOW())'
+                cursor.execute(
+                    "INSERT INTO HOTEL_SYNC (hotel_id_api, id_hotel, content_hash, date_sync) VALUES "
+                    + ', '.join([row_placeholder] * len(sync_rows))
+                    + " ON DUPLICATE KEY UPDATE id_hotel = VALUES(id_hotel), "
+                      "content_hash = VALUES(content_hash), date_sync = VALUES(date_sync)",
+                    [value for row in sync_rows for value in row]
+                )
+
+            with METRICS.measure('commit', len(batch)):
+                self.connection.commit()
+
+        except Error as e:
+            self.connection.rollback()
+            self.stats['failed'] += len(batch)
+            print(f"  ❌ Erreur lors de la mise à jour du lot de {len(batch)} hôtels: {e}")
+            return 0
+        finally:
+            cursor.close()
+
+        self.stats['hotels'] += len(new_hotels)
+        self.stats['updated'] += len(changed_hotels)
+        self.stats['skipped'] += skipped
+        for hotel_data in new_hotels + changed_hotels:
+            self.stats['rooms'] += len(hotel_data.rooms)
+            self.stats['offers'] += sum(len(room.offers) for room in hotel_data.rooms)
+            self.stats['reviews'] += len(hotel_data.reviews)
+        if self.on_commit:
+            self.on_commit([(hotel_data.booking_id, hotel_data.city) for hotel_data in batch])
+
+        PROGRESS.detail(f"  ✅ Lot de {len(batch)} hôtels : {len(new_hotels)} nouveaux, "
+                        f"{len(changed_hotels)} modifiés, {skipped} inchangés")
+        PROGRESS.advance(len(batch))
+        return len(new_hotels) + len(changed_hotels)
+
+    def _lookup(self, cursor, booking_ids):
+        """Empreintes connues et id_hotel existants des booking_id du lot"""
+        cursor.execute(
+            f"SELECT hotel_id_api, id_hotel, content_hash FROM HOTEL_SYNC "
+            f"WHERE hotel_id_api IN ({placeholders(booking_ids)})",
+            booking_ids
+        )
+        known_hashes = {}
+        existing_ids = {}
+        for booking_id, hotel_id, content_hash in cursor.fetchall():
+            known_hashes[booking_id] = content_hash
+            existing_ids[booking_id] = hotel_id
+
+        # Hôtels chargés avant le mode incrémental : présents dans HOTEL, pas dans HOTEL_SYNC
+        missing = [booking_id for booking_id in booking_ids if booking_id not in existing_ids]
+        if missing:
+            cursor.execute(
+                f"SELECT hotel_id_api, MAX(id_hotel) FROM HOTEL "
+                f"WHERE hotel_id_api IN ({placeholders(missing)}) GROUP BY hotel_id_api",
+                missing
+            )
+            existing_ids.update(cursor.fetchall())
+        return known_hashes, existing_ids
+
+    def _insert_new(self, cursor, hotels, first_hotel_id, first_room_id):
+        """Insérer les nouveaux hôtels (identifiants réservés par flush), retourne {booking_id: id_hotel}"""
+        rows = self.photo_urls.normalize(build_batch_rows(hotels, first_hotel_id, first_room_id))
+        for table, table_rows in rows.items():
+            insert_rows(cursor, table, table_rows, with_id=table in PRIMARY_KEYS)
+        return {hotel_data.booking_id: first_hotel_id + idx for idx, hotel_data in enumerate(hotels)}
+
+    def _update_changed(self, cursor, hotels, existing_ids, first_room_id):
+        """
+        Mettre à jour les hôtels modifiés en conservant leurs identifiants
+        first_room_id : début de la plage réservée par flush pour les nouvelles chambres
+        """
+        hotel_ids = [existing_ids[hotel_data.booking_id] for hotel_data in hotels]
+        in_hotels = placeholders(hotel_ids)
+
+        # Chambres existantes (clé : hôtel + type) et offres existantes (clé : chambre + nom)
+        cursor.execute(
+            f"SELECT id_chambre, id_hotel, type_room FROM CHAMBRE WHERE id_hotel IN ({in_hotels})",
+            hotel_ids
+        )
+        existing_rooms = {(hotel_id, room_type): room_id for room_id, hotel_id, room_type in cursor.fetchall()}
+        cursor.execute(
+            f"SELECT id_offre, id_chambre, nom_offre FROM OFFRE WHERE id_hotel IN ({in_hotels})",
+            hotel_ids
+        )
+        existing_offers = {(room_id, name): offer_id for offer_id, room_id, name in cursor.fetchall()}
+
+        rows = {table: [] for table in TABLE_SCHEMAS}
+        new_rooms = []
+        updated_offers = []
+        new_offers = []
+        kept_offer_ids = set()
+        room_ids = []
+        kept_room_keys = set()
+
+        for hotel_data, hotel_id in zip(hotels, hotel_ids):
+            rows['HOTEL'].append((hotel_id,) + build_hotel_row(hotel_data))
+            rows['IMG_HOTEL'].extend(build_hotel_photo_rows(hotel_id, hotel_data.photos))
+            rows['HOTEL_AMENITIES'].append(build_amenities_row(hotel_id, hotel_data.amenities))
+            rows['AVIS'].extend(build_review_row(hotel_id, review) for review in hotel_data.reviews)
+
+            for room in hotel_data.rooms:
+                kept_room_keys.add((hotel_id, room.name))
+                room_id = existing_rooms.get((hotel_id, room.name))
+                if room_id is None:
+                    new_rooms.append((hotel_id, room))
+                    continue
+                room_ids.append(room_id)
+                rows['CHAMBRE'].append((room_id,) + build_room_row(hotel_id, room))
+                rows['IMG_CHAMBRE'].extend(build_room_photo_rows(room_id, room.photos))
+                for offer in room.offers:
+                    offer_id = existing_offers.get((room_id, offer.name))
+                    if offer_id is None:
+                        new_offers.append(build_offer_row(hotel_id, room_id, offer))
+                    else:
+                        kept_offer_ids.add(offer_id)
+                        updated_offers.append((offer_id,) + build_offer_row(hotel_id, room_id, offer))
+
+        # Nouvelles chambres : identifiants de la plage réservée
+        if new_rooms:
+            room_id = first_room_id
+            for hotel_id, room in new_rooms:
+                rows['CHAMBRE'].append((room_id,) + build_room_row(hotel_id, room))
+                rows['IMG_CHAMBRE'].extend(build_room_photo_rows(room_id, room.photos))
+                new_offers.extend(build_offer_row(hotel_id, room_id, offer) for offer in room.offers)
+                room_id += 1
+
+        # Chambres disparues : supprimées avec leurs photos sauf si une réservation les
+        # référence (directement ou par une de leurs offres)
+        removed_rooms = [room_id for key, room_id in existing_rooms.items() if key not in kept_room_keys]
+        if removed_rooms:
+            in_removed = placeholders(removed_rooms)
+            cursor.execute(
+                f"SELECT id_chambre FROM RESERVATION WHERE id_chambre IN ({in_removed}) "
+                f"UNION SELECT o.id_chambre FROM OFFRE o JOIN RESERVATION r ON r.id_offre = o.id_offre "
+                f"WHERE o.id_chambre IN ({in_removed})",
+                removed_rooms + removed_rooms
+            )
+            reserved_rooms = {room_id for room_id, in cursor.fetchall()}
+            removed_rooms = [room_id for room_id in removed_rooms if room_id not in reserved_rooms]
+
+        # Résumé de recherche : avis des utilisateurs conservés + avis générés écrits
+        cursor.execute(
+            f"SELECT id_hotel, COUNT(*), SUM(note) FROM AVIS "
+            f"WHERE id_hotel IN ({in_hotels}) AND id_user IS NOT NULL GROUP BY id_hotel",
+            hotel_ids
+        )
+        kept_reviews = {hotel_id: (count, float(total or 0)) for hotel_id, count, total in cursor.fetchall()}
+        rows.update(build_derived_rows(dict(rows, OFFRE=[row[1:] for row in updated_offers] + new_offers),
+                                       kept_reviews))
+        rows = self.photo_urls.normalize(rows)
+
+        # Remplacement des lignes générées non référencées ailleurs
+        cursor.execute(f"DELETE FROM IMG_HOTEL WHERE id_hotel IN ({in_hotels})", hotel_ids)
+        cursor.execute(f"DELETE FROM HOTEL_GEO WHERE id_hotel IN ({in_hotels})", hotel_ids)
+        cursor.execute(f"DELETE FROM HOTEL_RECHERCHE WHERE id_hotel IN ({in_hotels})", hotel_ids)
+        if self.photo_urls.mode == 'dictionary':
+            cursor.execute(f"DELETE FROM IMG_HOTEL_URL WHERE id_hotel IN ({in_hotels})", hotel_ids)
+        cursor.execute(f"DELETE FROM HOTEL_AMENITIES WHERE id_hotel IN ({in_hotels})", hotel_ids)
+        # Avis générés uniquement : les avis des utilisateurs (id_user) sont conservés
+        cursor.execute(f"DELETE FROM AVIS WHERE id_hotel IN ({in_hotels}) AND id_user IS NULL", hotel_ids)
+        if existing_rooms:
+            # Calendrier recalculé pour toutes les offres des chambres existantes
+            old_rooms = list(existing_rooms.values())
+            cursor.execute(f"DELETE FROM TARIF_NUIT WHERE id_chambre IN ({placeholders(old_rooms)})", old_rooms)
+        if room_ids + removed_rooms:
+            photo_rooms = room_ids + removed_rooms
+            cursor.execute(f"DELETE FROM IMG_CHAMBRE WHERE id_chambre IN ({placeholders(photo_rooms)})", photo_rooms)
+            if self.photo_urls.mode == 'dictionary':
+                cursor.execute(f"DELETE FROM IMG_CHAMBRE_URL WHERE id_chambre IN ({placeholders(photo_rooms)})",
+                               photo_rooms)
+
+        # Offres disparues : supprimées sauf si une réservation les référence
+        removed_offers = [offer_id for offer_id in existing_offers.values() if offer_id not in kept_offer_ids]
+        if removed_offers:
+            cursor.execute(
+                f"DELETE FROM OFFRE WHERE id_offre IN ({placeholders(removed_offers)}) "
+                f"AND id_offre NOT IN (SELECT id_offre FROM RESERVATION WHERE id_offre IS NOT NULL)",
+                removed_offers
+            )
+        if removed_rooms:
+            cursor.execute(f"DELETE FROM CHAMBRE WHERE id_chambre IN ({placeholders(removed_rooms)})", removed_rooms)
+
+        insert_rows(cursor, 'HOTEL', rows['HOTEL'], with_id=True, upsert=True)
+        insert_rows(cursor, 'CHAMBRE', rows['CHAMBRE'], with_id=True, upsert=True)
+        insert_rows(cursor, 'OFFRE', updated_offers, id_column='id_offre', upsert=True)
+        insert_rows(cursor, 'OFFRE', new_offers)
+        for table in ('IMG_HOTEL', 'IMG_HOTEL_URL', 'HOTEL_AMENITIES', 'HOTEL_GEO', 'IMG_CHAMBRE', 'IMG_CHAMBRE_URL',
+                      'AVIS', 'TARIF_NUIT', 'HOTEL_RECHERCHE'):
+            insert_rows(cursor, table, rows[table])
+
+
+# ============================================================================
+# CHARGEMENT EN MASSE (LOAD DATA LOCAL INFILE)
+# ============================================================================
+
+# Caractères à échapper dans un champ TSV (séparateurs par défaut de LOAD DATA)
+TSV_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\t': '\\t',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\0': '\\0',
+})
+
+
+def tsv_field(value):
+    """Formater une valeur pour LOAD DATA (NULL → \\N, booléens → 1/0, texte échappé)"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return str(value).translate(TSV_ESCAPES)
+
+
+def load_data_query(table, path):
+    """Construire la requête LOAD DATA LOCAL INFILE d'une table"""
+    columns, now_columns = TABLE_SCHEMAS[table]
+    if table in PRIMARY_KEYS:
+        columns = (PRIMARY_KEYS[table],) + columns
+    now_clause = ''
+    if now_columns:
+        now_clause = ' SET ' + ', '.join(f"{column} = NOW()" for column in now_columns)
+
+    # Slashs uniquement : MySQL les accepte aussi sous Windows
+    path = path.replace('\\', '/').replace("'", "\\'")
+    return (
+        f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table} "
+        "CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+        "LINES TERMINATED BY '\\n' "
+        f"({', '.join(columns)}){now_clause}"
+    )
+
+
+class BulkLoadWriter:
+    """
+    Chargement en masse : les lignes de chaque table sont écrites dans un fichier
+    TSV (STAGING_DIR/<TABLE>.tsv) puis chargées avec LOAD DATA LOCAL INFILE
+    Même interface que HotelBatchWriter (add / flush / finish / stats)
+    La connexion doit être ouverte avec allow_local_infile=True
+    """
+
+    def __init__(self, connection, batch_size=None, staging_dir=STAGING_DIR, id_allocators=None,
+                 photo_urls=None):
+        self.connection = connection
+        self.batch_size = max(1, BATCH_SIZE if batch_size is None else batch_size)
+        self.staging_dir = staging_dir
+        self.pending = []
+        self.staged = {'hotels': 0, 'rooms': 0, 'offers': 0, 'reviews': 0}
+        self.stats = {'hotels': 0, 'rooms': 0, 'offers': 0, 'reviews': 0, 'failed': 0}
+        self.staged_keys = []
+        self.on_commit = None
+        self.id_allocators = id_allocators or create_id_allocators()
+        self.photo_urls = photo_urls or PhotoUrlRegistry(connection)
+
+        tables = active_tables()
+        self.row_counts = {table: 0 for table in tables}
+        os.makedirs(staging_dir, exist_ok=True)
+        self.paths = {table: os.path.join(staging_dir, f"{table}.tsv") for table in tables}
+        # newline='' : pas de conversion \n → \r\n sous Windows
+        self.files = {table: open(path, 'w', encoding='utf-8', newline='')
+                      for table, path in self.paths.items()}
+
+    def add(self, hotel_data):
+        """Ajouter un hôtel (écriture dans les fichiers TSV quand le lot est plein)"""
+        self.pending.append(hotel_data)
+        if len(self.pending) >= self.batch_size:
+            return self.flush()
+        return 0
+
+    def flush(self):
+        """Écrire le lot courant dans les fichiers TSV"""
+        if not self.pending:
+            return 0
+
+        batch, self.pending = self.pending, []
+        room_count = sum(len(hotel_data.rooms) for hotel_data in batch)
+        rows = build_batch_rows(
+            batch,
+            self.id_allocators['HOTEL'].allocate(self.connection, len(batch)),
+            self.id_allocators['CHAMBRE'].allocate(self.connection, room_count)
+        )
+        return self.write_rows(rows, [(hotel_data.booking_id, hotel_data.city) for hotel_data in batch])
+
+    def write_rows(self, rows, keys):
+        """Écrire des lignes déjà construites ({table: [lignes]}, identifiants compris) dans les fichiers TSV"""
+        rows = self.photo_urls.prepare(self.connection, rows)
+        for table, table_rows in rows.items():
+            if not table_rows:
+                continue
+            self.files[table].writelines(
+                '\t'.join(tsv_field(value) for value in row) + '\n' for row in table_rows
+            )
+            self.row_counts[table] += len(table_rows)
+
+        self.staged_keys.extend(keys)
+        self.staged['hotels'] += len(rows['HOTEL'])
+        self.staged['rooms'] += len(rows['CHAMBRE'])
+        self.staged['offers'] += len(rows['OFFRE'])
+        self.staged['reviews'] += len(rows['AVIS'])
+        PROGRESS.advance(len(rows['HOTEL']))
+        return len(rows['HOTEL'])
+
+    def finish(self):
+        """Charger tous les fichiers TSV (une transaction) et afficher le débit par table"""
+        self.flush()
+        for staging_file in self.files.values():
+            staging_file.close()
+
+        print(f"\n🚚 Chargement LOAD DATA depuis {self.staging_dir}...")
+        cursor = self.connection.cursor()
+        try:
+            # Ordre de TABLE_SCHEMAS : parents avant enfants
+            for table, path in self.paths.items():
+                start = time.perf_counter()
+                cursor.execute(load_data_query(table, path))
+                elapsed = time.perf_counter() - start
+                rows = self.row_counts[table]
+                METRICS.record(f"load.{table}", elapsed, rows)
+                rate = rows / elapsed if elapsed > 0 else 0
+                print(f"  ✅ {table:<16} {rows:>9} lignes en {elapsed:6.2f}s ({rate:,.0f} lignes/s)")
+
+            with METRICS.measure('commit', self.staged['hotels']):
+                self.connection.commit()
+        except Error as e:
+            self.connection.rollback()
+            self.stats['failed'] = self.staged['hotels']
+            print(f"  ❌ Erreur LOAD DATA: {e}")
+            return 0
+        finally:
+            cursor.close()
+
+        self.stats = dict(self.staged, failed=0)
+        if self.on_commit:
+            self.on_commit(self.staged_keys)
+        return self.stats['hotels']
+
+
+# ============================================================================
+# SORTIES : BASE SQLITE ET INSTANTANÉ EN COLONNES (ARROW / PARQUET)
+# ============================================================================
+
+# Tables des sorties SQLite et instantané (photos avec l'URL en clair)
+PORTABLE_TABLES = tuple(table for table in TABLE_SCHEMAS if table not in PHOTO_URL_TABLES.values())
+
+# Types des colonnes de l'instantané (les autres colonnes sont des chaînes)
+SNAPSHOT_INT_COLUMNS = {
+    'id_hotel', 'id_chambre', 'nbre_etoile_hotel', 'nbre_avis_hotel', 'ordre_affichage',
+    'nbre_lit', 'nbre_adults_max', 'nbre_children_max', 'surface_m2', 'prix_nuit', 'delai_annulation_gratuite',
+    'equipements', 'nbre_avis'
+} | {column for column in TABLE_SCHEMAS['HOTEL_RECHERCHE'][0] if column.startswith('prix_')}
+SNAPSHOT_FLOAT_COLUMNS = {'note_moy_hotel', 'latitude', 'longitude', 'frais_annulation', 'note', 'somme_notes',
+                          'note_moyenne'}
+SNAPSHOT_BOOL_COLUMNS = set(TABLE_SCHEMAS['HOTEL_AMENITIES'][0][1:]) | {'remboursable', 'petit_dejeuner_inclus'}
+
+# Description de l'instantané, écrite en dernier (absente = instantané incomplet)
+SNAPSHOT_MANIFEST = 'manifest.json'
+
+# Index des tables dérivées dans la base SQLite (recherche par geohash, somme d'un séjour)
+SQLITE_INDEXES = {
+    'HOTEL_GEO': ('geohash',),
+    'TARIF_NUIT': ('id_chambre', 'nom_offre', 'date_nuit'),
+    'HOTEL_RECHERCHE': ('ville_hotel', 'nbre_etoile_hotel', 'prix_min'),
+}
+
+
+# Requêtes MySQL sans équivalent SQLite (attribution des identifiants côté client)
+SQLITE_IGNORED_STATEMENTS = ('ALTER TABLE', 'LOCK TABLES', 'UNLOCK TABLES', 'SHOW CREATE TABLE')
+
+
+class SqliteCursor:
+    """Curseur SQLite acceptant les requêtes MySQL des écrivains (mode 'insert')"""
+
+    def __init__(self, connection):
+        self.cursor = connection.db.cursor()
+        self.lastrowid = None
+        self.skipped = False
+
+    def execute(self, query, params=()):
+        """
+        Exécuter une requête (%s → ?, NOW() → CURRENT_TIMESTAMP)
+        Verrous et AUTO_INCREMENT ignorés (un seul écrivain) : fetchone() retourne alors None
+        """
+        self.skipped = query.startswith(SQLITE_IGNORED_STATEMENTS)
+        if self.skipped:
+            return
+        query = query.replace('%s', '?').replace('NOW()', 'CURRENT_TIMESTAMP')
+        try:
+            self.cursor.execute(query, params)
+        except sqlite3.Error as e:
+            raise Error(msg=str(e)) from e
+        self.lastrowid = self.cursor.lastrowid
+
+    def fetchone(self):
+        return None if self.skipped else self.cursor.fetchone()
+
+    def fetchall(self):
+        return [] if self.skipped else self.cursor.fetchall()
+
+    def close(self):
+        self.cursor.close()
+
+
+class SqliteConnection:
+    """
+    Connexion SQLite avec l'interface utilisée par les écrivains (cursor, commit,
+    rollback) : tables PORTABLE_TABLES créées d'après TABLE_SCHEMAS, erreurs
+    converties en Error
+    """
+
+    def __init__(self, path=None):
+        self.db = sqlite3.connect(SQLITE_PATH if path is None else path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode = WAL')
+        self.db.execute('PRAGMA synchronous = NORMAL')
+        for table in PORTABLE_TABLES:
+            columns, now_columns = TABLE_SCHEMAS[table]
+            primary_key = PRIMARY_KEYS.get(table, f"id_{table.lower()}")
+            self.db.execute(f"CREATE TABLE IF NOT EXISTS {table} ({primary_key} INTEGER PRIMARY KEY, "
+                            f"{', '.join(columns + now_columns)})")
+        for table, columns in SQLITE_INDEXES.items():
+            self.db.execute(f"CREATE INDEX IF NOT EXISTS idx_{table.lower()}_{columns[0]} "
+                            f"ON {table} ({', '.join(columns)})")
+
+    def cursor(self, *args, **kwargs):
+        return SqliteCursor(self)
+
+    def commit(self):
+        self.db.commit()
+
+    def rollback(self):
+        self.db.rollback()
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        self.db.close()
+
+
+def open_sink(sink=None, **options):
+    """
+    Ouvrir la sortie des données générées (OUTPUT_SINK par défaut), retourne la connexion
+    des écrivains : connexion MySQL, connexion SQLite, ou None pour un instantané (SnapshotWriter)
+    """
+    sink = OUTPUT_SINK if sink is None else sink
+    if sink == 'mysql':
+        return create_db_connection(**options)
+    if sink == 'sqlite':
+        if LOAD_MODE != 'insert':
+            raise ValueError("OUTPUT_SINK 'sqlite' : LOAD_MODE 'insert' requis")
+        print(f"✅ Base SQLite {SQLITE_PATH}")
+        return SqliteConnection(SQLITE_PATH)
+    if sink == 'snapshot':
+        return None
+    raise ValueError(f"Sortie inconnue : {sink!r} (attendu : 'mysql', 'sqlite' ou 'snapshot')")
+
+
+def snapshot_columns(table):
+    """Colonnes d'une table de l'instantané (clé primaire comprise pour HOTEL / CHAMBRE)"""
+    columns = TABLE_SCHEMAS[table][0]
+    return (PRIMARY_KEYS[table],) + columns if table in PRIMARY_KEYS else columns
+
+
+def snapshot_schema(pa, table):
+    """Schéma Arrow d'une table de l'instantané"""
+    fields = []
+    for column in snapshot_columns(table):
+        if column in SNAPSHOT_INT_COLUMNS:
+            column_type = pa.int64()
+        elif column in SNAPSHOT_FLOAT_COLUMNS:
+            column_type = pa.float64()
+        elif column in SNAPSHOT_BOOL_COLUMNS:
+            column_type = pa.bool_()
+        else:
+            column_type = pa.string()
+        fields.append(pa.field(column, column_type))
+    return pa.schema(fields)
+
+
+def snapshot_path(snapshot_dir, table, snapshot_format):
+    """Fichier d'une table de l'instantané (<TABLE>.arrow ou <TABLE>.parquet)"""
+    return os.path.join(snapshot_dir, f"{table}.{snapshot_format}")
+
+
+class SequentialIdAllocator:
+    """Identifiants consécutifs à partir de 1, sans base (même interface que IdAllocator)"""
+
+    def __init__(self):
+        self.next_id = 1
+        self.lock = threading.Lock()
+
+    def allocate(self, connection=None, count=1):
+        """Retourner le premier identifiant d'une plage contiguë de count identifiants"""
+        with self.lock:
+            first_id = self.next_id
+            self.next_id += count
+            return first_id
+
+
+class SnapshotWriter:
+    """
+    Instantané en colonnes : une table Arrow par table SQL (SNAPSHOT_DIR/<TABLE>.arrow
+    ou .parquet) + manifest.json, rechargeable sans régénérer (restore_snapshot)
+    - identifiants HOTEL / CHAMBRE attribués à partir de 1 (décalés au rechargement)
+    - un paquet de batch_size hôtels = un lot de lignes par table
+    Même interface que HotelBatchWriter (add / flush / finish / write_rows / stats)
+    """
+
+    def __init__(self, snapshot_dir=None, batch_size=SNAPSHOT_CHUNK_HOTELS, snapshot_format=None, photo_urls=None):
+        import pyarrow as pa
+
+        snapshot_dir = SNAPSHOT_DIR if snapshot_dir is None else snapshot_dir
+        snapshot_format = SNAPSHOT_FORMAT if snapshot_format is None else snapshot_format
+
+        if snapshot_format not in ('arrow', 'parquet'):
+            raise ValueError(f"Format d'instantané inconnu : {snapshot_format!r} (attendu : 'arrow' ou 'parquet')")
+        self.pa = pa
+        self.connection = None
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_format = snapshot_format
+        self.batch_size = max(1, batch_size)
+        self.pending = []
+        self.stats = {'hotels': 0, 'rooms': 0, 'offers': 0, 'reviews': 0, 'failed': 0}
+        self.on_commit = None
+        self.id_allocators = {table: SequentialIdAllocator() for table in PRIMARY_KEYS}
+        self.photo_urls = photo_urls or PhotoUrlRegistry(mode='inline')
+        self.keys = []
+        self.chunks = []
+        self.row_counts = {table: 0 for table in PORTABLE_TABLES}
+
+        os.makedirs(snapshot_dir, exist_ok=True)
+        # Ancien manifeste supprimé d'abord : un instantané interrompu reste incomplet
+        manifest_path = os.path.join(snapshot_dir, SNAPSHOT_MANIFEST)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        self.schemas = {table: snapshot_schema(pa, table) for table in PORTABLE_TABLES}
+        self.files = {table: self._open(table) for table in PORTABLE_TABLES}
+
+    def _open(self, table):
+        """Fichier de sortie d'une table"""
+        path = snapshot_path(self.snapshot_dir, table, self.snapshot_format)
+        if self.snapshot_format == 'parquet':
+            import pyarrow.parquet as pq
+            return pq.ParquetWriter(path, self.schemas[table], compression='zstd')
+        return self.pa.ipc.new_file(path, self.schemas[table])
+
+    def add(self, hotel_data):
+        """Ajouter un hôtel au paquet courant (écriture quand le paquet est plein)"""
+        self.pending.append(hotel_data)
+        if len(self.pending) >= self.batch_size:
+            return self.flush()
+        return 0
+
+    def flush(self):
+        """Écrire le paquet courant dans les fichiers de l'instantané"""
+        if not self.pending:
+            return 0
+
+        batch, self.pending = self.pending, []
+        room_count = sum(len(hotel_data.rooms) for hotel_data in batch)
+        rows = build_batch_rows(
+            batch,
+            self.id_allocators['HOTEL'].allocate(self.connection, len(batch)),
+            self.id_allocators['CHAMBRE'].allocate(self.connection, room_count)
+        )
+        return self.write_rows(rows, [(hotel_data.booking_id, hotel_data.city) for hotel_data in batch])
+
+    def write_rows(self, rows, keys):
+        """Écrire des lignes déjà construites ({table: [lignes]}, identifiants compris), colonne par colonne"""
+        rows = self.photo_urls.normalize(rows)
+        counts = {}
+        for table in PORTABLE_TABLES:
+            table_rows = rows.get(table, [])
+            counts[table] = len(table_rows)
+            if not table_rows:
+                continue
+            schema = self.schemas[table]
+            with METRICS.measure(f"snapshot.{table}", len(table_rows)):
+                arrays = [self.pa.array(values, type=field.type) for values, field in zip(zip(*table_rows), schema)]
+                self.files[table].write_table(self.pa.Table.from_arrays(arrays, schema=schema))
+            self.row_counts[table] += len(table_rows)
+
+        self.chunks.append(counts)
+        self.keys.extend(keys)
+        self.stats['hotels'] += counts['HOTEL']
+        self.stats['rooms'] += counts['CHAMBRE']
+        self.stats['offers'] += counts['OFFRE']
+        self.stats['reviews'] += counts['AVIS']
+        PROGRESS.advance(counts['HOTEL'])
+        return counts['HOTEL']
+
+    def finish(self):
+        """Fermer les fichiers et écrire le manifeste (instantané complet)"""
+        self.flush()
+        for snapshot_file in self.files.values():
+            snapshot_file.close()
+
+        manifest = {
+            'format': self.snapshot_format,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'generation_seed': GENERATION_SEED,
+            'generation_date': GENERATION_DATE,
+            'hotels': self.stats['hotels'],
+            'tables': {table: {'columns': list(snapshot_columns(table)), 'rows': self.row_counts[table]}
+                       for table in PORTABLE_TABLES},
+            'chunks': self.chunks,
+        }
+        with open(os.path.join(self.snapshot_dir, SNAPSHOT_MANIFEST), 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=1)
+
+        size = sum(os.path.getsize(snapshot_path(self.snapshot_dir, table, self.snapshot_format))
+                   for table in PORTABLE_TABLES)
+        print(f"\n📦 Instantané {self.snapshot_format} : {self.stats['hotels']} hôtels, "
+              f"{self.stats['offers']} offres dans {self.snapshot_dir} ({size / 1024 / 1024:.1f} Mo)")
+        if self.on_commit:
+            self.on_commit(self.keys)
+        return self.stats['hotels']
+
+
+def read_snapshot(snapshot_dir):
+    """Manifeste et tables Arrow d'un instantané (fichiers .arrow projetés en mémoire, sans copie)"""
+    import pyarrow as pa
+
+    manifest_path = os.path.join(snapshot_dir, SNAPSHOT_MANIFEST)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"Instantané absent ou incomplet : {manifest_path} introuvable")
+    with open(manifest_path, encoding='utf-8') as manifest_file:
+        manifest = json.load(manifest_file)
+
+    tables = {}
+    for table in manifest['tables']:
+        path = snapshot_path(snapshot_dir, table, manifest['format'])
+        if manifest['format'] == 'parquet':
+            import pyarrow.parquet as pq
+            tables[table] = pq.read_table(path)
+        else:
+            tables[table] = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    return manifest, tables
+
+
+def restore_snapshot(writer, snapshot_dir=None, journal=None):
+    """
+    Recharger un instantané paquet par paquet avec writer (write_rows : mode 'insert'
+    ou 'load_data'), sans régénérer. Les identifiants HOTEL / CHAMBRE sont décalés
+    sur des plages réservées par les allocateurs du writer (base non vide acceptée)
+    Avec un journal, les paquets déjà validés sont ignorés. Retourne writer.finish()
+    """
+    import pyarrow.compute as pc
+
+    if getattr(writer, 'id_allocators', None) is None or not hasattr(writer, 'write_rows'):
+        raise ValueError("Rechargement d'un instantané : identifiants côté client et mode 'insert' ou 'load_data' requis")
+
+    snapshot_dir = SNAPSHOT_DIR if snapshot_dir is None else snapshot_dir
+    manifest, tables = read_snapshot(snapshot_dir)
+    print(f"\n📦 Rechargement de l'instantané {snapshot_dir} ({manifest['format']}, "
+          f"{manifest['hotels']} hôtels, créé le {manifest['created_at']})")
+
+    offsets = dict.fromkeys(tables, 0)
+    for counts in manifest['chunks']:
+        chunk = {}
+        for table, table_data in tables.items():
+            chunk[table] = table_data.slice(offsets[table], counts[table])
+            offsets[table] += counts[table]
+        if not counts['HOTEL']:
+            continue
+
+        hotels = chunk['HOTEL']
+        keys = list(zip(hotels.column('hotel_id_api').to_pylist(), hotels.column('ville_hotel').to_pylist()))
+        if journal and all(journal.is_done(booking_id) for booking_id, _ in keys):
+            continue
+
+        # Identifiants consécutifs dans un paquet : un décalage par table parente
+        shifts = {'id_hotel': writer.id_allocators['HOTEL'].allocate(writer.connection, counts['HOTEL'])
+                              - hotels.column('id_hotel')[0].as_py()}
+        if counts['CHAMBRE']:
+            shifts['id_chambre'] = (writer.id_allocators['CHAMBRE'].allocate(writer.connection, counts['CHAMBRE'])
+                                    - chunk['CHAMBRE'].column('id_chambre')[0].as_py())
+
+        rows = {}
+        for table, table_data in chunk.items():
+            columns = []
+            for name, column in zip(table_data.column_names, table_data.columns):
+                if shifts.get(name):
+                    column = pc.add(column, shifts[name])
+                columns.append(column.to_pylist())
+            rows[table] = list(zip(*columns))
+        writer.write_rows(rows, keys)
+
+    return writer.finish()
+
+
+# ============================================================================
+# SESSION DE CHARGEMENT (CONTRAINTES ET INDEX DIFFÉRÉS)
+# ============================================================================
+
+def get_secondary_indexes(cursor, table):
+    """
+    Lister les index non primaires d'une table
+    Retourne [(nom, unique, type, [colonnes avec préfixe éventuel])]
+    """
+    cursor.execute(
+        """
+        SELECT INDEX_NAME, NON_UNIQUE, INDEX_TYPE, COLUMN_NAME, SUB_PART
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME <> 'PRIMARY'
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+        """,
+        (table,)
+    )
+
+    indexes = {}
+    for index_name, non_unique, index_type, column_name, sub_part in cursor.fetchall():
+        if index_name not in indexes:
+            indexes[index_name] = (index_name, not non_unique, index_type, [])
+        column = f"`{column_name}`({sub_part})" if sub_part else f"`{column_name}`"
+        indexes[index_name][3].append(column)
+    return list(indexes.values())
+
+
+def index_definition(index):
+    """Clause ADD ... INDEX pour recréer un index"""
+    index_name, unique, index_type, columns = index
+    kind = 'FULLTEXT INDEX' if index_type == 'FULLTEXT' else 'UNIQUE INDEX' if unique else 'INDEX'
+    return f"ADD {kind} `{index_name}` ({', '.join(columns)})"
+
+
+def drop_secondary_indexes(connection, tables):
+    """
+    Supprimer les index secondaires des tables, retourne {table: [index supprimés]}
+    Les index requis par une clé étrangère ne peuvent pas être supprimés : ils sont conservés
+    """
+    dropped = {}
+    cursor = connection.cursor()
+    try:
+        for table in tables:
+            for index in get_secondary_indexes(cursor, table):
+                try:
+                    cursor.execute(f"ALTER TABLE {table} DROP INDEX `{index[0]}`")
+                    dropped.setdefault(table, []).append(index)
+                except Error:
+                    pass  # Index utilisé par une clé étrangère
+    finally:
+        cursor.close()
+    return dropped
+
+
+def rebuild_secondary_indexes(connection, dropped):
+    """Recréer les index supprimés (un ALTER TABLE par table, FULLTEXT un par un)"""
+    cursor = connection.cursor()
+    try:
+        for table, indexes in dropped.items():
+            regular = [index_definition(index) for index in indexes if index[2] != 'FULLTEXT']
+            fulltext = [index_definition(index) for index in indexes if index[2] == 'FULLTEXT']
+            statements = [f"ALTER TABLE {table} {', '.join(regular)}"] if regular else []
+            # InnoDB ne crée qu'un index FULLTEXT par ALTER TABLE
+            statements += [f"ALTER TABLE {table} {clause}" for clause in fulltext]
+
+            for statement in statements:
+                start = time.perf_counter()
+                try:
+                    cursor.execute(statement)
+                    print(f"  🔧 {table}: index reconstruits en {time.perf_counter() - start:.2f}s")
+                except Error as e:
+                    print(f"  ❌ Reconstruction impossible, à exécuter à la main : {statement}; ({e})")
+    finally:
+        cursor.close()
+
+
+def analyze_tables(connection, tables):
+    """Mettre à jour les statistiques de l'optimiseur après le chargement"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"ANALYZE TABLE {', '.join(tables)}")
+        cursor.fetchall()
+        print(f"  📈 ANALYZE TABLE {', '.join(tables)}")
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def bulk_load_session(connection, drop_indexes=None, index_tables=None, analyze=True):
+    """
+    Session de chargement en masse : désactive FOREIGN_KEY_CHECKS et UNIQUE_CHECKS,
+    supprime éventuellement les index secondaires, puis restaure tout en sortie
+    (y compris sur KeyboardInterrupt ou erreur) et lance ANALYZE TABLE
+    En sortie, le lot en cours est d'abord annulé : ALTER TABLE et ANALYZE TABLE
+    valident implicitement la transaction ouverte (lot partiel hors du journal)
+    """
+    drop_indexes = DROP_SECONDARY_INDEXES if drop_indexes is None else drop_indexes
+    index_tables = DEFERRED_INDEX_TABLES if index_tables is None else index_tables
+    cursor = connection.cursor()
+    cursor.execute("SELECT @@SESSION.foreign_key_checks, @@SESSION.unique_checks")
+    foreign_key_checks, unique_checks = cursor.fetchone()
+    cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+    cursor.close()
+    if analyze:
+        print("⚡ Session de chargement : contrôles FK/unicité désactivés")
+
+    dropped = {}
+    failed = False
+    try:
+        if drop_indexes:
+            dropped = drop_secondary_indexes(connection, index_tables)
+            count = sum(len(indexes) for indexes in dropped.values())
+            print(f"⚡ {count} index secondaires supprimés pendant le chargement")
+        yield connection
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        if connection.is_connected():
+            connection.rollback()
+            if failed:
+                print("\n⚠️  Chargement interrompu : lot en cours annulé, ANALYZE TABLE non lancé")
+            elif analyze:
+                print("\n🔧 Restauration de la session de chargement...")
+            rebuild_secondary_indexes(connection, dropped)
+            cursor = connection.cursor()
+            cursor.execute(
+                "SET SESSION foreign_key_checks = %s, unique_checks = %s",
+                (foreign_key_checks, unique_checks)
+            )
+            cursor.close()
+            if analyze and not failed:
+                analyze_tables(connection, active_tables())
+        elif dropped:
+            print("  ❌ Connexion perdue : index à recréer à la main :")
+            for table, indexes in dropped.items():
+                for index in indexes:
+                    print(f"     ALTER TABLE {table} {index_definition(index)};")
+
+
+# ============================================================================
+# JOURNAL DE PROGRESSION (REPRISE APRÈS INTERRUPTION)
+# ============================================================================
+
+def run_config(destinations, snapshot_dir=None):
+    """
+    Configuration d'une exécution, enregistrée dans le journal : seule une exécution
+    de même configuration (sortie, base ou fichier cible, source, destinations,
+    graine et date) peut être reprise
+    """
+    if OUTPUT_SINK == 'mysql':
+        target = f"{DB_CONFIG['host']}:{DB_CONFIG.get('port', 3306)}/{DB_CONFIG['database']}"
+    else:
+        target = os.path.abspath(SQLITE_PATH)
+    return {
+        'sink': OUTPUT_SINK,
+        'target': target,
+        'source': os.path.abspath(snapshot_dir) if snapshot_dir else GENERATION_MODE,
+        'destinations': [[dest['name'], dest['target_hotels']] for dest in destinations],
+        'seed': GENERATION_SEED,
+        'date': GENERATION_DATE,
+    }
+
+
+class ProgressJournal:
+    """
+    Journal local (SQLite) des hôtels validés en base, par exécution
+    Une exécution non terminée (Ctrl+C, erreur fatale) peut être reprise avec la
+    même configuration (run_config) : les hôtels déjà journalisés sont ignorés, les
+    destinations complètes ne sont pas régénérées. Partageable entre threads
+    """
+
+    def __init__(self, path=None):
+        self.db = sqlite3.connect(JOURNAL_PATH if path is None else path, check_same_thread=False,
+                                  isolation_level=None)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = FULL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " started_at TEXT NOT NULL,"
+            " finished_at TEXT,"
+            " config TEXT)"
+        )
+        # Journal créé avant l'enregistrement de la configuration : ses exécutions ne sont pas reprises
+        if 'config' not in [column[1] for column in self.db.execute("PRAGMA table_info(runs)")]:
+            self.db.execute("ALTER TABLE runs ADD COLUMN config TEXT")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS committed_hotels ("
+            " run_id INTEGER NOT NULL,"
+            " booking_id TEXT NOT NULL,"
+            " destination TEXT NOT NULL,"
+            " committed_at TEXT NOT NULL,"
+            " PRIMARY KEY (run_id, booking_id))"
+        )
+        self.lock = threading.Lock()
+        self.run_id = None
+        self.done = set()
+        self.per_destination = {}
+
+    def start(self, config, resume=False):
+        """
+        Démarrer une exécution, ou reprendre la dernière non terminée de même configuration
+        Retourne True si reprise. ValueError si resume=True et que seules des exécutions
+        d'une autre configuration sont en cours (reprise refusée)
+        """
+        encoded = json.dumps(config, sort_keys=True, ensure_ascii=False)
+        row = None
+        if resume:
+            unfinished = self.db.execute(
+                "SELECT id, config FROM runs WHERE finished_at IS NULL AND config IS NOT NULL ORDER BY id DESC"
+            ).fetchall()
+            row = next((run for run in unfinished if run[1] == encoded), None)
+            if row is None and unfinished:
+                run_id, other = unfinished[0]
+                other = json.loads(other)
+                differences = [f"{key} : {other.get(key)!r} → {value!r}" for key, value in config.items()
+                               if other.get(key) != value]
+                raise ValueError(f"l'exécution interrompue n°{run_id} a une autre configuration "
+                                 f"({'; '.join(differences)})")
+
+        if row:
+            self.run_id = row[0]
+            for booking_id, destination in self.db.execute(
+                "SELECT booking_id, destination FROM committed_hotels WHERE run_id = ?", (self.run_id,)
+            ):
+                self.done.add(booking_id)
+                self.per_destination[destination] = self.per_destination.get(destination, 0) + 1
+            return True
+
+        cursor = self.db.execute("INSERT INTO runs (started_at, config) VALUES (?, ?)",
+                                 (datetime.now().isoformat(), encoded))
+        self.run_id = cursor.lastrowid
+        return False
+
+    def record(self, keys):
+        """Journaliser des hôtels validés en base : [(booking_id, destination)]"""
+        now = datetime.now().isoformat()
+        with self.lock:
+            self.db.execute("BEGIN")
+            self.db.executemany(
+                "INSERT OR IGNORE INTO committed_hotels (run_id, booking_id, destination, committed_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(self.run_id, booking_id, destination, now) for booking_id, destination in keys]
+            )
+            self.db.execute("COMMIT")
+            for booking_id, destination in keys:
+                if booking_id not in self.done:
+                    self.done.add(booking_id)
+                    self.per_destination[destination] = self.per_destination.get(destination, 0) + 1
+
+    def is_done(self, booking_id):
+        """Hôtel déjà validé en base dans cette exécution ?"""
+        return booking_id in self.done
+
+    def destination_done(self, destination):
+        """Tous les hôtels de la destination sont-ils déjà validés ?"""
+        return self.per_destination.get(destination['name'], 0) >= destination['target_hotels']
+
+    def finish(self):
+        """Marquer l'exécution comme terminée (plus de reprise possible)"""
+        self.db.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (datetime.now().isoformat(), self.run_id))
+
+    def close(self):
+        self.db.close()
+
+
+# ============================================================================
+# PIPELINE GÉNÉRATION → ÉCRITURE
+# ============================================================================
+
+# Marqueur de fin de flux dans la file
+_END_OF_STREAM = object()
+
+
+def iter_destinations_hotels(destinations, search_pages=None, journal=None, seed=None, processes=1):
+    """
+    Générateur : hôtels de toutes les destinations, à la suite
+    Avec un journal, les destinations complètes et les hôtels déjà validés sont ignorés
+    Chaque destination a son propre générateur aléatoire (destination_rng) ; avec
+    processes > 1, les destinations sont générées en parallèle dans des processus
+    et produites dans l'ordre de la liste
+    """
+    search_pages = search_pages or {}
+    remaining = []
+    for dest in destinations:
+        if journal and journal.destination_done(dest):
+            print(f"\n⏭️  {dest['name']} déjà chargée, ignorée")
+            continue
+        remaining.append(dest)
+
+    if processes > 1:
+        tasks = (((dest, search_pages.get(dest['name']), seed), dest) for dest in remaining)
+        shards = map_shards(generate_destination_shard, tasks, processes)
+    else:
+        shards = ((iter_booking_hotels(dest, search_pages.get(dest['name']), destination_rng(dest, seed)), dest)
+                  for dest in remaining)
+
+    for hotels, dest in shards:
+        print_destination_header(dest)
+        for hotel in hotels:
+            if journal and journal.is_done(hotel.booking_id):
+                continue
+            yield hotel
+
+
+def stream_to_writer(hotels, writer, queue_size=PIPELINE_QUEUE_SIZE):
+    """
+    Producteur/consommateur : un thread parcourt le générateur d'hôtels et remplit
+    une file bornée, le thread appelant écrit les hôtels au fil de l'eau
+    File pleine = producteur en attente (contre-pression), au plus queue_size
+    hôtels + un lot en mémoire. Retourne writer.finish()
+    """
+    hotel_queue = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+    errors = []
+
+    def produce():
+        try:
             for hotel in hotels:
-                if insert_hotel_to_db(connection, hotel):
-                    total_hotels += 1
-                    total_rooms += len(hotel['rooms'])
-                    total_offers += sum(len(room['offers']) for room in hotel['rooms'])
-                    total_reviews += len(hotel['reviews'])
+                while not stop.is_set():
+                    try:
+                        hotel_queue.put(hotel, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            if not stop.is_set():
+                hotel_queue.put(_END_OF_STREAM)
+
+    producer = threading.Thread(target=produce, name='hotel-producer', daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            hotel = hotel_queue.get()
+            if hotel is _END_OF_STREAM:
+                break
+            writer.add(hotel)
+    finally:
+        # Interruption côté écriture : débloquer et arrêter le producteur
+        stop.set()
+        producer.join(timeout=1)
+
+    if errors:
+        raise errors[0]
+    return writer.finish()
+
+
+def write_destinations(writer, destinations, search_pages=None, journal=None):
+    """Générer les destinations selon GENERATION_MODE et les écrire, retourne writer.finish()"""
+    if GENERATION_MODE == 'vectorized':
+        tasks = iter_catalog_tasks(writer, destinations, journal, GENERATION_SEED)
+        for rows, keys in map_shards(generate_catalog_shard, tasks, GENERATION_PROCESSES):
+            writer.write_rows(rows, keys)
+        return writer.finish()
+
+    hotels = iter_destinations_hotels(destinations, search_pages, journal, GENERATION_SEED, GENERATION_PROCESSES)
+    return stream_to_writer(hotels, writer)
+
+
+def create_writer(connection, id_allocators=None, staging_dir=STAGING_DIR, photo_urls=None, client_ids=None):
+    """
+    Créer l'écrivain correspondant à OUTPUT_SINK et LOAD_MODE
+    client_ids : identifiants côté client en mode 'insert' (CLIENT_SIDE_IDS par défaut,
+    toujours en mode 'vectorized')
+    """
+    if OUTPUT_SINK == 'snapshot':
+        return SnapshotWriter(SNAPSHOT_DIR, SNAPSHOT_CHUNK_HOTELS, SNAPSHOT_FORMAT, photo_urls)
+    if LOAD_MODE == 'load_data':
+        return BulkLoadWriter(connection, BATCH_SIZE, staging_dir, id_allocators, photo_urls)
+    if LOAD_MODE == 'upsert':
+        return IncrementalHotelWriter(connection, BATCH_SIZE, id_allocators, photo_urls)
+    if client_ids is None:
+        client_ids = CLIENT_SIDE_IDS or GENERATION_MODE == 'vectorized'
+    return HotelBatchWriter(connection, BATCH_SIZE, client_ids, id_allocators, photo_urls)
+
+
+def print_destination_header(dest):
+    """Afficher l'en-tête d'une destination"""
+    print(f"\n{'='*80}")
+    print(f"🌍 DESTINATION: {dest['name']}, {dest['country']}")
+    print(f"{'='*80}")
+
+
+def load_destination_worker(pool, dest, id_allocators, search_pages=None, journal=None, photo_urls=None):
+    """
+    Worker : générer et insérer les hôtels d'une destination avec sa propre
+    connexion du pool (transactions propres au worker), retourne ses statistiques
+    """
+    connection = pool.get_connection()
+    try:
+        session = bulk_load_session(connection, drop_indexes=False, analyze=False) if BULK_SESSION else nullcontext()
+        with session:
+            # Un dossier de staging par destination en mode 'load_data'
+            staging_dir = os.path.join(STAGING_DIR, re.sub(r'\W+', '_', dest['name'].lower()))
+            writer = create_writer(connection, id_allocators, staging_dir, photo_urls)
+            if journal:
+                writer.on_commit = journal.record
+            write_destinations(writer, [dest], search_pages, journal)
+        return writer.stats
+    finally:
+        connection.close()  # Retour de la connexion au pool
+
+
+def run_destination_workers(pool, destinations, workers=WORKERS, search_pages=None, journal=None,
+                            photo_urls=None):
+    """Traiter les destinations en parallèle, retourne les statistiques cumulées"""
+    totals = {'hotels': 0, 'rooms': 0, 'offers': 0, 'reviews': 0, 'failed': 0}
+    id_allocators = create_id_allocators()
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    try:
+        futures = {executor.submit(load_destination_worker, pool, dest, id_allocators, search_pages, journal,
+                                   photo_urls): dest
+                   for dest in destinations}
+        for future in as_completed(futures):
+            dest = futures[future]
+            try:
+                stats = future.result()
+            except Error as e:
+                # Hôtels de la destination comptés en échec (la reprise ne recharge que les non journalisés)
+                totals['failed'] += dest['target_hotels']
+                print(f"  ❌ Erreur pour {dest['name']}: {e}")
+                continue
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+            print(f"  🏁 {dest['name']} terminé : {stats['hotels']} hôtels, {stats['offers']} offres")
+    finally:
+        # Sur interruption : les destinations non démarrées sont annulées
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return totals
+
+
+# ============================================================================
+# FONCTION PRINCIPALE
+# ============================================================================
+
+def main(resume=False, metrics_json=METRICS_JSON_PATH, metrics_prometheus=METRICS_PROMETHEUS_PATH,
+         snapshot_dir=None, destinations=None):
+    """
+    Fonction principale du script (resume=True : reprendre la dernière exécution interrompue)
+    metrics_json / metrics_prometheus : fichiers des temps par étape écrits en fin d'exécution
+    snapshot_dir : recharger cet instantané dans OUTPUT_SINK au lieu de générer les hôtels
+    destinations : villes à charger (DESTINATIONS par défaut)
+    Retourne le code de sortie : 0, ou 1 si des lots ont échoué ou si le chargement a été interrompu
+    """
+    destinations = DESTINATIONS if destinations is None else destinations
+    target = sum(dest['target_hotels'] for dest in destinations)
+    print("=" * 80)
+    print(f"🏨 SCRAPING BOOKING.COM - RÉCUPÉRATION DE {target} HÔTELS")
+    print("=" * 80)
+    print(f"\n📍 Destinations cibles: {len(destinations)} villes")
+    print(f"🎯 Objectif: ~{target} hôtels au total\n")
+    
+    # Mise à jour incrémentale : sans graine ni date fixes, tous les hôtels changent
+    # d'empreinte à chaque exécution et tout le catalogue est réécrit
+    if LOAD_MODE == 'upsert' and OUTPUT_SINK == 'mysql' and (GENERATION_SEED is None or GENERATION_DATE is None):
+        print("⚠️  LOAD_MODE 'upsert' sans GENERATION_SEED et GENERATION_DATE fixes (--seed, --date) :")
+        print("   les données générées changent à chaque exécution, tous les hôtels seront réécrits\n")
+    
+    # Journal de progression : reprise des hôtels déjà validés en base. Pas de journal pour
+    # un instantané, réécrit en entier à chaque exécution
+    journal = None
+    if OUTPUT_SINK == 'snapshot':
+        if resume:
+            print("⚠️  Instantané : pas de reprise possible, génération complète\n")
+    else:
+        journal = ProgressJournal()
+        try:
+            resumed = journal.start(run_config(destinations, snapshot_dir), resume)
+        except ValueError as e:
+            journal.close()
+            print(f"❌ Reprise impossible : {e}")
+            print("   Relance avec les mêmes options, ou sans --resume pour un nouveau chargement")
+            return 1
+        if resumed:
+            print(f"♻️  Reprise de l'exécution n°{journal.run_id} : {len(journal.done)} hôtels déjà chargés")
+        elif resume:
+            print("♻️  Aucune exécution interrompue à reprendre, nouveau chargement")
+    
+    # Connexion à la base de données (pool MySQL si plusieurs workers), None pour un instantané
+    options = {'allow_local_infile': True} if LOAD_MODE == 'load_data' else {}
+    pool = None
+    if WORKERS > 1 and OUTPUT_SINK == 'mysql' and not snapshot_dir:
+        pool = create_connection_pool(max(POOL_SIZE, WORKERS + 1), **options)
+        connection = pool.get_connection()
+    else:
+        connection = open_sink(OUTPUT_SINK, **options)
+    
+    # Tables dérivées (geohash, calendrier des tarifs) puis contraintes et index différés
+    # pendant le chargement (restaurés en sortie), MySQL uniquement
+    if OUTPUT_SINK == 'mysql':
+        create_derived_tables(connection)
+    session = bulk_load_session(connection) if BULK_SESSION and OUTPUT_SINK == 'mysql' else nullcontext()
+    http_cache = None
+    
+    try:
+        # Pages de recherche téléchargées en parallèle (connexions keep-alive)
+        search_pages = {}
+        if FETCH_SEARCH_PAGES and not snapshot_dir:
+            http_cache = HttpCache() if HTTP_CACHE_ENABLED else None
+            search_pages = fetch_search_pages(destinations, http_cache)
+        
+        # URLs des photos (dictionnaire PHOTO_URL en mode 'dictionary', MySQL uniquement),
+        # commun aux workers
+        photo_urls = PhotoUrlRegistry(connection, PHOTO_URL_MODE if OUTPUT_SINK == 'mysql' else 'inline')
+        
+        with session:
+            if pool:
+                print(f"⚙️  {WORKERS} workers en parallèle")
+                totals = run_destination_workers(pool, destinations, WORKERS, search_pages, journal, photo_urls)
+            else:
+                writer = create_writer(connection, photo_urls=photo_urls, client_ids=True if snapshot_dir else None)
+                if journal:
+                    writer.on_commit = journal.record
                 
-                # Petit délai entre les insertions
-                random_delay(0.5, 1)
+                if snapshot_dir:
+                    # Instantané rechargé paquet par paquet, sans génération
+                    restore_snapshot(writer, snapshot_dir, journal)
+                else:
+                    # Générer les hôtels de chaque destination et les insérer au fil de l'eau
+                    # (le dernier lot incomplet et LOAD DATA sont traités en fin de flux)
+                    write_destinations(writer, destinations, search_pages, journal)
+                totals = writer.stats
+        
+        # Lots en erreur : l'exécution reste ouverte, --resume recharge les hôtels non journalisés
+        failed = totals.get('failed', 0)
+        if journal and not failed:
+            journal.finish()
         
         # Résumé final
         print("\n" + "="*80)
-        print("✅ SCRAPING TERMINÉ AVEC SUCCÈS !")
+        print("⚠️  SCRAPING TERMINÉ AVEC DES ERREURS" if failed else "✅ SCRAPING TERMINÉ AVEC SUCCÈS !")
         print("="*80)
         print(f"\n📊 STATISTIQUES:")
-        print(f"  • Hôtels insérés: {total_hotels}")
-        print(f"  • Chambres créées: {total_rooms}")
-        print(f"  • Offres générées: {total_offers}")
-        print(f"  • Avis ajoutés: {total_reviews}")
-        print(f"\n🎉 La base de données est maintenant remplie !")
-        print(f"🌐 Accède à Adminer pour voir les données: http://localhost/adminer\n")
+        print(f"  • Hôtels insérés: {totals['hotels']}")
+        print(f"  • Chambres créées: {totals['rooms']}")
+        print(f"  • Offres générées: {totals['offers']}")
+        print(f"  • Avis ajoutés: {totals['reviews']}")
+        print(f"  • URLs de photos: {len(photo_urls.seen)} distinctes pour {photo_urls.references} photos"
+              + (" (dictionnaire PHOTO_URL)" if photo_urls.mode == 'dictionary' else ""))
+        if 'skipped' in totals:
+            print(f"  • Hôtels mis à jour: {totals['updated']} (inchangés ignorés: {totals['skipped']})")
+        if http_cache:
+            print(f"  • Cache HTTP: {http_cache.stats['hits']} hits, {http_cache.stats['misses']} miss, "
+                  f"{http_cache.stats['revalidated']} revalidées, {http_cache.stats['evicted']} évincées")
+        METRICS.print_table()
+        if failed:
+            print(f"\n❌ {failed} hôtels non écrits (lots en erreur)")
+            if journal:
+                print("   Relance avec --resume (mêmes options) pour les recharger\n")
+            return 1
+        if OUTPUT_SINK == 'snapshot':
+            print(f"\n🎉 Instantané écrit dans {SNAPSHOT_DIR} (à recharger avec --restore-snapshot)\n")
+        elif OUTPUT_SINK == 'sqlite':
+            print(f"\n🎉 La base SQLite {SQLITE_PATH} est maintenant remplie !\n")
+        else:
+            print(f"\n🎉 La base de données est maintenant remplie !")
+            print(f"🌐 Accède à Adminer pour voir les données: http://localhost/adminer\n")
+        return 0
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Scraping interrompu par l'utilisateur")
+        if journal:
+            print("   Relance avec --resume (mêmes options) pour reprendre là où le chargement s'est arrêté")
+        return 1
     except Exception as e:
         print(f"\n\n❌ Erreur fatale: {e}")
+        if journal:
+            print("   Relance avec --resume (mêmes options) pour reprendre là où le chargement s'est arrêté")
+        return 1
     finally:
-        if connection.is_connected():
+        # Mesures écrites même après une interruption (diagnostic)
+        if metrics_json:
+            METRICS.write_json(metrics_json)
+            print(f"⏱️  Rapport des étapes : {metrics_json}")
+        if metrics_prometheus:
+            METRICS.write_prometheus(metrics_prometheus)
+            print(f"⏱️  Mesures Prometheus : {metrics_prometheus}")
+        if journal:
+            journal.close()
+        if connection is not None and connection.is_connected():
             connection.close()
-            print("🔌 Connexion MySQL fermée\n")
+            print("🔌 Connexion MySQL fermée\n" if OUTPUT_SINK == 'mysql' else "🔌 Base SQLite fermée\n")
+
+
+# ============================================================================
+# LIGNE DE COMMANDE
+# ============================================================================
+# Sous-commandes :
+#   load     : chargement complet (pages de recherche si FETCH_SEARCH_PAGES, reprise, instantané à recharger)
+#   generate : génération hors ligne vers MySQL ou SQLite, sans téléchargement
+#   export   : génération hors ligne vers un instantané en colonnes (Arrow / Parquet)
+#   bench    : benchmark de la génération et du chargement (bench_seed.py)
+# Sans sous-commande : load (ancienne ligne de commande)
+
+COMMANDS = ('load', 'generate', 'export', 'bench')
+
+
+def parse_dsn(dsn):
+    """'mysql://utilisateur:motdepasse@hôte:port/base' → options de connexion (complètent DB_CONFIG)"""
+    from urllib.parse import unquote
+
+    parts = urlsplit(dsn)
+    if parts.scheme not in ('mysql', 'mariadb'):
+        raise ValueError(f"DSN invalide : {dsn!r} (attendu : mysql://utilisateur:motdepasse@hôte:port/base)")
+    config = {'host': parts.hostname or DB_CONFIG['host']}
+    if parts.port:
+        config['port'] = parts.port
+    if parts.username:
+        config['user'] = unquote(parts.username)
+    if parts.password is not None:
+        config['password'] = unquote(parts.password)
+    if parts.path.strip('/'):
+        config['database'] = parts.path.strip('/')
+    return config
+
+
+def date_option(text):
+    """Valeur de --date : 'AAAA-MM-JJ' (format de GENERATION_DATE)"""
+    try:
+        datetime.strptime(text, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"date invalide : {text!r} (attendu : AAAA-MM-JJ)")
+    return text
+
+
+def select_destinations(names=None, hotels=None):
+    """Villes de DESTINATIONS choisies par leur nom (toutes par défaut), hotels : hôtels par ville"""
+    destinations = DESTINATIONS
+    if names:
+        by_name = {dest['name'].lower(): dest for dest in DESTINATIONS}
+        unknown = [name for name in names if name.lower() not in by_name]
+        if unknown:
+            raise ValueError(f"Destination(s) inconnue(s) : {', '.join(unknown)} "
+                             f"(attendu : {', '.join(dest['name'] for dest in DESTINATIONS)})")
+        destinations = [by_name[name.lower()] for name in names]
+    if hotels is not None:
+        destinations = [dict(dest, target_hotels=hotels) for dest in destinations]
+    return destinations
+
+
+def build_parser():
+    """Analyseur de la ligne de commande (options communes + une sous-commande par usage)"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--destinations', nargs='+', metavar='VILLE',
+                        help="Villes à charger (noms de DESTINATIONS, toutes par défaut)")
+    common.add_argument('--hotels', type=int, metavar='N', help="Hôtels par ville (target_hotels de DESTINATIONS)")
+    common.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Hôtels par lot d'insertion (BATCH_SIZE)")
+    common.add_argument('--log-level', choices=('quiet', 'progress', 'verbose'), default=LOG_LEVEL,
+                        help="Affichage : résumé seul, progression périodique ou une ligne par hôtel")
+    common.add_argument('--metrics-json', default=METRICS_JSON_PATH,
+                        help="Fichier du rapport JSON des temps par étape")
+    common.add_argument('--metrics-prometheus', default=METRICS_PROMETHEUS_PATH,
+                        help="Fichier des mesures au format texte Prometheus")
+    common.add_argument('--profile', metavar='FICHIER', nargs='?', const=PROFILE_PATH,
+                        help="Profiler l'exécution (cProfile, imports faits pendant l'exécution)")
+
+    database = argparse.ArgumentParser(add_help=False)
+    database.add_argument('--db', metavar='DSN', help="Base MySQL : mysql://utilisateur:motdepasse@hôte:port/base")
+    database.add_argument('--sqlite-path', default=SQLITE_PATH, help="Fichier SQLite (--sink sqlite)")
+    database.add_argument('--resume', action='store_true',
+                          help="Reprendre la dernière exécution interrompue (journal de progression)")
+
+    seeding = argparse.ArgumentParser(add_help=False)
+    seeding.add_argument('--seed', type=int, default=GENERATION_SEED, help="Graine de génération (GENERATION_SEED)")
+    seeding.add_argument('--date', type=date_option, default=GENERATION_DATE, metavar='AAAA-MM-JJ',
+                         help="Date de référence des avis et du calendrier des tarifs (GENERATION_DATE), "
+                              "à fixer avec --seed pour un jeu reproductible (requis par LOAD_MODE 'upsert')")
+
+    generation = argparse.ArgumentParser(add_help=False)
+    generation.add_argument('--mode', choices=('standard', 'vectorized'), default=GENERATION_MODE,
+                            help="Mode de génération (GENERATION_MODE)")
+    generation.add_argument('--processes', type=int, default=GENERATION_PROCESSES,
+                            help="Processus de génération (GENERATION_PROCESSES)")
+
+    parser = argparse.ArgumentParser(description="Remplissage de la base hotel_booking")
+    commands = parser.add_subparsers(dest='command', metavar='COMMANDE')
+
+    load = commands.add_parser('load', parents=[common, database, seeding], help="Chargement complet (commande par défaut)")
+    load.add_argument('--sink', choices=('mysql', 'sqlite', 'snapshot'), default=OUTPUT_SINK,
+                      help="Sortie des données : MySQL, fichier SQLite ou instantané en colonnes")
+    load.add_argument('--restore-snapshot', metavar='DOSSIER', nargs='?', const=SNAPSHOT_DIR,
+                      help="Recharger un instantané (SNAPSHOT_DIR par défaut) au lieu de générer les hôtels")
+
+    generate = commands.add_parser('generate', parents=[common, database, seeding, generation],
+                                   help="Génération hors ligne vers MySQL ou SQLite (sans téléchargement)")
+    generate.add_argument('--sink', choices=('mysql', 'sqlite'),
+                          default='mysql' if OUTPUT_SINK == 'snapshot' else OUTPUT_SINK,
+                          help="Sortie des données : MySQL ou fichier SQLite")
+
+    export = commands.add_parser('export', parents=[common, seeding, generation],
+                                 help="Génération hors ligne vers un instantané en colonnes")
+    export.add_argument('--snapshot-dir', default=SNAPSHOT_DIR, help="Dossier de l'instantané")
+    export.add_argument('--format', choices=('arrow', 'parquet'), default=SNAPSHOT_FORMAT,
+                        help="Format de l'instantané (SNAPSHOT_FORMAT)")
+
+    bench = commands.add_parser('bench', add_help=False,
+                                help="Benchmark (options de bench_seed.py, voir bench --help)")
+    bench.add_argument('--profile', metavar='FICHIER', nargs='?', const=PROFILE_PATH,
+                       help="Profiler l'exécution (cProfile)")
+    return parser
+
+
+def apply_options(args):
+    """Reporter les options de la ligne de commande dans la configuration du module"""
+    global OUTPUT_SINK, BATCH_SIZE, SQLITE_PATH, SNAPSHOT_DIR, SNAPSHOT_FORMAT
+    global GENERATION_SEED, GENERATION_DATE, GENERATION_MODE, GENERATION_PROCESSES, FETCH_SEARCH_PAGES
+
+    PROGRESS.level = args.log_level
+    BATCH_SIZE = args.batch_size
+    if getattr(args, 'db', None):
+        DB_CONFIG.update(args.db)
+    if hasattr(args, 'sqlite_path'):
+        SQLITE_PATH = args.sqlite_path
+    if hasattr(args, 'seed'):
+        GENERATION_SEED, GENERATION_DATE = args.seed, args.date
+    if hasattr(args, 'mode'):
+        GENERATION_MODE, GENERATION_PROCESSES = args.mode, args.processes
+        FETCH_SEARCH_PAGES = False
+    if args.command == 'export':
+        OUTPUT_SINK, SNAPSHOT_DIR, SNAPSHOT_FORMAT = 'snapshot', args.snapshot_dir, args.format
+    else:
+        OUTPUT_SINK = args.sink
+
+
+def run_command(args, extra=()):
+    """Exécuter la sous-commande"""
+    if args.command == 'bench':
+        import bench_seed
+        return bench_seed.main(list(extra))
+
+    apply_options(args)
+    return main(resume=getattr(args, 'resume', False), metrics_json=args.metrics_json,
+                metrics_prometheus=args.metrics_prometheus, snapshot_dir=getattr(args, 'restore_snapshot', None),
+                destinations=args.destinations)
+
+
+def profile_run(function, path, top=PROFILE_TOP):
+    """
+    Exécuter function() sous cProfile : profil écrit dans path, fonctions les plus
+    coûteuses et modules lourds importés pendant l'exécution affichés
+    (imports au démarrage du script : python -X importtime scrape_booking_hotels.py ...)
+    """
+    import cProfile
+    import pstats
+
+    loaded = set(sys.modules)
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(function)
+    finally:
+        profiler.dump_stats(path)
+        stats = pstats.Stats(profiler)
+        import_seconds = sum(cumulative for (_, _, name), (_, _, _, cumulative, _) in stats.stats.items()
+                             if name == '_find_and_load')
+        imported = [module for module in LAZY_MODULES if module in sys.modules and module not in loaded]
+        print(f"\n🔬 PROFIL ({stats.total_tt:.2f}s, {import_seconds:.2f}s d'imports pendant l'exécution"
+              f"{' : ' + ', '.join(imported) if imported else ''}) : {path}")
+        stats.sort_stats('cumulative').print_stats(top)
+
+
+def cli(argv=None):
+    """Point d'entrée de la ligne de commande, retourne le code de sortie"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in COMMANDS + ('-h', '--help'):
+        argv = ['load'] + argv
+
+    parser = build_parser()
+    # Options inconnues : transmises à bench_seed.py pour bench, erreur sinon
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command != 'bench':
+        parser.error(f"arguments inconnus : {' '.join(extra)}")
+    if args.command != 'bench':
+        try:
+            args.destinations = select_destinations(args.destinations, args.hotels)
+            if getattr(args, 'db', None):
+                args.db = parse_dsn(args.db)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if not args.profile:
+        return run_command(args, extra)
+    return profile_run(lambda: run_command(args, extra), args.profile)
 
 
 # ============================================================================
@@ -620,4 +3648,4 @@ def main():
 # ============================================================================
 
 if __name__ == "__main__":
-    main()
+    sys.exit(cli())
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Configuration commune des tests : modules du dépôt importables, serveur HTTP local"""
+
+import gzip
+import http.server
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+class LocalServer:
+    """
+    Serveur HTTP local (thread) pour les tests de téléchargement
+    responses[chemin] : liste de (statut, en-têtes, corps) servis dans l'ordre, le
+    dernier étant répété. requests : (chemin, en-têtes) de chaque requête reçue
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.requests = []
+        self.delay = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with server.lock:
+                    server.requests.append((self.path, dict(self.headers)))
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                    queue = server.responses.get(self.path.split('?')[0], [(404, {}, '')])
+                    status, headers, body = queue.pop(0) if len(queue) > 1 else queue[0]
+                time.sleep(server.delay)
+                payload = body.encode('utf-8')
+                if headers.get('Content-Encoding') == 'gzip':
+                    payload = gzip.compress(payload)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with server.lock:
+                    server.active -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def requests_to(self, path):
+        return [headers for request_path, headers in self.requests if request_path.split('?')[0] == path]
+
+
+@pytest.fixture
+def local_server():
+    server = LocalServer()
+    thread = threading.Thread(target=server.httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
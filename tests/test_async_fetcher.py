@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Téléchargement asynchrone : nouvelles tentatives, erreurs, décompression, concurrence par hôte"""
+
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+
+import scrape_booking_hotels as seed
+
+
+def fetcher(**options):
+    """Fetcher sans attente : débit illimité, backoff minimal"""
+    options.setdefault('limiter', seed.RateLimiter(rate=10000, burst=1000, jitter=0))
+    options.setdefault('backoff', 0.001)
+    return seed.AsyncPageFetcher(**options)
+
+
+def fetch_all(urls, **options):
+    async def run():
+        async with fetcher(**options) as page_fetcher:
+            return await page_fetcher.fetch_all(urls)
+
+    return asyncio.run(run())
+
+
+def test_retries_transient_errors(local_server):
+    local_server.responses['/page'] = [(503, {}, ''), (429, {'Retry-After': '0'}, ''), (200, {}, '<html>ok</html>')]
+    url = local_server.url + '/page'
+
+    assert fetch_all([url], retries=3) == {url: '<html>ok</html>'}
+    assert len(local_server.requests_to('/page')) == 3
+
+
+def test_gives_up_after_max_retries(local_server):
+    local_server.responses['/page'] = [(503, {}, '')]
+    url = local_server.url + '/page'
+
+    result = fetch_all([url], retries=2)[url]
+    assert isinstance(result, aiohttp.ClientResponseError) and result.status == 503
+    assert len(local_server.requests_to('/page')) == 3
+
+
+def test_client_error_is_not_retried(local_server):
+    url = local_server.url + '/missing'
+
+    result = fetch_all([url], retries=3)[url]
+    assert isinstance(result, aiohttp.ClientResponseError) and result.status == 404
+    assert len(local_server.requests_to('/missing')) == 1
+
+
+def test_gzip_body_is_decoded(local_server):
+    local_server.responses['/page'] = [(200, {'Content-Encoding': 'gzip', 'Content-Type': 'text/html; charset=utf-8'},
+                                        '<html>Hôtel compressé</html>')]
+    url = local_server.url + '/page'
+
+    assert fetch_all([url]) == {url: '<html>Hôtel compressé</html>'}
+    assert 'gzip' in local_server.requests_to('/page')[0]['Accept-Encoding']
+
+
+def test_concurrency_is_bounded_per_host(local_server):
+    local_server.responses['/page'] = [(200, {}, 'ok')]
+    local_server.delay = 0.05
+    urls = [f"{local_server.url}/page?n={n}" for n in range(8)]
+
+    results = fetch_all(urls, per_host=2)
+    assert list(results.values()) == ['ok'] * 8
+    assert local_server.max_active <= 2
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Analyse des pages de résultats : les trois moteurs donnent le même résultat"""
+
+import os
+
+import pytest
+
+import booking_parser
+
+PAGE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'fixtures', 'searchresults_paris.html')
+
+# Carte sans lien, sans étoiles ni prix, note au format anglais
+INCOMPLETE_PAGE = """
+<div data-testid="property-card">
+  <div data-testid="title">  Hôtel   sans&nbsp;lien </div>
+  <div data-testid="review-score"><div>8.5</div><div>Very good</div><div>1,234 reviews</div></div>
+</div>
+"""
+
+
+@pytest.fixture(scope='module')
+def page():
+    with open(PAGE_PATH, encoding='utf-8') as page_file:
+        return page_file.read()
+
+
+def backend_param(backend):
+    """Moteur à tester, ignoré s'il n'est pas installé"""
+    module = booking_parser._MODULES[backend]
+    return pytest.param(backend, marks=pytest.mark.skipif(
+        backend not in booking_parser.available_backends(), reason=f"{module} non installé"))
+
+
+BACKENDS = [backend_param(backend) for backend in booking_parser.BACKENDS]
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_backends_parse_fixture_identically(page, backend):
+    reference = booking_parser.parse_search_page(page, 'Paris', 'France', backend='bs4')
+    assert booking_parser.parse_search_page(page, 'Paris', 'France', backend=backend) == reference
+
+
+def test_fixture_fields(page):
+    hotels = booking_parser.parse_search_page(page, 'Paris', 'France')
+    assert len(hotels) == 25
+    assert len({hotel['booking_id'] for hotel in hotels}) == 25
+    assert hotels[0] == {
+        'booking_id': 'booking_hotel-le-marais',
+        'name': 'Hôtel Le Marais',
+        'city': 'Paris',
+        'country': 'France',
+        'stars': 4,
+        'rating': 9.6,
+        'review_count': 3484,
+        'price': 761,
+        'latitude': 48.811429,
+        'longitude': 2.397178,
+    }
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_missing_fields_are_none(backend):
+    hotels = booking_parser.parse_search_page(INCOMPLETE_PAGE, 'Lyon', 'France', backend=backend)
+    assert hotels == [{
+        'booking_id': 'booking_lyon_1',
+        'name': 'Hôtel sans lien',
+        'city': 'Lyon',
+        'country': 'France',
+        'stars': None,
+        'rating': 8.5,
+        'review_count': 1234,
+        'price': None,
+        'latitude': None,
+        'longitude': None,
+    }]
+
+
+def test_default_backend_is_fastest_available():
+    assert booking_parser.default_backend() == (booking_parser.available_backends() or ['bs4'])[0]
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Génération répartie : --processes 1 et N produisent exactement la même sortie"""
+
+import json
+import os
+import sqlite3
+
+import pytest
+
+import scrape_booking_hotels as seed
+
+DESTINATIONS = [dict(dest, target_hotels=5) for dest in seed.DESTINATIONS[:3]]
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """Génération hors ligne, graine et date fixées"""
+    monkeypatch.setattr(seed, 'JOURNAL_PATH', str(tmp_path / 'journal.sqlite3'))
+    monkeypatch.setattr(seed, 'GENERATION_SEED', 11)
+    monkeypatch.setattr(seed, 'GENERATION_DATE', '2025-01-01')
+    monkeypatch.setattr(seed, 'FETCH_SEARCH_PAGES', False)
+    monkeypatch.setattr(seed.PROGRESS, 'level', 'quiet')
+    return tmp_path
+
+
+def generate(monkeypatch, tmp_path, sink, mode, processes):
+    """Lancer une génération, retourne le chemin de la sortie"""
+    output = str(tmp_path / f'{sink}-{mode}-{processes}')
+    monkeypatch.setattr(seed, 'OUTPUT_SINK', sink)
+    monkeypatch.setattr(seed, 'GENERATION_MODE', mode)
+    monkeypatch.setattr(seed, 'GENERATION_PROCESSES', processes)
+    monkeypatch.setattr(seed, 'SQLITE_PATH', output + '.sqlite3')
+    monkeypatch.setattr(seed, 'SNAPSHOT_DIR', output)
+    assert seed.main(destinations=DESTINATIONS) == 0
+    return output
+
+
+def sqlite_dump(path):
+    """Contenu de la base, sans les colonnes remplies par NOW() au chargement"""
+    with sqlite3.connect(path) as db:
+        for table, (_, now_columns) in seed.TABLE_SCHEMAS.items():
+            for column in now_columns:
+                db.execute(f'UPDATE "{table}" SET "{column}" = NULL')
+        return list(db.iterdump())
+
+
+def snapshot_files(path):
+    """Octets de chaque fichier de l'instantané, manifeste sans sa date de création"""
+    files = {}
+    for name in sorted(os.listdir(path)):
+        with open(os.path.join(path, name), 'rb') as f:
+            files[name] = f.read()
+    manifest = json.loads(files.pop(seed.SNAPSHOT_MANIFEST))
+    manifest.pop('created_at')
+    return files, manifest
+
+
+@pytest.mark.parametrize('mode', ['standard', 'vectorized'])
+def test_sqlite_output_does_not_depend_on_processes(offline, monkeypatch, mode):
+    single = generate(monkeypatch, offline, 'sqlite', mode, 1)
+    parallel = generate(monkeypatch, offline, 'sqlite', mode, 2)
+
+    dump = sqlite_dump(single + '.sqlite3')
+    assert any(line.startswith('INSERT INTO "HOTEL"') for line in dump)
+    assert sqlite_dump(parallel + '.sqlite3') == dump
+
+
+@pytest.mark.parametrize('mode', ['standard', 'vectorized'])
+def test_snapshot_does_not_depend_on_processes(offline, monkeypatch, mode):
+    pytest.importorskip('pyarrow')
+    single = generate(monkeypatch, offline, 'snapshot', mode, 1)
+    parallel = generate(monkeypatch, offline, 'snapshot', mode, 2)
+
+    files, manifest = snapshot_files(single)
+    assert 'HOTEL.arrow' in files
+    assert snapshot_files(parallel) == (files, manifest)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""Geohash et GeoIndex comparés à un parcours complet (haversine)"""
+
+import random
+
+import pytest
+
+import scrape_booking_hotels as seed
+from geo_index import (GeoIndex, find_hotels_near, geohash_bbox, geohash_encode, geohash_encode_array,
+                       haversine_km, in_bbox)
+
+
+def random_points(count, rng, center=None, spread=None):
+    """[(clé, latitude, longitude)] autour de center, ou sur tout le globe"""
+    points = []
+    for key in range(count):
+        if center is None:
+            latitude, longitude = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        else:
+            latitude = max(-90.0, min(90.0, center[0] + rng.uniform(-spread, spread)))
+            longitude = (center[1] + rng.uniform(-spread, spread) + 540.0) % 360.0 - 180.0
+        points.append((key, latitude, longitude))
+    return points
+
+
+def build_index(points):
+    index = GeoIndex()
+    for key, latitude, longitude in points:
+        index.add(key, latitude, longitude)
+    return index
+
+
+def test_geohash_reference_value():
+    assert geohash_encode(57.64911, 10.40744, 11) == 'u4pruydqqvj'
+    assert geohash_encode(48.8566, 2.3522, 5) == 'u09tv'
+
+
+@pytest.mark.parametrize('precision', [1, 5, 9, 12])
+def test_geohash_cell_contains_point(precision):
+    rng = random.Random(precision)
+    for _, latitude, longitude in random_points(200, rng) + [(0, 90.0, 180.0), (0, -90.0, -180.0)]:
+        min_lat, min_lon, max_lat, max_lon = geohash_bbox(geohash_encode(latitude, longitude, precision))
+        assert min_lat <= latitude <= max_lat
+        assert min_lon <= longitude <= max_lon
+
+
+@pytest.mark.parametrize('precision', [1, 7, 9, 12])
+def test_geohash_array_matches_scalar(precision):
+    pytest.importorskip('numpy')
+    points = random_points(500, random.Random(precision)) + [(0, 90.0, 180.0), (0, -90.0, -180.0)]
+    latitudes = [latitude for _, latitude, _ in points]
+    longitudes = [longitude for _, _, longitude in points]
+
+    assert geohash_encode_array(latitudes, longitudes, precision) == [
+        geohash_encode(latitude, longitude, precision) for latitude, longitude in zip(latitudes, longitudes)]
+
+
+@pytest.mark.parametrize('center, spread, radius_km', [
+    ((48.8566, 2.3522), 0.2, 5),        # Paris
+    ((-17.6509, -149.4260), 0.5, 30),   # Tahiti
+    ((0.0, 179.9), 0.5, 40),            # Antiméridien
+    ((89.9, 0.0), 0.5, 60),             # Pôle Nord dans le cercle
+    (None, None, 1500),                 # Tout le globe
+])
+def test_within_radius_matches_brute_force(center, spread, radius_km):
+    rng = random.Random(radius_km)
+    points = random_points(2000, rng, center, spread)
+    index = build_index(points)
+    latitude, longitude = center or (rng.uniform(-60, 60), rng.uniform(-180, 180))
+
+    expected = sorted((haversine_km(latitude, longitude, point_lat, point_lon), key)
+                      for key, point_lat, point_lon in points
+                      if haversine_km(latitude, longitude, point_lat, point_lon) <= radius_km)
+    assert expected
+    assert index.within_radius(latitude, longitude, radius_km) == expected
+    assert index.within_radius(latitude, longitude, radius_km, limit=3) == expected[:3]
+
+
+@pytest.mark.parametrize('bbox', [
+    (48.80, 2.25, 48.90, 2.45),
+    (-0.3, 179.8, 0.3, -179.8),         # Antiméridien : min_lon > max_lon
+])
+def test_within_bbox_matches_brute_force(bbox):
+    center = ((bbox[0] + bbox[2]) / 2, bbox[1] + 0.1)
+    points = random_points(2000, random.Random(1), center, 0.5)
+    index = build_index(points)
+
+    expected = sorted(key for key, latitude, longitude in points if in_bbox(latitude, longitude, *bbox))
+    assert expected
+    assert sorted(index.within_bbox(*bbox)) == expected
+
+
+def test_loaded_hotels_are_found_near_their_destination(tmp_path, monkeypatch):
+    """Coordonnées par destination, HOTEL_GEO en base, recherche SQL et index identiques"""
+    monkeypatch.setattr(seed.PROGRESS, 'level', 'quiet')
+    destinations = [dict(dest, target_hotels=10) for dest in seed.DESTINATIONS[:2]]
+    connection = seed.SqliteConnection(str(tmp_path / 'hotels.sqlite3'))
+    try:
+        writer = seed.HotelBatchWriter(connection, 8, True)
+        for dest in destinations:
+            for hotel in seed.iter_booking_hotels(dest, rng=random.Random(5)):
+                writer.add(hotel)
+        writer.finish()
+
+        index = GeoIndex.from_connection(connection)
+        assert len(index) == 20
+        for dest in destinations:
+            near = index.within_radius(dest['latitude'], dest['longitude'], dest['radius_km'] * 1.5)
+            assert len(near) == 10
+            assert find_hotels_near(connection, dest['latitude'], dest['longitude'], dest['radius_km'] * 1.5) == near
+    finally:
+        connection.close()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Cache disque des pages : hit, revalidation 304, éviction LRU, écritures atomiques"""
+
+import asyncio
+import os
+
+import pytest
+
+import scrape_booking_hotels as seed
+
+
+def fetch(url, cache):
+    async def run():
+        limiter = seed.RateLimiter(rate=10000, burst=1000, jitter=0)
+        async with seed.AsyncPageFetcher(limiter=limiter, backoff=0.001, cache=cache) as fetcher:
+            return await fetcher.fetch(url)
+
+    return asyncio.run(run())
+
+
+def test_fresh_page_is_served_without_request(local_server, tmp_path):
+    pytest.importorskip('aiohttp')
+    local_server.responses['/page'] = [(200, {'ETag': '"v1"'}, '<html>v1</html>')]
+    url = local_server.url + '/page'
+    cache = seed.HttpCache(str(tmp_path))
+
+    assert fetch(url, cache) == '<html>v1</html>'
+    assert fetch(url, cache) == '<html>v1</html>'
+    assert len(local_server.requests_to('/page')) == 1
+    assert (cache.stats['misses'], cache.stats['stored'], cache.stats['hits']) == (1, 1, 1)
+
+
+def test_stale_page_is_revalidated_with_etag(local_server, tmp_path):
+    pytest.importorskip('aiohttp')
+    local_server.responses['/page'] = [(200, {'ETag': '"v1"', 'Last-Modified': 'Mon, 06 Jan 2025 10:00:00 GMT'},
+                                        '<html>v1</html>'),
+                                       (304, {}, '')]
+    url = local_server.url + '/page'
+    fetch(url, seed.HttpCache(str(tmp_path)))
+
+    cache = seed.HttpCache(str(tmp_path), ttl=0)
+    assert fetch(url, cache) == '<html>v1</html>'
+    revalidation = local_server.requests_to('/page')[1]
+    assert revalidation['If-None-Match'] == '"v1"'
+    assert revalidation['If-Modified-Since'] == 'Mon, 06 Jan 2025 10:00:00 GMT'
+    assert (cache.stats['stale'], cache.stats['revalidated'], cache.stats['stored']) == (1, 1, 0)
+
+    # Page de nouveau fraîche après le 304
+    body, _, fresh = seed.HttpCache(str(tmp_path)).lookup(url)
+    assert (body, fresh) == ('<html>v1</html>', True)
+
+
+def test_changed_page_replaces_cached_copy(local_server, tmp_path):
+    pytest.importorskip('aiohttp')
+    local_server.responses['/page'] = [(200, {'ETag': '"v1"'}, '<html>v1</html>'), (200, {'ETag': '"v2"'}, '<html>v2</html>')]
+    url = local_server.url + '/page'
+    fetch(url, seed.HttpCache(str(tmp_path)))
+
+    assert fetch(url, seed.HttpCache(str(tmp_path), ttl=0)) == '<html>v2</html>'
+    body, meta, _ = seed.HttpCache(str(tmp_path)).lookup(url)
+    assert (body, meta['etag']) == ('<html>v2</html>', '"v2"')
+
+
+def test_cache_key_ignores_parameter_order_and_fragment(tmp_path):
+    cache = seed.HttpCache(str(tmp_path))
+    cache.store('HTTP://Example.com/search?b=2&a=1#top', 'page', {})
+
+    body, _, fresh = cache.lookup('http://example.com/search?a=1&b=2')
+    assert (body, fresh) == ('page', True)
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path):
+    cache = seed.HttpCache(str(tmp_path), max_bytes=10 ** 6)
+    for name in ('a', 'b', 'c'):
+        cache.store(f"http://example.com/{name}", name * 1000, {})
+    for name, mtime in (('a', 1000), ('b', 2000), ('c', 3000)):
+        os.utime(cache._paths(f"http://example.com/{name}")[0], (mtime, mtime))
+    cache.lookup('http://example.com/a')  # 'a' redevient la plus récente
+
+    cache.max_bytes = cache.total_bytes - 1
+    cache.store('http://example.com/d', 'd' * 10, {})
+
+    assert cache.stats['evicted'] == 1
+    assert cache.lookup('http://example.com/b')[0] is None
+    for name in ('a', 'c'):
+        assert cache.lookup(f"http://example.com/{name}")[0] == name * 1000
+    assert cache.total_bytes <= cache.max_bytes
+    assert cache.total_bytes == sum(entry.stat().st_size for entry in os.scandir(tmp_path))
+
+
+@pytest.mark.parametrize('step', ['body', 'meta'])
+def test_interrupted_store_leaves_a_miss(tmp_path, monkeypatch, step):
+    cache = seed.HttpCache(str(tmp_path))
+    url = 'http://example.com/page'
+    cache.store(url, 'old', {'ETag': '"1"'})
+
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    # Interruption pendant l'écriture de la page (renommage) ou de la méta (JSON)
+    if step == 'body':
+        monkeypatch.setattr(seed.os, 'replace', interrupted)
+    else:
+        monkeypatch.setattr(seed.json, 'dump', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        cache.store(url, 'new', {'ETag': '"2"'})
+    monkeypatch.undo()
+
+    assert cache.lookup(url) == (None, None, False)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
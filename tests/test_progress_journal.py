@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Journal de progression : reprise après interruption ou lot en erreur, configuration vérifiée"""
+
+import sqlite3
+
+import pytest
+
+import scrape_booking_hotels as seed
+
+DESTINATIONS = [dict(dest, target_hotels=6) for dest in seed.DESTINATIONS[:2]]
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """Chargement hors ligne vers SQLite, journal dans tmp_path"""
+    monkeypatch.setattr(seed, 'OUTPUT_SINK', 'sqlite')
+    monkeypatch.setattr(seed, 'SQLITE_PATH', str(tmp_path / 'hotels.sqlite3'))
+    monkeypatch.setattr(seed, 'SNAPSHOT_DIR', str(tmp_path / 'snapshot'))
+    monkeypatch.setattr(seed, 'JOURNAL_PATH', str(tmp_path / 'journal.sqlite3'))
+    monkeypatch.setattr(seed, 'GENERATION_SEED', 7)
+    monkeypatch.setattr(seed, 'GENERATION_DATE', '2025-01-01')
+    monkeypatch.setattr(seed, 'FETCH_SEARCH_PAGES', False)
+    monkeypatch.setattr(seed, 'BATCH_SIZE', 4)
+    monkeypatch.setattr(seed.PROGRESS, 'level', 'quiet')
+    return tmp_path
+
+
+def hotel_ids(path):
+    with sqlite3.connect(path) as db:
+        return [row[0] for row in db.execute("SELECT hotel_id_api FROM HOTEL ORDER BY hotel_id_api")]
+
+
+def runs(path):
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT id, finished_at IS NOT NULL FROM runs ORDER BY id").fetchall()
+
+
+def fail_on_flush(monkeypatch, number, exception):
+    """Faire échouer le number-ième lot de HotelBatchWriter"""
+    flush = seed.HotelBatchWriter.flush
+    calls = []
+
+    def failing_flush(self):
+        calls.append(1)
+        if len(calls) == number:
+            if exception is KeyboardInterrupt:
+                raise KeyboardInterrupt
+            self.pending = []
+            self.stats['failed'] += seed.BATCH_SIZE
+            return 0
+        return flush(self)
+
+    monkeypatch.setattr(seed.HotelBatchWriter, 'flush', failing_flush)
+
+
+def test_interrupted_run_resumes_without_duplicates(offline, monkeypatch):
+    flush = seed.HotelBatchWriter.flush
+    fail_on_flush(monkeypatch, 2, KeyboardInterrupt)
+    assert seed.main(destinations=DESTINATIONS) == 1
+    assert len(hotel_ids(seed.SQLITE_PATH)) == 4
+    assert runs(seed.JOURNAL_PATH) == [(1, 0)]
+
+    monkeypatch.setattr(seed.HotelBatchWriter, 'flush', flush)
+    assert seed.main(resume=True, destinations=DESTINATIONS) == 0
+    ids = hotel_ids(seed.SQLITE_PATH)
+    assert len(ids) == len(set(ids)) == 12
+    assert runs(seed.JOURNAL_PATH) == [(1, 1)]
+
+
+def test_failed_batch_keeps_run_open_until_resumed(offline, monkeypatch):
+    flush = seed.HotelBatchWriter.flush
+    fail_on_flush(monkeypatch, 2, seed.Error)
+    assert seed.main(destinations=DESTINATIONS) == 1
+    assert len(hotel_ids(seed.SQLITE_PATH)) == 8
+    assert runs(seed.JOURNAL_PATH) == [(1, 0)]
+
+    monkeypatch.setattr(seed.HotelBatchWriter, 'flush', flush)
+    assert seed.main(resume=True, destinations=DESTINATIONS) == 0
+    assert len(set(hotel_ids(seed.SQLITE_PATH))) == 12
+    assert runs(seed.JOURNAL_PATH) == [(1, 1)]
+
+
+@pytest.mark.parametrize('option, value', [
+    ('SQLITE_PATH', 'other.sqlite3'),
+    ('GENERATION_SEED', 8),
+    ('GENERATION_DATE', '2025-02-01'),
+])
+def test_resume_with_other_configuration_is_refused(offline, monkeypatch, option, value):
+    fail_on_flush(monkeypatch, 2, KeyboardInterrupt)
+    assert seed.main(destinations=DESTINATIONS) == 1
+
+    if option == 'SQLITE_PATH':
+        value = str(offline / value)
+    monkeypatch.setattr(seed, option, value)
+    assert seed.main(resume=True, destinations=DESTINATIONS) == 1
+    assert runs(seed.JOURNAL_PATH) == [(1, 0)]
+    if option == 'SQLITE_PATH':
+        assert not (offline / 'other.sqlite3').exists()
+
+
+def test_resume_with_other_destinations_is_refused(offline, monkeypatch):
+    fail_on_flush(monkeypatch, 2, KeyboardInterrupt)
+    assert seed.main(destinations=DESTINATIONS) == 1
+    assert seed.main(resume=True, destinations=DESTINATIONS[:1]) == 1
+
+
+def test_snapshot_output_does_not_use_the_journal(offline, monkeypatch):
+    pytest.importorskip('pyarrow')
+    monkeypatch.setattr(seed, 'OUTPUT_SINK', 'snapshot')
+
+    assert seed.main(resume=True, destinations=DESTINATIONS) == 0
+    assert not (offline / 'journal.sqlite3').exists()
+
+
+def test_runs_of_a_journal_without_configuration_are_not_resumed(offline):
+    with sqlite3.connect(seed.JOURNAL_PATH) as db:
+        db.execute("CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, started_at TEXT NOT NULL, "
+                   "finished_at TEXT)")
+        db.execute("INSERT INTO runs (started_at) VALUES ('2025-01-01T00:00:00')")
+
+    journal = seed.ProgressJournal()
+    try:
+        assert journal.start(seed.run_config(DESTINATIONS), resume=True) is False
+        assert journal.run_id == 2
+    finally:
+        journal.close()
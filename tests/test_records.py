@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Enregistrements : champs dans l'ordre des colonnes de TABLE_SCHEMAS"""
+
+import random
+
+import pytest
+
+import scrape_booking_hotels as seed
+
+DESTINATION = seed.DESTINATIONS[0]
+# Tables remplies à l'écriture (PhotoUrlRegistry), absentes des lots générés
+BATCH_TABLES = set(seed.TABLE_SCHEMAS) - set(seed.PHOTO_URL_TABLES.values())
+
+
+def row_width(table):
+    """Nombre de valeurs d'une ligne du lot : colonnes, plus la clé primaire éventuelle"""
+    return len(seed.TABLE_SCHEMAS[table][0]) + (table in seed.PRIMARY_KEYS)
+
+
+@pytest.fixture
+def hotels(monkeypatch):
+    monkeypatch.setattr(seed.PROGRESS, 'level', 'quiet')
+    monkeypatch.setattr(seed, 'RATE_CALENDAR_DAYS', 3)
+    return list(seed.iter_booking_hotels(dict(DESTINATION, target_hotels=4), rng=random.Random(3)))
+
+
+@pytest.mark.parametrize('record, table, linked_columns', [
+    (seed.Hotel, 'HOTEL', 0),
+    (seed.Amenities, 'HOTEL_AMENITIES', 1),
+    (seed.Room, 'CHAMBRE', 1),
+    (seed.Offer, 'OFFRE', 2),
+    (seed.Review, 'AVIS', 1),
+])
+def test_record_fields_match_table_columns(record, table, linked_columns):
+    columns = seed.TABLE_SCHEMAS[table][0][linked_columns:]
+    column_count = {seed.Hotel: seed.HOTEL_COLUMN_COUNT, seed.Room: seed.ROOM_COLUMN_COUNT}
+    assert column_count.get(record, len(record._fields)) == len(columns)
+
+
+def test_generated_hotels_are_records(hotels):
+    hotel = hotels[0]
+    assert isinstance(hotel, seed.Hotel)
+    assert isinstance(hotel.amenities, seed.Amenities)
+    assert all(isinstance(room, seed.Room) for room in hotel.rooms)
+    assert all(isinstance(offer, seed.Offer) for room in hotel.rooms for offer in room.offers)
+    assert all(isinstance(review, seed.Review) for review in hotel.reviews)
+
+
+def test_batch_rows_are_record_slices(hotels):
+    rows = seed.build_batch_rows(hotels, 10, 100)
+    hotel = hotels[0]
+
+    assert rows['HOTEL'][0] == (10,) + tuple(hotel[:seed.HOTEL_COLUMN_COUNT])
+    assert rows['HOTEL'][0][seed.HOTEL_CITY_INDEX] == hotel.city
+    assert rows['HOTEL_AMENITIES'][0] == (10,) + tuple(hotel.amenities)
+    assert rows['CHAMBRE'][0] == (100, 10) + tuple(hotel.rooms[0][:seed.ROOM_COLUMN_COUNT])
+    assert rows['OFFRE'][0] == (10, 100) + tuple(hotel.rooms[0].offers[0])
+    assert rows['AVIS'][0] == (10,) + tuple(hotel.reviews[0])
+    assert rows['AVIS'][0][seed.REVIEW_NOTE_INDEX] == hotel.reviews[0].rating
+
+
+def test_batch_rows_match_table_widths(hotels):
+    rows = seed.build_batch_rows(hotels, 1, 1)
+    for table in BATCH_TABLES:
+        table_rows = rows[table]
+        assert table_rows, table
+        assert {len(row) for row in table_rows} == {row_width(table)}, table
+
+
+def test_vectorized_rows_match_table_widths(monkeypatch):
+    np = pytest.importorskip('numpy')
+    monkeypatch.setattr(seed, 'RATE_CALENDAR_DAYS', 3)
+    rows = seed.generate_catalog_batch(DESTINATION, 0, 4, 1, 1, np.random.default_rng(3))
+
+    assert set(rows) == BATCH_TABLES
+    for table, table_rows in rows.items():
+        assert table_rows, table
+        assert {len(row) for row in table_rows} == {row_width(table)}, table
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""HOTEL_RECHERCHE : masque d'équipements, prix par pension et agrégats d'avis"""
+
+import random
+
+import pytest
+
+import scrape_booking_hotels as seed
+
+SUMMARY_COLUMNS = seed.TABLE_SCHEMAS['HOTEL_RECHERCHE'][0]
+
+
+def summary(row):
+    return dict(zip(SUMMARY_COLUMNS, row))
+
+
+def hotel_row(hotel_id, city, stars):
+    row = [None] * (1 + len(seed.TABLE_SCHEMAS['HOTEL'][0]))
+    row[0], row[seed.HOTEL_CITY_INDEX], row[seed.HOTEL_STARS_INDEX] = hotel_id, city, stars
+    return tuple(row)
+
+
+def offer_row(hotel_id, offer_type, base_price):
+    return (hotel_id, 10 * hotel_id) + seed.make_offer(offer_type, base_price)
+
+
+def review_row(hotel_id, note):
+    return (hotel_id,) + seed.Review('user', note, 'titre', 'commentaire', '2025-01-01', 'FR', 'solo', 'fr')
+
+
+def test_amenity_bits_follow_the_amenity_columns():
+    columns = seed.TABLE_SCHEMAS['HOTEL_AMENITIES'][0][1:]
+    assert list(seed.AMENITY_BITS) == list(columns)
+    assert sorted(seed.AMENITY_BITS.values()) == [1 << idx for idx in range(12)]
+    assert seed.amenity_mask() == 0
+    assert seed.amenity_mask('wi_fi', 'piscine') == 544
+    assert seed.amenity_mask('wi_fi', 'wi_fi') == seed.AMENITY_BITS['wi_fi']
+    with pytest.raises(KeyError):
+        seed.amenity_mask('sauna')
+
+
+def test_summary_of_a_hand_made_batch():
+    wifi_pool = dict.fromkeys(seed.AMENITY_BITS, False)
+    wifi_pool.update(wi_fi=True, piscine=True)
+    rows = {
+        'HOTEL': [hotel_row(1, 'Paris', 4), hotel_row(2, 'Lyon', 3)],
+        'HOTEL_AMENITIES': [(1,) + tuple(wifi_pool.values()), (2,) + (False,) * 12],
+        'OFFRE': [offer_row(1, 'flexible', 100), offer_row(1, 'flexible', 140),
+                  offer_row(1, 'breakfast', 100), offer_row(1, 'half_board', 200)],
+        'AVIS': [review_row(1, 8.0), review_row(1, 9.5), review_row(1, 7.0)],
+    }
+    first, second = map(summary, seed.build_summary_rows(rows))
+
+    flexible = seed.OFFER_MULTIPLIERS['flexible']
+    breakfast = round(100 * seed.OFFER_MULTIPLIERS['breakfast'])
+    half_board = round(200 * seed.OFFER_MULTIPLIERS['half_board'])
+    assert first['id_hotel'] == 1 and first['ville_hotel'] == 'Paris' and first['nbre_etoile_hotel'] == 4
+    assert first['equipements'] == seed.amenity_mask('wi_fi', 'piscine')
+    assert (first['prix_min_sans_repas'], first['prix_max_sans_repas']) == (round(100 * flexible),
+                                                                           round(140 * flexible))
+    assert first['prix_min_petit_dejeuner'] == first['prix_max_petit_dejeuner'] == breakfast
+    assert first['prix_min_demi_pension'] == first['prix_max_demi_pension'] == half_board
+    assert first['prix_min_pension_complete'] is None and first['prix_max_pension_complete'] is None
+    assert first['prix_min'] == min(round(100 * flexible), breakfast)
+    assert first['prix_max'] == half_board
+    assert (first['nbre_avis'], first['somme_notes'], first['note_moyenne']) == (3, 24.5, 8.17)
+
+    # Hôtel sans équipement, offre ni avis
+    assert second['equipements'] == 0
+    assert second['prix_min'] is None and second['prix_max'] is None
+    assert (second['nbre_avis'], second['somme_notes'], second['note_moyenne']) == (0, 0.0, None)
+
+
+def test_kept_reviews_are_added_to_written_reviews():
+    rows = {'HOTEL': [hotel_row(1, 'Paris', 4), hotel_row(2, 'Lyon', 3)],
+            'AVIS': [review_row(1, 9.0)]}
+    first, second = map(summary, seed.build_summary_rows(rows, kept_reviews={1: (2, 15.0), 2: (1, 6.5)}))
+
+    assert (first['nbre_avis'], first['somme_notes'], first['note_moyenne']) == (3, 24.0, 8.0)
+    assert (second['nbre_avis'], second['somme_notes'], second['note_moyenne']) == (1, 6.5, 6.5)
+
+
+def test_summary_matches_loaded_tables(tmp_path, monkeypatch):
+    """Agrégats de HOTEL_RECHERCHE = GROUP BY sur HOTEL_AMENITIES, OFFRE et AVIS en base"""
+    monkeypatch.setattr(seed.PROGRESS, 'level', 'quiet')
+    connection = seed.SqliteConnection(str(tmp_path / 'hotels.sqlite3'))
+    try:
+        writer = seed.HotelBatchWriter(connection, 4, True)
+        for hotel in seed.iter_booking_hotels(dict(seed.DESTINATIONS[0], target_hotels=10), rng=random.Random(9)):
+            writer.add(hotel)
+        writer.finish()
+        db = connection.db
+
+        summaries = {row[0]: summary(row) for row in db.execute(
+            f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM HOTEL_RECHERCHE")}
+        assert len(summaries) == 10
+
+        for hotel_id, count, total in db.execute(
+                "SELECT h.id_hotel, COUNT(a.id_hotel), COALESCE(SUM(a.note), 0) "
+                "FROM HOTEL h LEFT JOIN AVIS a ON a.id_hotel = h.id_hotel GROUP BY h.id_hotel"):
+            assert summaries[hotel_id]['nbre_avis'] == count
+            assert summaries[hotel_id]['somme_notes'] == pytest.approx(total)
+            if count:
+                assert summaries[hotel_id]['note_moyenne'] == pytest.approx(total / count, abs=0.005)
+
+        for hotel_id, board, low, high in db.execute(
+                "SELECT id_hotel, pension, MIN(prix_nuit), MAX(prix_nuit) FROM OFFRE GROUP BY id_hotel, pension"):
+            suffix = seed.BOARD_COLUMNS[board]
+            assert summaries[hotel_id][f'prix_min_{suffix}'] == low
+            assert summaries[hotel_id][f'prix_max_{suffix}'] == high
+
+        # Filtre par masque = filtre sur les colonnes de HOTEL_AMENITIES
+        mask = seed.amenity_mask('piscine', 'spa')
+        by_mask = sorted(hotel_id for hotel_id, row in summaries.items() if row['equipements'] & mask == mask)
+        by_columns = sorted(row[0] for row in db.execute(
+            "SELECT id_hotel FROM HOTEL_AMENITIES WHERE piscine AND spa"))
+        assert by_mask == by_columns
+    finally:
+        connection.close()